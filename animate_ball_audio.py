@@ -9,6 +9,11 @@ import sys
 import math
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'src' / 'blender'))
+from camera_solver import animate_follow_camera
+from keyframes import insert_keys
+from onset_animation import compile_onset_animation, format_stats
+
 def load_audio_analysis(json_path):
     """Load onset times from audio analysis"""
     with open(json_path) as f:
@@ -74,47 +79,12 @@ def create_ball_animation(ball, onsets, duration, fps=30):
     # Clear existing animation
     ball.animation_data_clear()
     
-    # Initial position
-    start_pos = path_points[0]
-    ball.location = start_pos
-    ball.keyframe_insert(data_path="location", frame=1)
-    ball.keyframe_insert(data_path="scale", frame=1)
-    
-    # Create keyframes at each onset
-    for i, onset_time in enumerate(onsets):
-        frame = int(onset_time * fps) + 1
-        
-        # Position along path
-        path_index = min(int((onset_time / duration) * len(path_points)), len(path_points) - 1)
-        pos = path_points[path_index]
-        
-        # Bounce effect: scale up at impact
-        ball.location = pos
-        ball.scale = (1.2, 1.2, 1.2)  # Squash on impact
-        ball.keyframe_insert(data_path="location", frame=frame)
-        ball.keyframe_insert(data_path="scale", frame=frame)
-        
-        # Return to normal scale after bounce
-        if frame + 3 <= duration * fps:
-            ball.scale = (1.0, 1.0, 1.0)
-            ball.keyframe_insert(data_path="scale", frame=frame + 3)
-    
-    # Final position
-    final_frame = int(duration * fps)
-    ball.location = path_points[-1]
-    ball.scale = (1.0, 1.0, 1.0)
-    ball.keyframe_insert(data_path="location", frame=final_frame)
-    ball.keyframe_insert(data_path="scale", frame=final_frame)
-    
-    # Smooth interpolation
-    if ball.animation_data and ball.animation_data.action:
-        for fcurve in ball.animation_data.action.fcurves:
-            for keyframe in fcurve.keyframe_points:
-                keyframe.interpolation = 'BEZIER'
-                keyframe.handle_left_type = 'AUTO_CLAMPED'
-                keyframe.handle_right_type = 'AUTO_CLAMPED'
-    
-    print(f"✓ Animation created: {len(onsets)} keyframes")
+    # Onsets merged per frame, overlapping squash/recover resolved, bulk insert
+    anim = compile_onset_animation(onsets, duration, path_points, fps)
+    insert_keys(ball, 'location', anim['location'])
+    insert_keys(ball, 'scale', anim['scale'])
+    
+    print(f"✓ Animation created: {format_stats(anim['stats'])}")
 
 def setup_camera_follow(ball, duration, fps=30):
     """Setup camera to follow ball smoothly"""
@@ -122,36 +92,8 @@ def setup_camera_follow(ball, duration, fps=30):
     if not camera or not ball:
         return
     
-    # Clear camera animation
-    camera.animation_data_clear()
-    
-    # Camera follows ball with offset
-    offset = (8, -6, 5)
-    
-    # Keyframe at start, middle, end
-    for progress in [0, 0.5, 1.0]:
-        frame = int(progress * duration * fps) + 1
-        bpy.context.scene.frame_set(frame)
-        
-        ball_pos = ball.location
-        camera.location = (
-            ball_pos[0] + offset[0],
-            ball_pos[1] + offset[1],
-            ball_pos[2] + offset[2]
-        )
-        camera.keyframe_insert(data_path="location", frame=frame)
-        
-        # Point camera at ball
-        direction = ball_pos - camera.location
-        rot_quat = direction.to_track_quat('-Z', 'Y')
-        camera.rotation_euler = rot_quat.to_euler()
-        camera.keyframe_insert(data_path="rotation_euler", frame=frame)
-    
-    # Smooth camera movement
-    if camera.animation_data and camera.animation_data.action:
-        for fcurve in camera.animation_data.action.fcurves:
-            for keyframe in fcurve.keyframe_points:
-                keyframe.interpolation = 'BEZIER'
+    # Smoothed follow track, sampled every frame from the ball F-curves
+    animate_follow_camera(camera, ball, 1, int(duration * fps), fps, offset=(8, -6, 5))
     
     print("✓ Camera tracking setup")
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark des scripts Blender sur des levels synthétiques de taille croissante
+Usage: python3 benchmarks/bench_blender.py [--sizes 10,100,1000,10000] [--presets draft,final]
+                                          [--onsets 10,100,1000] [--frames 10] [--out bench.json]
+
+Lance Blender en background pour chaque cas, lit le log JSONL de
+src/blender/instrumentation.py et écrit un JSON trié (diffable entre commits):
+temps de construction de scène, de keyframing et des N frames rendues.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import synthetic_level, synthetic_analysis
+
+ROOT = Path(__file__).resolve().parent.parent
+RENDER_BLENDER = ROOT / 'src' / 'blender' / 'render_blender.py'
+RENDER_BATCH = ROOT / 'render_audio_driven_batch.py'
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_timing(log_path):
+    """Extrait étapes, stats de scène et résumé d'un log JSONL"""
+    result = {'stages': {}}
+    if not os.path.exists(log_path):
+        return result
+    with open(log_path) as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event['event'] == 'stage':
+                result['stages'][event['name']] = event['seconds']
+            elif event['event'] == 'scene_stats':
+                result['scene'] = {k: event[k] for k in ('objects', 'lights', 'triangles')}
+            elif event['event'] == 'summary':
+                for key in ('engine', 'frames', 'frame_avg', 'frame_p95', 'frame_max',
+                            'first_frame_overhead', 'peak_rss_mb'):
+                    if key in event:
+                        result[key] = event[key]
+    return result
+
+
+def run_blender(blender, script, script_args, log_path, timeout):
+    """Lance un rendu headless et retourne (ok, wall_seconds, timing)"""
+    cmd = [blender, '-b', '-P', str(script), '--'] + script_args
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, timeout=timeout)
+        ok = proc.returncode == 0
+        tail = proc.stdout[-500:] if not ok else None
+    except subprocess.TimeoutExpired:
+        ok, tail = False, f'timeout after {timeout}s'
+    wall = time.perf_counter() - start
+
+    timing = read_timing(log_path)
+    timing['wall_seconds'] = round(wall, 3)
+    if tail:
+        timing['error'] = tail
+    return ok, timing
+
+
+def bench_levels(args, workdir):
+    """render_blender.py: scaling avec le nombre de plateformes"""
+    results = []
+    for size in args.sizes:
+        level_path = workdir / f'level_{size}.json'
+        level_path.write_text(json.dumps(synthetic_level(size)))
+
+        for preset in args.presets:
+            case = f'level/{size}/{preset}'
+            out_dir = workdir / case.replace('/', '_')
+            log_path = out_dir / 'render_timing.jsonl'
+            ok, timing = run_blender(args.blender, RENDER_BLENDER, [
+                '--level', str(level_path),
+                '--outFrames', str(out_dir),
+                '--preset', preset,
+                '--engine', args.engine,
+                '--maxFrames', str(args.frames),
+                '--timingLog', str(log_path),
+            ], log_path, args.timeout)
+            results.append({'case': case, 'platforms': size, 'preset': preset, 'ok': ok, **timing})
+            print(f"{case:<28} {'OK ' if ok else 'ERR'} {timing['wall_seconds']:8.2f}s")
+    return results
+
+
+def bench_onsets(args, workdir):
+    """render_audio_driven_batch.py: scaling avec onsets et densité de mesh (GLB)"""
+    results = []
+    for glb in args.glbs:
+        for count in args.onsets:
+            analysis_path = workdir / f'analysis_{count}.json'
+            if not analysis_path.exists():
+                analysis_path.write_text(json.dumps(synthetic_analysis(count)))
+
+            for preset in args.presets:
+                case = f'onsets/{Path(glb).stem}/{count}/{preset}'
+                out_dir = workdir / case.replace('/', '_')
+                log_path = out_dir / 'render_timing.jsonl'
+                ok, timing = run_blender(args.blender, RENDER_BATCH, [
+                    '--glb', str(glb),
+                    '--analysis', str(analysis_path),
+                    '--output', str(out_dir),
+                    '--preset', preset,
+                    '--engine', args.engine,
+                    '--max-frames', str(args.frames),
+                    '--timing-log', str(log_path),
+                ], log_path, args.timeout)
+                results.append({'case': case, 'glb': Path(glb).name, 'onsets': count,
+                                'preset': preset, 'ok': ok, **timing})
+                print(f"{case:<28} {'OK ' if ok else 'ERR'} {timing['wall_seconds']:8.2f}s")
+    return results
+
+
+def int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Blender scripts on synthetic levels')
+    parser.add_argument('--blender', default=os.environ.get('BLENDER_PATH', 'blender'))
+    parser.add_argument('--sizes', type=int_list, default=[10, 100, 1000, 10000])
+    parser.add_argument('--onsets', type=int_list, default=[10, 100, 1000])
+    parser.add_argument('--glbs', type=lambda v: v.split(','),
+                        default=[str(ROOT / 'assets' / 'spiral_v2_level.glb')])
+    parser.add_argument('--presets', type=lambda v: v.split(','), default=['draft', 'preview', 'final'])
+    parser.add_argument('--engine', default='auto', help='auto | eevee | cycles')
+    parser.add_argument('--frames', type=int, default=10, help='Frames rendered per case')
+    parser.add_argument('--suite', choices=['all', 'levels', 'onsets'], default='all')
+    parser.add_argument('--timeout', type=int, default=3600)
+    parser.add_argument('--out', default='bench_blender.json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_blender_') as tmp:
+        workdir = Path(tmp)
+        results = []
+        if args.suite in ('all', 'levels'):
+            results += bench_levels(args, workdir)
+        if args.suite in ('all', 'onsets'):
+            results += bench_onsets(args, workdir)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+            'frames_per_case': args.frames,
+            'engine': args.engine,
+        },
+        'results': sorted(results, key=lambda r: r['case']),
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n✓ {len(results)} cases → {args.out}")
+    return 0 if all(r['ok'] for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark vitesse / précision des réglages de pitch aubio (extractMidiSimple.py)
+Usage: python3 benchmarks/bench_pitch.py [--clip audio.wav=data/midi/leo.mid ...]
+                                        [--methods yin,yinfft,...] [--windows 1024,2048,4096]
+                                        [--hops 256,512] [--rates 44100,22050,16000]
+                                        [--out bench_pitch.json]
+
+Chaque combinaison méthode x fenêtre x hop x taux d'analyse passe sur chaque
+clip (fenêtre et hop exprimés à 44.1 kHz, mis à l'échelle); les notes
+détectées sont comparées à la référence MIDI: F-mesure des onsets (tolérance
+50 ms, appariement un pour un), précision du pitch sur les onsets appariés
+(exacte et à l'octave près), débit en secondes d'audio par seconde CPU.
+Sans --clip, un clip synthétique (mélodie connue) sert de référence.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src' / 'quiz'))
+
+METHODS = ['default', 'yin', 'yinfft', 'yinfast', 'mcomb', 'fcomb', 'schmitt', 'specacf']
+WINDOWS = [1024, 2048, 4096]
+HOPS = [256, 512]
+RATES = [44100]
+ONSET_TOLERANCE = 0.05  # s, tolérance usuelle (mir_eval)
+SYNTHETIC_SECONDS = 30
+
+
+def reference_notes(midi_path):
+    """(onsets s, pitches) de toutes les pistes d'un MIDI, triés par temps"""
+    from mido import MidiFile
+    from improve_midi import tempo_map, ticks_to_seconds, track_notes
+
+    mid = MidiFile(midi_path)
+    tempos = tempo_map(mid)
+    notes = np.concatenate([track_notes(track)[0] for track in mid.tracks])
+    notes = notes[notes['channel'] != 9]  # pas de batterie
+    onsets = ticks_to_seconds(notes['start'], tempos, mid.ticks_per_beat)
+    order = np.argsort(onsets, kind='stable')
+    return onsets[order], notes['pitch'][order].astype(np.int64)
+
+
+def synthetic_clip(workdir, seconds=SYNTHETIC_SECONDS):
+    """WAV de bench_python (mélodie en boucle, 4 notes/s) et sa référence exacte"""
+    from bench_python import write_melody_wav, MELODY, NOTE_LENGTH
+
+    path = workdir / f'melody_{seconds}s.wav'
+    write_melody_wav(path, seconds)
+    onsets = np.arange(0, seconds, NOTE_LENGTH)
+    pitches = np.array([MELODY[i % len(MELODY)] for i in range(len(onsets))])
+    return str(path), (onsets, pitches)
+
+
+def match_onsets(reference, detected, tolerance=ONSET_TOLERANCE):
+    """Appariement glouton un pour un (paires les plus proches d'abord): [(i_ref, i_det)]"""
+    if len(reference) == 0 or len(detected) == 0:
+        return []
+    # Paires candidates dans la tolérance (fenêtre glissante sur les onsets triés)
+    lo = np.searchsorted(detected, reference - tolerance, side='left')
+    hi = np.searchsorted(detected, reference + tolerance, side='right')
+    ref_idx = np.repeat(np.arange(len(reference)), hi - lo)
+    det_idx = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)]) if len(ref_idx) else ref_idx
+    order = np.argsort(np.abs(reference[ref_idx] - detected[det_idx]), kind='stable')
+
+    used_ref, used_det, pairs = set(), set(), []
+    for i, j in zip(ref_idx[order].tolist(), det_idx[order].tolist()):
+        if i not in used_ref and j not in used_det:
+            used_ref.add(i)
+            used_det.add(j)
+            pairs.append((i, j))
+    return pairs
+
+
+def score(reference, notes):
+    """F-mesure des onsets et précision du pitch des notes appariées"""
+    ref_onsets, ref_pitches = reference
+    onsets = np.array([n['t'] for n in notes], dtype=np.float64)
+    pitches = np.array([n['pitch'] for n in notes], dtype=np.int64)
+    pairs = match_onsets(ref_onsets, onsets)
+
+    matched = len(pairs)
+    precision = matched / len(onsets) if len(onsets) else 0.0
+    recall = matched / len(ref_onsets) if len(ref_onsets) else 0.0
+    f_measure = 2 * precision * recall / (precision + recall) if matched else 0.0
+    result = {'notes': len(onsets), 'reference_notes': len(ref_onsets), 'matched': matched,
+              'precision': round(precision, 4), 'recall': round(recall, 4),
+              'f_measure': round(f_measure, 4), 'pitch_accuracy': 0.0, 'chroma_accuracy': 0.0}
+    if matched:
+        i, j = np.array(pairs).T
+        diff = ref_pitches[i] - pitches[j]
+        result['pitch_accuracy'] = round(float(np.mean(diff == 0)), 4)
+        result['chroma_accuracy'] = round(float(np.mean(diff % 12 == 0)), 4)
+    return result
+
+
+def audio_seconds(path):
+    import aubio
+    source = aubio.source(path, 0, 512)
+    try:
+        return source.duration / source.samplerate
+    finally:
+        source.close()
+
+
+def bench_config(detect_notes, clips, method, window, hop, rate):
+    """Une combinaison sur tous les clips: scores par clip + moyennes + débit"""
+    per_clip, cpu, seconds = [], 0.0, 0.0
+    for name, path, reference, duration in clips:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.process_time()
+            notes = detect_notes(path, method=method, buf_size=window, hop_size=hop,
+                                 sample_rate=rate)
+            cpu += time.process_time() - start
+        seconds += duration
+        per_clip.append({'clip': name, **score(reference, notes)})
+
+    def mean(key):
+        return round(float(np.mean([c[key] for c in per_clip])), 4)
+
+    return {
+        'case': f'{method}/{window}/{hop}@{rate}', 'method': method, 'window': window,
+        'hop': hop, 'sample_rate': rate,
+        'f_measure': mean('f_measure'), 'pitch_accuracy': mean('pitch_accuracy'),
+        'chroma_accuracy': mean('chroma_accuracy'),
+        'cpu_seconds': round(cpu, 4),
+        'audio_seconds_per_cpu_second': round(seconds / cpu, 1) if cpu > 0 else None,
+        'clips': per_clip,
+    }
+
+
+def parse_clip(value):
+    audio, sep, reference = value.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError('expected AUDIO=REFERENCE.mid')
+    return audio, reference
+
+
+def str_list(value):
+    return [v for v in value.split(',') if v]
+
+
+def int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark aubio pitch settings against reference MIDI')
+    parser.add_argument('--clip', type=parse_clip, action='append', default=[],
+                        help='AUDIO=REFERENCE.mid pair (repeatable; default: synthetic melody)')
+    parser.add_argument('--methods', type=str_list, default=METHODS)
+    parser.add_argument('--windows', type=int_list, default=WINDOWS)
+    parser.add_argument('--hops', type=int_list, default=HOPS)
+    parser.add_argument('--rates', type=int_list, default=RATES,
+                        help='Analysis sample rates, e.g. 44100,22050,16000')
+    parser.add_argument('--out', default='bench_pitch.json')
+    args = parser.parse_args()
+
+    try:
+        from extractMidiSimple import detect_notes
+    except ImportError as e:
+        print(f"skipped ({e})")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix='bench_pitch_') as tmp:
+        clips = []
+        for audio, midi in args.clip:
+            clips.append((Path(audio).name, audio, reference_notes(midi), audio_seconds(audio)))
+        if not clips:
+            path, reference = synthetic_clip(Path(tmp))
+            clips.append(('synthetic', path, reference, audio_seconds(path)))
+
+        results = []
+        for method in args.methods:
+            for window in args.windows:
+                for hop, rate in ((h, r) for h in args.hops if h <= window for r in args.rates):
+                    result = bench_config(detect_notes, clips, method, window, hop, rate)
+                    results.append(result)
+                    print(f"{result['case']:<26} F {result['f_measure']:.3f}  "
+                          f"pitch {result['pitch_accuracy']:.3f}  "
+                          f"{result['audio_seconds_per_cpu_second']:>8} audio-s/CPU-s")
+
+    best = max(results, key=lambda r: (r['f_measure'], r['pitch_accuracy']))
+    # Plus rapide sans perdre plus de 5% ni en onsets ni en pitch
+    fastest_good = max((r for r in results if r['f_measure'] >= 0.95 * best['f_measure']
+                        and r['pitch_accuracy'] >= 0.95 * best['pitch_accuracy']),
+                       key=lambda r: r['audio_seconds_per_cpu_second'] or 0)
+    report = {
+        'meta': {
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+            'clips': [name for name, *_ in clips],
+        },
+        'best': best['case'],
+        'fastest_within_5pct': fastest_good['case'],
+        'results': sorted(results, key=lambda r: r['case']),
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nBest: {best['case']} (F {best['f_measure']:.3f}); fastest within 5%: "
+          f"{fastest_good['case']} ({fastest_good['audio_seconds_per_cpu_second']} audio-s/CPU-s)")
+    print(f"✓ {len(results)} configurations → {args.out}")
+
+
+if __name__ == '__main__':
+    main()
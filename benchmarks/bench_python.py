@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark des parties pur-Python (sans Blender)
+Usage: python3 benchmarks/bench_python.py [--sizes 100,1000,10000] [--repeat 3] [--out bench.json]
+
+Cas mesurés:
+- diagnostics trajectoire (diagnose_trajectory.py) sur timed paths synthétiques
+- post-traitement MIDI (improve_midi.py)          [requiert mido + numpy]
+- extraction MIDI audio (extractMidiSimple.py)    [requiert aubio + numpy]
+Réglages de pitch aubio vs référence MIDI: voir bench_pitch.py
+Les cas dont la dépendance manque sont marqués 'skipped' au lieu d'échouer.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+from synthetic import synthetic_trajectory
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src' / 'quiz'))
+
+
+def timed(func, repeat):
+    """Exécute func `repeat` fois (stdout muet), retourne min / médiane en secondes"""
+    runs = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+    return {'min': round(min(runs), 6), 'median': round(statistics.median(runs), 6), 'runs': repeat}
+
+
+MELODY = [72, 74, 76, 79, 81, 79, 76, 74]  # pitches MIDI joués en boucle
+NOTE_LENGTH = 0.25                          # s par note
+
+
+def write_melody_wav(path, seconds, sample_rate=44100):
+    """WAV mono: suite de notes sinusoïdales (xylophone-like, décroissance exp.)"""
+    frames = bytearray()
+    for n in range(int(seconds * sample_rate)):
+        t = n / sample_rate
+        pitch = MELODY[int(t / NOTE_LENGTH) % len(MELODY)]
+        freq = 440.0 * 2 ** ((pitch - 69) / 12)
+        env = math.exp(-6 * (t % NOTE_LENGTH))
+        frames += struct.pack('<h', int(12000 * env * math.sin(2 * math.pi * freq * t)))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+
+
+def write_midi(path, num_notes):
+    """MIDI une piste, notes courtes et longues mélangées"""
+    from mido import MidiFile, MidiTrack, Message
+
+    mid = MidiFile()
+    track = MidiTrack()
+    mid.tracks.append(track)
+    for i in range(num_notes):
+        length = 20 if i % 5 == 0 else 110
+        track.append(Message('note_on', note=60 + i % 24, velocity=30 + i % 90, time=7 + i % 5))
+        track.append(Message('note_off', note=60 + i % 24, velocity=0, time=length))
+    mid.save(str(path))
+
+
+def bench_diagnostics(args, workdir):
+    from diagnose_trajectory import analyze_trajectory
+
+    results = []
+    for size in args.sizes:
+        path = workdir / f'trajectory_{size}.json'
+        path.write_text(json.dumps(synthetic_trajectory(size)))
+        results.append({'case': f'diagnose_trajectory/{size}', 'platforms': size,
+                        **timed(lambda: analyze_trajectory(str(path)), args.repeat)})
+    return results
+
+
+def bench_improve_midi(args, workdir):
+    try:
+        from improve_midi import improve_midi
+    except ImportError as e:
+        return [{'case': 'improve_midi', 'skipped': str(e)}]
+
+    results = []
+    for size in args.sizes:
+        src, dst = workdir / f'notes_{size}.mid', workdir / f'notes_{size}_out.mid'
+        write_midi(src, size)
+        results.append({'case': f'improve_midi/{size}', 'notes': size,
+                        **timed(lambda: improve_midi(str(src), str(dst)), args.repeat)})
+    return results
+
+
+def bench_extract_midi(args, workdir):
+    try:
+        from extractMidiSimple import extract_midi_simple
+    except ImportError as e:
+        return [{'case': 'extract_midi_simple', 'skipped': str(e)}]
+
+    results = []
+    for seconds in args.audio_seconds:
+        wav, mid = workdir / f'melody_{seconds}s.wav', workdir / f'melody_{seconds}s.mid'
+        write_melody_wav(wav, seconds)
+        stats = timed(lambda: extract_midi_simple(str(wav), str(mid)), args.repeat)
+        stats['audio_seconds_per_second'] = round(seconds / stats['min'], 2)
+        results.append({'case': f'extract_midi_simple/{seconds}s', 'audio_seconds': seconds, **stats})
+    return results
+
+
+def int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pure-Python pipeline stages')
+    parser.add_argument('--sizes', type=int_list, default=[100, 1000, 10000])
+    parser.add_argument('--audio-seconds', type=int_list, default=[10, 60])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', default='bench_python.json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_python_') as tmp:
+        workdir = Path(tmp)
+        results = []
+        for bench in (bench_diagnostics, bench_improve_midi, bench_extract_midi):
+            for result in bench(args, workdir):
+                results.append(result)
+                if 'skipped' in result:
+                    print(f"{result['case']:<36} skipped ({result['skipped']})")
+                else:
+                    print(f"{result['case']:<36} {result['min'] * 1000:10.1f} ms")
+
+    report = {
+        'meta': {
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'results': sorted(results, key=lambda r: r['case']),
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n✓ {len(results)} cases → {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Générateurs de données synthétiques pour les benchmarks
+- Levels au format src/level/generateLevel.js (render_blender.py)
+- Analyses audio {onsets, duration} (render_audio_driven*.py)
+- Trajectoires timed-path (diagnose_trajectory.py)
+
+Déterministes (seed fixe) pour que les résultats soient comparables entre commits.
+"""
+
+import math
+import random
+
+
+PALETTE = {
+    'name': 'neon_cyberpunk',
+    'ball': '#FF00FF',
+    'platforms': ['#00FFFF', '#FF00FF', '#00FF00'],
+    'background': '#0a0015',
+    'fog': '#1a0030',
+}
+
+
+def synthetic_level(num_platforms, fps=30, spacing=0.4, seed=0):
+    """Level avec num_platforms plateformes espacées de `spacing` secondes"""
+    rng = random.Random(seed)
+    platforms = []
+
+    for i in range(num_platforms):
+        intensity = rng.uniform(0.1, 1.0)
+        platforms.append({
+            't': round(0.5 + i * spacing, 4),
+            'pos': [math.sin(i * 0.5) * 1.5, 2 + math.sin(i * 0.3) * 0.8, i * 2.5],
+            'rot': [0, rng.uniform(-5, 5) * math.pi / 180, rng.uniform(-7.5, 7.5) * math.pi / 180],
+            'size': [0.8 + 1.2 * intensity, 0.125, 0.8 + 1.2 * intensity],
+            'intensity': intensity,
+        })
+
+    duration = (platforms[-1]['t'] if platforms else 0) + 1.0
+    return {
+        'fps': fps,
+        'duration': duration,
+        'bpm': 120,
+        'gravity': 9.8,
+        'ball': {'radius': 0.18, 'restitution': 0.92, 'friction': 0.1},
+        'camera': {'follow_smooth': 0.12, 'look_ahead': 0.35, 'fov': 50, 'shake_intensity': 0.02},
+        'platforms': platforms,
+        'style': {
+            'palette': PALETTE,
+            'bloom_strength': 0.8,
+            'glow_intensity': 2.0,
+            'fog_density': 0.05,
+            'dof': {'focus_dist': 5.0, 'aperture': 2.8},
+        },
+    }
+
+
+def synthetic_analysis(num_onsets, duration=None, seed=0):
+    """Analyse audio: onsets {t, strength} avec jitter, densité type batterie"""
+    rng = random.Random(seed)
+    duration = duration or max(10.0, num_onsets * 0.12)
+    step = duration / (num_onsets + 1)
+
+    onsets = []
+    for i in range(num_onsets):
+        t = (i + 1) * step + rng.uniform(-0.3, 0.3) * step
+        onsets.append({'t': round(t, 4), 'strength': round(rng.uniform(0.05, 1.0), 3)})
+    onsets.sort(key=lambda o: o['t'])
+
+    return {'duration': duration, 'onsets': onsets}
+
+
+def synthetic_trajectory(num_platforms, keyframes_per_second=60, spacing=0.4, seed=0):
+    """Timed path: plateformes {x,y,z,noteTime} + keyframes balle (ms)"""
+    rng = random.Random(seed)
+    platforms = []
+    for i in range(num_platforms):
+        angle = i * 0.35
+        platforms.append({
+            'x': 4 * math.cos(angle),
+            'y': 25 - i * 0.3,
+            'z': 4 * math.sin(angle),
+            'noteTime': 0.5 + i * spacing,
+        })
+
+    duration = platforms[-1]['noteTime'] + 1.0 if platforms else 1.0
+    keyframes = []
+    for k in range(int(duration * keyframes_per_second)):
+        t = k / keyframes_per_second
+        u = min(max((t - 0.5) / spacing, 0), max(num_platforms - 1, 0))
+        i = min(int(u), max(num_platforms - 2, 0))
+        a, b = platforms[i], platforms[min(i + 1, num_platforms - 1)]
+        f = u - i
+        hop = math.sin(math.pi * f) * 0.8
+        keyframes.append({
+            'time': round(t * 1000),
+            'position': {
+                'x': a['x'] + (b['x'] - a['x']) * f + rng.uniform(-0.01, 0.01),
+                'y': a['y'] + (b['y'] - a['y']) * f + 0.5 + hop,
+                'z': a['z'] + (b['z'] - a['z']) * f + rng.uniform(-0.01, 0.01),
+            },
+        })
+
+    return {
+        'platforms': platforms,
+        'metadata': {'config': {'ball': {'keyframes': keyframes}}},
+    }
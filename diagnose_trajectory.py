@@ -2,168 +2,324 @@
 """
 🔬 DIAGNOSTIC INTELLIGENT - Analyse trajectoire vs plateformes
 Approche MIT : Visualiser les données pour comprendre le problème
+Collisions balle / plateformes orientées (level render_blender, pos/rot/size):
+voir src/blender/collision.py
+
+Toute la chanson est analysée par fenêtres glissantes (NumPy, trajectoire
+rééchantillonnée à pas constant): variance du rayon (mouvement circulaire),
+distance à la plateforme la plus proche, et pour chaque plateforme l'écart
+entre sa note et l'instant où la balle en est le plus proche.
+Usage: python3 diagnose_trajectory.py [path.json] [--window 3] [--hop 1] [--json]
+       [--plot diagnostic.png]
+
+--plot: vues dessus / côté (balle vs plateformes) et distance au fil du temps
+en PNG (matplotlib, backend Agg). Les courbes sont décimées par LTTB
+(largest-triangle-three-buckets): la forme est conservée avec quelques
+milliers de points, même pour des dizaines de milliers de keyframes.
 """
 
+import argparse
 import json
-import sys
 
-def analyze_trajectory(json_path):
+import numpy as np
+
+SAMPLE_RATE = 30           # Hz, trajectoire rééchantillonnée
+WINDOW = 3.0               # s, fenêtre glissante
+HOP = 1.0                  # s, pas entre fenêtres
+CIRCLE_VARIANCE = 1.0      # variance du rayon sous laquelle le mouvement est circulaire
+CIRCLE_MIN_RADIUS = 0.5    # m, rayon moyen minimal (balle immobile != cercle)
+CIRCLE_MIN_RATIO = 0.5     # rayon min / rayon moyen (une ligne droite passe par le centre)
+FAR_DISTANCE = 5.0         # m, distance moyenne à la plateforme la plus proche
+TIMING_SEARCH = 1.0        # s, recherche du passage au plus près autour de la note
+TIMING_TOLERANCE = 0.1     # s, écart note / passage au plus près
+CONTACT_DISTANCE = 1.5     # m, distance max au passage au plus près
+NEAREST_CHUNK = 2048       # échantillons par bloc pour la plateforme la plus proche
+PLOT_POINTS = 2000         # points par courbe après décimation LTTB
+
+
+def load_path(data):
+    """Temps (K,) en s, positions (K, 3) des keyframes; plateformes (N, 3) et notes (N,)"""
+    keyframes = [kf for kf in data['metadata']['config']['ball']['keyframes']
+                 if kf.get('time') is not None]
+    times = np.array([kf['time'] for kf in keyframes], dtype=np.float64) / 1000
+    positions = np.array([[kf['position'][axis] for axis in 'xyz'] for kf in keyframes],
+                         dtype=np.float64)
+    order = np.argsort(times, kind='stable')
+
+    platforms = data['platforms']
+    centers = np.array([[p[axis] for axis in 'xyz'] for p in platforms], dtype=np.float64)
+    notes = np.array([p.get('noteTime', np.nan) for p in platforms], dtype=np.float64)
+    return times[order], positions[order], centers.reshape(-1, 3), notes
+
+
+def resample(times, positions, rate=SAMPLE_RATE):
+    """Trajectoire à pas constant: temps (S,), positions (S, 3)"""
+    grid = np.arange(times[0], times[-1] + 0.5 / rate, 1 / rate)
+    return grid, np.stack([np.interp(grid, times, positions[:, i]) for i in range(3)], axis=1)
+
+
+def nearest_distances(points, centers, chunk=NEAREST_CHUNK):
+    """Distance (S,) de chaque échantillon à la plateforme la plus proche"""
+    result = np.empty(len(points))
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        result[start:start + chunk] = np.sqrt(
+            ((block[:, None] - centers[None]) ** 2).sum(axis=2).min(axis=1))
+    return result
+
+
+def windows(values, size, hop):
+    """Vue (W, ..., size) des fenêtres glissantes (pas de hop échantillons)"""
+    return np.lib.stride_tricks.sliding_window_view(values, size, axis=0)[::hop]
+
+
+def rolling_stats(grid, points, distances, window=WINDOW, hop=HOP, rate=SAMPLE_RATE):
+    """Statistiques par fenêtre: début, rayon moyen, variance du rayon, distance moyenne/max"""
+    size, step = min(max(2, int(window * rate)), len(grid)), max(1, int(hop * rate))
+    starts = windows(grid, size, step)[:, 0]
+
+    # Rayon dans le plan XZ autour du centre de chaque fenêtre
+    xz = windows(points[:, [0, 2]], size, step)          # (W, 2, size)
+    radii = np.linalg.norm(xz - xz.mean(axis=2, keepdims=True), axis=1)
+    near = windows(distances, size, step)
+    return {
+        'start': starts,
+        'end': np.minimum(starts + window, grid[-1]),
+        'radius_mean': radii.mean(axis=1),
+        'radius_variance': radii.var(axis=1),
+        'radius_min': radii.min(axis=1),
+        'distance_mean': near.mean(axis=1),
+        'distance_max': near.max(axis=1),
+    }
+
+
+def platform_timing(grid, points, centers, notes, rate=SAMPLE_RATE, search=TIMING_SEARCH):
+    """Par plateforme: instant du passage au plus près (autour de la note), écart et distance"""
+    valid = np.isfinite(notes)
+    closest = np.full(len(notes), np.nan)
+    gaps = np.full(len(notes), np.nan)
+    if valid.any():
+        # (N, M) indices d'échantillons autour de chaque note
+        offsets = np.arange(-int(search * rate), int(search * rate) + 1)
+        center = np.round((notes[valid] - grid[0]) * rate).astype(np.int64)
+        index = np.clip(center[:, None] + offsets[None], 0, len(grid) - 1)
+        dist = np.linalg.norm(points[index] - centers[valid][:, None], axis=2)
+        best = dist.argmin(axis=1)
+        closest[valid] = grid[index[np.arange(len(index)), best]]
+        gaps[valid] = dist[np.arange(len(index)), best]
+    return {'note': notes, 'closest': closest, 'delta': closest - notes, 'distance': gaps}
+
+
+def window_anomalies(stats, timing):
+    """Anomalies [{start, end, kind, value}] par fenêtre, triées par temps"""
+    anomalies = []
+    circular = ((stats['radius_variance'] < CIRCLE_VARIANCE)
+                & (stats['radius_mean'] > CIRCLE_MIN_RADIUS)
+                & (stats['radius_min'] > CIRCLE_MIN_RATIO * stats['radius_mean']))
+    for i in np.flatnonzero(circular):
+        anomalies.append({'start': stats['start'][i], 'end': stats['end'][i], 'kind': 'circular',
+                          'value': stats['radius_variance'][i]})
+    for i in np.flatnonzero(stats['distance_mean'] > FAR_DISTANCE):
+        anomalies.append({'start': stats['start'][i], 'end': stats['end'][i], 'kind': 'far',
+                          'value': stats['distance_mean'][i]})
+
+    # Plateformes mal synchronisées, regroupées par fenêtre (par l'instant de leur note)
+    late = (np.abs(timing['delta']) > TIMING_TOLERANCE) | (timing['distance'] > CONTACT_DISTANCE)
+    late &= np.isfinite(timing['note'])
+    if late.any():
+        notes = timing['note'][late]
+        inside = (notes[None] >= stats['start'][:, None]) & (notes[None] < stats['end'][:, None])
+        for i in np.flatnonzero(inside.any(axis=1)):
+            deltas = timing['delta'][late][inside[i]]
+            anomalies.append({'start': stats['start'][i], 'end': stats['end'][i], 'kind': 'timing',
+                              'value': float(np.abs(deltas).max()), 'platforms': int(inside[i].sum())})
+    anomalies.sort(key=lambda a: (a['start'], a['kind']))
+    return [{**a, 'start': round(float(a['start']), 2), 'end': round(float(a['end']), 2),
+             'value': round(float(a['value']), 3)} for a in anomalies]
+
+
+def merge_ranges(anomalies):
+    """Fenêtres anormales consécutives de même type -> plages [(kind, début, fin, pire valeur)]"""
+    ranges = {}
+    for a in anomalies:
+        current = ranges.setdefault(a['kind'], [])
+        if current and a['start'] <= current[-1][1]:
+            current[-1] = (current[-1][0], max(current[-1][1], a['end']), max(current[-1][2], a['value']))
+        else:
+            current.append((a['start'], a['end'], a['value']))
+    return sorted(((kind, *r) for kind, items in ranges.items() for r in items), key=lambda r: r[1])
+
+
+def lttb(x, y, threshold=PLOT_POINTS):
+    """Indices des points gardés par largest-triangle-three-buckets (x, y: coordonnées tracées)"""
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    # Premier et dernier points gardés, threshold - 2 seaux entre les deux
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+    # Moyenne de chaque seau (sommes cumulées): le troisième sommet du triangle
+    cx, cy = np.concatenate([[0], np.cumsum(x)]), np.concatenate([[0], np.cumsum(y)])
+    sizes = np.maximum(np.diff(edges), 1)
+    mean_x = (cx[edges[1:]] - cx[edges[:-1]]) / sizes
+    mean_y = (cy[edges[1:]] - cy[edges[:-1]]) / sizes
+    mean_x, mean_y = np.append(mean_x[1:], x[-1]), np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for b in range(threshold - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        # Aire (x2) du triangle point gardé / candidat / moyenne du seau suivant
+        area = np.abs((x[previous] - mean_x[b]) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (mean_y[b] - y[previous]))
+        previous = lo + int(area.argmax())
+        selected[b + 1] = previous
+    return selected
+
+
+def plot_trajectory(path, times, positions, centers, grid, distances, anomalies,
+                    points=PLOT_POINTS):
+    """PNG: vue de dessus (X/Z), de côté (Z/Y), distance à la plateforme la plus proche"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise SystemExit("--plot requires matplotlib (pip install matplotlib)")
+
+    fig, (top, side, dist) = plt.subplots(3, 1, figsize=(12, 14))
+    for ax, (a, b), title in ((top, (0, 2), 'Vue de dessus (X / Z)'), (side, (2, 1), 'Vue de côté (Z / Y)')):
+        keep = lttb(positions[:, a], positions[:, b], points)
+        ax.plot(positions[keep, a], positions[keep, b], lw=0.8, color='tab:orange', label='Balle')
+        ax.scatter(centers[:, a], centers[:, b], s=6, color='tab:blue', label='Plateformes')
+        ax.set_title(title)
+        ax.set_xlabel('XYZ'[a])
+        ax.set_ylabel('XYZ'[b])
+        ax.legend(loc='upper right')
+    top.set_aspect('equal', adjustable='datalim')
+
+    keep = lttb(grid, distances, points)
+    dist.plot(grid[keep], distances[keep], lw=0.8, color='tab:green')
+    colors = {'circular': 'tab:purple', 'far': 'tab:red', 'timing': 'tab:orange'}
+    for kind, start, end, _ in merge_ranges(anomalies):
+        dist.axvspan(start, end, color=colors[kind], alpha=0.15, label=kind)
+    handles, labels = dist.get_legend_handles_labels()
+    if handles:
+        unique = dict(zip(labels, handles))
+        dist.legend(unique.values(), unique.keys(), loc='upper right')
+    dist.set_title('Distance à la plateforme la plus proche')
+    dist.set_xlabel('Temps (s)')
+    dist.set_ylabel('Distance (m)')
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    print(f"📈 Plot: {path} ({len(times)} keyframes -> {min(points, len(times))} points par courbe)")
+
+
+def analyze_trajectory(json_path, window=WINDOW, hop=HOP, quiet=False, plot=None):
     with open(json_path) as f:
         data = json.load(f)
-    
-    platforms = data['platforms']
-    keyframes = data['metadata']['config']['ball']['keyframes']
-    
+
+    times, positions, centers, notes = load_path(data)
+    grid, points = resample(times, positions)
+    distances = nearest_distances(points, centers)
+    stats = rolling_stats(grid, points, distances, window, hop)
+    timing = platform_timing(grid, points, centers, notes)
+    anomalies = window_anomalies(stats, timing)
+
+    start_distance = float(np.linalg.norm(positions[0] - centers[0])) if len(centers) else 0.0
+    first_note = float(np.nanmin(notes)) if np.isfinite(notes).any() else 0.0
+    report = {
+        'platforms': len(centers),
+        'keyframes': len(times),
+        'duration': round(float(times[-1]), 3),
+        'windows': len(stats['start']),
+        'window': window,
+        'hop': hop,
+        'anomalies': anomalies,
+        'start_distance': round(start_distance, 3),
+        'early_start': round(first_note - float(times[0]), 3),
+        'timing': {
+            'mean_abs_delta': round(float(np.nanmean(np.abs(timing['delta']))), 4)
+            if np.isfinite(timing['delta']).any() else None,
+            'late_platforms': int(np.sum(np.abs(timing['delta']) > TIMING_TOLERANCE)),
+        },
+    }
+    if not quiet:
+        print_report(report, stats, timing)
+    if plot:
+        plot_trajectory(plot, times, positions, centers, grid, distances, anomalies)
+    return report
+
+
+def print_report(report, stats, timing):
     print("=" * 80)
     print("🔬 DIAGNOSTIC TRAJECTOIRE vs PLATEFORMES")
     print("=" * 80)
-    
+
     # 1. Statistiques globales
     print(f"\n📊 DONNÉES GLOBALES:")
-    print(f"   Plateformes: {len(platforms)}")
-    print(f"   Keyframes: {len(keyframes)}")
-    print(f"   Durée totale: {keyframes[-1]['time'] / 1000:.1f}s")
-    
-    # 2. Analyser les 10 premières secondes
-    print(f"\n🎯 ANALYSE DES 10 PREMIÈRES SECONDES:\n")
-    
-    # Trouver les keyframes des 10 premières secondes (filtrer les None)
-    kf_10s = [kf for kf in keyframes if kf.get('time') is not None and kf['time'] <= 10000]
-    
-    print(f"Keyframes dans les 10s: {len(kf_10s)}")
-    print(f"\n{'Time':>8} | {'Ball Y':>8} | {'Ball X':>8} | {'Ball Z':>8} | {'Nearest Platform':>20} | {'Distance':>10}")
-    print("-" * 90)
-    
-    for i in range(0, min(len(kf_10s), 100), 10):  # Échantillonner tous les 10 frames
-        kf = kf_10s[i]
-        t = kf['time'] / 1000
-        ball_pos = kf['position']
-        
-        # Trouver la plateforme la plus proche en Y
-        closest_platform = None
-        min_dist_y = float('inf')
-        
-        for p in platforms:
-            dist_y = abs(ball_pos['y'] - p['y'])
-            if dist_y < min_dist_y:
-                min_dist_y = dist_y
-                closest_platform = p
-        
-        # Distance 3D totale
-        if closest_platform:
-            dist_3d = (
-                (ball_pos['x'] - closest_platform['x'])**2 +
-                (ball_pos['y'] - closest_platform['y'])**2 +
-                (ball_pos['z'] - closest_platform['z'])**2
-            )**0.5
-            
-            platform_info = f"P({closest_platform['x']:.1f}, {closest_platform['y']:.1f}, {closest_platform['z']:.1f})"
-        else:
-            dist_3d = 0
-            platform_info = "None"
-        
-        print(f"{t:7.2f}s | {ball_pos['y']:7.2f}m | {ball_pos['x']:7.2f}m | {ball_pos['z']:7.2f}m | {platform_info:>20} | {dist_3d:9.2f}m")
-    
-    # 3. Détecter le mouvement circulaire
-    print(f"\n🌀 DÉTECTION MOUVEMENT CIRCULAIRE (analyse des 3 premières secondes):\n")
-    
-    kf_3s = [kf for kf in keyframes if kf.get('time') is not None and kf['time'] <= 3000]
-    
-    # Calculer le rayon moyen par rapport au centre
-    center_x = sum(kf['position']['x'] for kf in kf_3s) / len(kf_3s)
-    center_z = sum(kf['position']['z'] for kf in kf_3s) / len(kf_3s)
-    
-    radii = []
-    for kf in kf_3s:
-        radius = ((kf['position']['x'] - center_x)**2 + (kf['position']['z'] - center_z)**2)**0.5
-        radii.append(radius)
-    
-    avg_radius = sum(radii) / len(radii)
-    radius_variance = sum((r - avg_radius)**2 for r in radii) / len(radii)
-    
-    print(f"   Centre apparent: X={center_x:.2f}m, Z={center_z:.2f}m")
-    print(f"   Rayon moyen: {avg_radius:.2f}m")
-    print(f"   Variance du rayon: {radius_variance:.4f}")
-    
-    if radius_variance < 1.0:
-        print(f"   ⚠️  MOUVEMENT CIRCULAIRE DÉTECTÉ ! (variance < 1.0)")
-    else:
-        print(f"   ✅ Pas de mouvement circulaire majeur")
-    
-    # 4. Analyser les plateformes
-    print(f"\n📦 ANALYSE PLATEFORMES:\n")
-    
-    # Première plateforme
-    p0 = platforms[0]
-    print(f"   Première plateforme:")
-    print(f"      Position: ({p0['x']:.2f}, {p0['y']:.2f}, {p0['z']:.2f})")
-    print(f"      Note time: {p0.get('noteTime', 'N/A')}s")
-    print(f"      Note pitch: {p0.get('notePitch', 'N/A')}")
-    
-    # Premier keyframe
-    kf0 = keyframes[0]
-    print(f"\n   Premier keyframe:")
-    print(f"      Position: ({kf0['position']['x']:.2f}, {kf0['position']['y']:.2f}, {kf0['position']['z']:.2f})")
-    print(f"      Time: {kf0['time'] / 1000:.3f}s")
-    
-    # Distance entre premier keyframe et première plateforme
-    dist = (
-        (kf0['position']['x'] - p0['x'])**2 +
-        (kf0['position']['y'] - p0['y'])**2 +
-        (kf0['position']['z'] - p0['z'])**2
-    )**0.5
-    
-    print(f"\n   Distance entre premier KF et première plateforme: {dist:.2f}m")
-    
-    if dist > 5:
-        print(f"   ⚠️  PROBLÈME : Distance trop grande ! La balle commence loin de la première plateforme")
-    
-    # 5. Vérifier alignement temporel
+    print(f"   Plateformes: {report['platforms']}")
+    print(f"   Keyframes: {report['keyframes']}")
+    print(f"   Durée totale: {report['duration']:.1f}s")
+    print(f"   Fenêtres analysées: {report['windows']} ({report['window']:g}s, pas {report['hop']:g}s)")
+
+    # 2. Fenêtres glissantes (toute la chanson)
+    print(f"\n🎯 FENÊTRES GLISSANTES:\n")
+    print(f"{'Start':>8} | {'Rayon moy':>9} | {'Var rayon':>9} | {'Dist moy':>8} | {'Dist max':>8}")
+    print("-" * 56)
+    step = max(1, len(stats['start']) // 20)  # ~20 lignes quelle que soit la durée
+    for i in range(0, len(stats['start']), step):
+        print(f"{stats['start'][i]:7.1f}s | {stats['radius_mean'][i]:8.2f}m | "
+              f"{stats['radius_variance'][i]:9.4f} | {stats['distance_mean'][i]:7.2f}m | "
+              f"{stats['distance_max'][i]:7.2f}m")
+
+    # 3. Alignement temporel (toutes les plateformes)
     print(f"\n⏱️  ALIGNEMENT TEMPOREL:\n")
-    
-    print(f"   Premières plateformes vs keyframes:")
-    for i in range(min(5, len(platforms))):
-        p = platforms[i]
-        note_time_ms = int(p.get('noteTime', 0) * 1000)
-        
-        # Trouver le keyframe le plus proche de ce temps
-        closest_kf = min(keyframes, key=lambda kf: abs(kf['time'] - note_time_ms))
-        time_diff = abs(closest_kf['time'] - note_time_ms)
-        
-        dist_to_platform = (
-            (closest_kf['position']['x'] - p['x'])**2 +
-            (closest_kf['position']['y'] - p['y'])**2 +
-            (closest_kf['position']['z'] - p['z'])**2
-        )**0.5
-        
-        print(f"   P{i}: note@{p.get('noteTime', 0):.2f}s → KF@{closest_kf['time']/1000:.2f}s (Δ={time_diff}ms, dist={dist_to_platform:.2f}m)")
-    
+    valid = np.isfinite(timing['delta'])
+    if valid.any():
+        deltas = np.abs(timing['delta'][valid])
+        print(f"   Écart note / passage au plus près: moyen {deltas.mean() * 1000:.0f}ms, "
+              f"max {deltas.max() * 1000:.0f}ms")
+        print(f"   Plateformes désynchronisées (> {TIMING_TOLERANCE * 1000:.0f}ms): "
+              f"{report['timing']['late_platforms']}")
+    else:
+        print("   Pas de noteTime sur les plateformes")
+
     print("\n" + "=" * 80)
     print("🎯 RECOMMANDATIONS:")
     print("=" * 80)
-    
-    # Diagnostics automatiques
-    issues = []
-    
-    if radius_variance < 1.0:
-        issues.append("❌ Mouvement circulaire détecté au début → Vérifier si un tube spiral est généré par erreur")
-    
-    if dist > 5:
-        issues.append("❌ Premier keyframe trop loin de première plateforme → Problème d'initialisation")
-    
-    # Vérifier si les keyframes commencent avant les plateformes
-    first_note_time = platforms[0].get('noteTime', 0) * 1000 if platforms else 0
-    first_kf_time = keyframes[0]['time'] if keyframes else 0
-    
-    if first_kf_time < first_note_time - 500:
-        issues.append(f"❌ Keyframes commencent {(first_note_time - first_kf_time)/1000:.2f}s avant la première note")
-    
+
+    labels = {
+        'circular': "❌ Mouvement circulaire (variance rayon {value:.3f}) → tube spiral généré par erreur ?",
+        'far': "❌ Balle loin des plateformes (distance moyenne {value:.2f}m)",
+        'timing': "❌ Plateformes désynchronisées (écart max {value:.2f}s)",
+    }
+    issues = [f"   {start:6.1f}s-{end:6.1f}s " + labels[kind].format(value=value)
+              for kind, start, end, value in merge_ranges(report['anomalies'])]
+    if report['start_distance'] > FAR_DISTANCE:
+        issues.append(f"❌ Premier keyframe trop loin de première plateforme "
+                      f"({report['start_distance']:.2f}m) → Problème d'initialisation")
+    if report['early_start'] > 0.5:
+        issues.append(f"❌ Keyframes commencent {report['early_start']:.2f}s avant la première note")
+
     if not issues:
         print("✅ Aucun problème majeur détecté")
     else:
         for issue in issues:
             print(issue)
 
+
 if __name__ == '__main__':
-    json_path = sys.argv[1] if len(sys.argv) > 1 else 'data/leo_timed_path.json'
-    analyze_trajectory(json_path)
+    parser = argparse.ArgumentParser(description='Rolling trajectory vs platforms diagnostics')
+    parser.add_argument('json_path', nargs='?', default='data/leo_timed_path.json')
+    parser.add_argument('--window', type=float, default=WINDOW, help='Window length (s)')
+    parser.add_argument('--hop', type=float, default=HOP, help='Hop between windows (s)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--plot', default=None, help='Write top/side/distance plots to this PNG')
+    args = parser.parse_args()
+
+    report = analyze_trajectory(args.json_path, args.window, args.hop, quiet=args.json, plot=args.plot)
+    if args.json:
+        print(json.dumps(report))
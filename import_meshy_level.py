@@ -7,7 +7,13 @@ import bpy
 import sys
 import os
 from mathutils import Vector, Euler
-import math
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'blender'))
+from render_engine import setup_engine
+from instrumentation import RenderProfiler
+from styles import get_style
+
+STYLE = get_style('meshy_gold')
 
 def parse_args():
     try:
@@ -35,25 +41,13 @@ def clear_scene():
     for mat in bpy.data.materials:
         bpy.data.materials.remove(mat)
 
-def setup_render():
+def setup_render(preset_name=None, engine=None):
     scene = bpy.context.scene
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.resolution_x = 1080
-    scene.render.resolution_y = 1920
-    scene.render.fps = 30
+    preset = setup_engine(scene, preset_name, engine, fps=30)
     
     # Background noir luxe
-    world = bpy.data.worlds.new("World")
-    scene.world = world
-    world.use_nodes = True
-    nodes = world.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputWorld')
-    background = nodes.new('ShaderNodeBackground')
-    background.inputs['Color'].default_value = (0.01, 0.008, 0.006, 1.0)
-    background.inputs['Strength'].default_value = 0.2
-    world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+    STYLE.setup_world(scene, preset)
+    return preset
 
 def import_glb(glb_path):
     """Import modèle GLB"""
@@ -76,50 +70,16 @@ def create_gold_ball(position):
     ball = bpy.context.active_object
     ball.name = "GoldenBall"
     
-    # Matériau or
-    mat = bpy.data.materials.new("Mat_Gold_Ball")
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    principled = nodes.new('ShaderNodeBsdfPrincipled')
-    
-    principled.inputs['Base Color'].default_value = (1.0, 0.766, 0.336, 1.0)
-    principled.inputs['Metallic'].default_value = 1.0
-    principled.inputs['Roughness'].default_value = 0.05
-    principled.inputs['Emission Color'].default_value = (1.0, 0.766, 0.336, 1.0)
-    principled.inputs['Emission Strength'].default_value = 0.5
-    
-    mat.node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-    ball.data.materials.append(mat)
+    # Matériau or (partagé via le registre de styles)
+    STYLE.assign([ball], 'ball')
     
     bpy.ops.object.shade_smooth()
     
     return ball
 
-def setup_luxury_lights():
-    """Éclairage warm gold"""
-    # Key
-    bpy.ops.object.light_add(type='AREA', location=(8, -12, 18))
-    key = bpy.context.active_object
-    key.data.energy = 2500
-    key.data.size = 15
-    key.data.color = (1.0, 0.85, 0.6)
-    
-    # Rim
-    bpy.ops.object.light_add(type='AREA', location=(-10, -10, 15))
-    rim = bpy.context.active_object
-    rim.data.energy = 1500
-    rim.data.size = 12
-    rim.data.color = (1.0, 0.75, 0.4)
-    
-    # Spot sur balle
-    bpy.ops.object.light_add(type='SPOT', location=(0, -8, 20))
-    spot = bpy.context.active_object
-    spot.data.energy = 3500
-    spot.data.spot_size = math.radians(45)
-    spot.data.color = (1.0, 0.9, 0.7)
+def setup_luxury_lights(preset=None):
+    """Éclairage warm gold (budget du preset)"""
+    return STYLE.create_lights(preset)
 
 def setup_camera(target_position):
     """Caméra cinématique"""
@@ -144,7 +104,7 @@ def main():
     
     if 'glb' not in args:
         print("ERROR: --glb argument required")
-        print("Usage: blender -b -P import_meshy_level.py -- --glb path/to/model.glb")
+        print("Usage: blender -b -P import_meshy_level.py -- --glb path/to/model.glb [--preset final] [--timingLog timing.jsonl]")
         sys.exit(1)
     
     glb_path = args['glb']
@@ -153,11 +113,16 @@ def main():
     print("🏆 IMPORT MESHY.AI LUXURY LEVEL")
     print("="*70 + "\n")
     
-    clear_scene()
-    setup_render()
+    profiler = RenderProfiler(args.get('timingLog'), script='import_meshy_level', glb=glb_path)
+    
+    with profiler.stage('clear_scene'):
+        clear_scene()
+    with profiler.stage('setup_render'):
+        preset = setup_render(args.get('preset'), args.get('engine'))
     
     # Import niveau IA
-    imported = import_glb(glb_path)
+    with profiler.stage('import_glb'):
+        imported = import_glb(glb_path)
     
     # Calculer centre du niveau
     if imported:
@@ -176,11 +141,13 @@ def main():
     
     # Ajouter balle dorée
     ball_pos = (center.x, center.y, center.z + 3)
-    ball = create_gold_ball(ball_pos)
-    
-    # Setup lights et caméra
-    setup_luxury_lights()
-    camera = setup_camera(ball_pos)
+    with profiler.stage('build_scene'):
+        ball = create_gold_ball(ball_pos)
+        
+        # Setup lights et caméra
+        setup_luxury_lights(preset)
+        camera = setup_camera(ball_pos)
+    profiler.scene_stats()
     
     # Rendu frame test
     output_path = "/tmp/meshy_luxury_test.png"
@@ -192,7 +159,9 @@ def main():
     print("Rendering test frame...")
     print("-"*70)
     
+    profiler.attach(scene)
     bpy.ops.render.render(write_still=True)
+    profiler.finish(scene)
     
     print("\n" + "="*70)
     print(f"✨ SUCCESS: {output_path}")
@@ -1,38 +1,202 @@
 """
 Post-traitement MIDI pour améliorer la qualité
+Usage: python improve_midi.py input.mid output.mid [--min-duration 0.1] [--subdivision 16]
+
+Chaque piste est convertie en tableau NumPy de notes en ticks absolus
+(start, end, pitch, velocity, channel), puis traitée en vectoriel:
+- filtre des notes trop courtes (< 100ms, tempo map du fichier)
+- quantization du début des notes sur la grille 1/16 (durée conservée)
+- normalisation des vélocités dans [60, 127]
+Les autres messages (meta, program_change, CC...) sont conservés à leur tick.
 """
-import sys
-from mido import MidiFile, MidiTrack, Message
+import argparse
+import numpy as np
+from mido import MidiFile, MidiTrack, Message, MetaMessage
 
-def improve_midi(input_path, output_path):
-    mid = MidiFile(input_path)
-    new_mid = MidiFile()
-    new_mid.ticks_per_beat = mid.ticks_per_beat
-    
+DEFAULT_TEMPO = 500000  # µs par beat (120 BPM), valeur MIDI par défaut
+
+NOTE_DTYPE = np.dtype([
+    ('start', np.int64),
+    ('end', np.int64),
+    ('pitch', np.int16),
+    ('velocity', np.int16),
+    ('channel', np.int16),
+])
+
+
+def tempo_map(mid):
+    """(ticks, tempos) des changements de tempo, toutes pistes confondues"""
+    changes = {0: DEFAULT_TEMPO}
     for track in mid.tracks:
-        new_track = MidiTrack()
-        notes = []
-        
-        # Collecter toutes les notes
+        tick = 0
         for msg in track:
-            if msg.type == 'note_on' and msg.velocity > 0:
-                notes.append(msg)
-        
-        # Filtrer notes trop courtes (< 100ms)
-        # Quantizer au 1/16
-        # Ajuster vélocités
-        
-        for msg in track:
-            if msg.type in ['note_on', 'note_off']:
-                if msg.type == 'note_on' and msg.velocity > 0:
-                    # Augmenter vélocité minimum
-                    msg.velocity = max(60, msg.velocity)
-            new_track.append(msg)
-        
-        new_mid.tracks.append(new_track)
-    
+            tick += msg.time
+            if msg.type == 'set_tempo':
+                changes[tick] = msg.tempo
+    ticks = np.array(sorted(changes), dtype=np.int64)
+    return ticks, np.array([changes[t] for t in ticks], dtype=np.float64)
+
+
+def ticks_to_seconds(ticks, tempos, ticks_per_beat):
+    """Conversion vectorielle ticks absolus -> secondes selon la tempo map"""
+    change_ticks, change_tempos = tempos
+    seconds_per_tick = change_tempos / 1e6 / ticks_per_beat
+    # Secondes écoulées au début de chaque segment de tempo
+    offsets = np.concatenate(([0.0], np.cumsum(np.diff(change_ticks) * seconds_per_tick[:-1])))
+    segment = np.searchsorted(change_ticks, ticks, side='right') - 1
+    return offsets[segment] + (ticks - change_ticks[segment]) * seconds_per_tick[segment]
+
+
+def track_notes(track):
+    """Notes (NOTE_DTYPE) et autres messages [(tick, msg)] d'une piste"""
+    ticks = np.cumsum([msg.time for msg in track], dtype=np.int64)
+    events, others = [], []
+    for tick, msg in zip(ticks.tolist(), track):
+        if msg.type == 'note_on' and msg.velocity > 0:
+            events.append((tick, msg.channel, msg.note, msg.velocity, 1))
+        elif msg.type in ('note_on', 'note_off'):
+            events.append((tick, msg.channel, msg.note, 0, 0))
+        elif msg.type != 'end_of_track':
+            others.append((tick, msg))
+    track_end = int(ticks[-1]) if len(ticks) else 0
+
+    if not events:
+        return np.zeros(0, dtype=NOTE_DTYPE), others, track_end
+
+    events = np.array(events, dtype=np.int64)
+    is_on = events[:, 4] == 1
+    # Code (touche, position dans la piste): trié par touche puis dans l'ordre du flux
+    code = (events[:, 1] * 128 + events[:, 2]) * len(events) + np.arange(len(events))
+    on_idx = np.flatnonzero(is_on)
+    off_idx = np.flatnonzero(~is_on)
+    off_idx = off_idx[np.argsort(code[off_idx])]
+    off_code = code[off_idx]
+
+    notes = np.zeros(len(on_idx), dtype=NOTE_DTYPE)
+    notes['start'] = events[on_idx, 0]
+    notes['end'] = track_end  # note jamais relâchée: tenue jusqu'à la fin de piste
+    if len(off_idx):
+        # Premier note_off de la même touche qui suit le note_on (les note_off
+        # orphelins ou en trop ne décalent pas les appariements suivants)
+        pos = np.searchsorted(off_code, code[on_idx], side='right')
+        found = pos < len(off_code)
+        pos = np.minimum(pos, len(off_code) - 1)
+        matched = found & (off_code[pos] // len(events) == code[on_idx] // len(events))
+        notes['end'][matched] = events[off_idx[pos[matched]], 0]
+    notes['pitch'] = events[on_idx, 2]
+    notes['velocity'] = events[on_idx, 3]
+    notes['channel'] = events[on_idx, 1]
+    return notes[np.argsort(notes['start'], kind='stable')], others, track_end
+
+
+def filter_short(notes, tempos, ticks_per_beat, min_duration=0.1):
+    """Retire les notes plus courtes que min_duration secondes"""
+    duration = (ticks_to_seconds(notes['end'], tempos, ticks_per_beat)
+                - ticks_to_seconds(notes['start'], tempos, ticks_per_beat))
+    return notes[duration >= min_duration]
+
+
+def quantize(notes, ticks_per_beat, subdivision=16, strength=1.0):
+    """Début des notes attiré vers la grille (1/subdivision de ronde), durée conservée"""
+    grid = ticks_per_beat * 4 / subdivision
+    duration = notes['end'] - notes['start']
+    start = notes['start'].astype(np.float64)
+    start += (np.round(start / grid) * grid - start) * strength
+    notes = notes.copy()
+    notes['start'] = np.maximum(np.rint(start), 0)
+    notes['end'] = notes['start'] + np.maximum(duration, 1)
+    return notes
+
+
+def normalize_velocity(notes, low=60, high=127):
+    """Étire les vélocités de la piste dans [low, high]"""
+    if not len(notes):
+        return notes
+    velocity = notes['velocity'].astype(np.float64)
+    v_min, v_max = velocity.min(), velocity.max()
+    notes = notes.copy()
+    if v_max > v_min:
+        notes['velocity'] = np.rint(low + (velocity - v_min) * (high - low) / (v_max - v_min))
+    else:
+        notes['velocity'] = np.clip(velocity, low, high)
+    return notes
+
+
+def trim_overlaps(notes):
+    """Coupe une note quand la même touche (canal, pitch) est rejouée avant sa fin"""
+    if len(notes) < 2:
+        return notes
+    order = np.lexsort((notes['start'], notes['pitch'], notes['channel']))
+    notes = notes[order]
+    same_key = ((notes['channel'][1:] == notes['channel'][:-1])
+                & (notes['pitch'][1:] == notes['pitch'][:-1]))
+    next_start = notes['start'][1:]
+    overlap = same_key & (notes['end'][:-1] > next_start)
+    notes['end'][:-1][overlap] = next_start[overlap]
+    notes = notes[notes['end'] > notes['start']]
+    return notes[np.argsort(notes['start'], kind='stable')]
+
+
+def process_notes(notes, tempos, ticks_per_beat, min_duration=0.1, subdivision=16,
+                  strength=1.0, velocity_range=(60, 127)):
+    """Chaîne complète sur un tableau de notes; utilisable sans fichier MIDI"""
+    notes = filter_short(notes, tempos, ticks_per_beat, min_duration)
+    if subdivision:
+        notes = quantize(notes, ticks_per_beat, subdivision, strength)
+    notes = normalize_velocity(notes, *velocity_range)
+    return trim_overlaps(notes)
+
+
+def build_track(notes, others, track_end):
+    """Reconstruit une piste: messages triés par tick, note_off avant note_on"""
+    # (tick, priorité, index, message): meta < note_off < autres < note_on
+    events = [(tick, 0 if msg.is_meta else 2, i, msg) for i, (tick, msg) in enumerate(others)]
+    for i, (start, end, pitch, velocity, channel) in enumerate(notes.tolist()):
+        events.append((start, 3, i, Message('note_on', channel=channel, note=pitch, velocity=velocity)))
+        events.append((end, 1, i, Message('note_off', channel=channel, note=pitch, velocity=0)))
+    events.sort(key=lambda e: e[:3])
+
+    track = MidiTrack()
+    last = 0
+    for tick, _, _, msg in events:
+        track.append(msg.copy(time=tick - last))
+        last = tick
+    track.append(MetaMessage('end_of_track', time=max(track_end - last, 0)))
+    return track
+
+
+def improve_midi(input_path, output_path, min_duration=0.1, subdivision=16, strength=1.0,
+                 velocity_range=(60, 127)):
+    mid = MidiFile(input_path)
+    tempos = tempo_map(mid)
+    new_mid = MidiFile(type=mid.type, ticks_per_beat=mid.ticks_per_beat)
+    stats = {'tracks': len(mid.tracks), 'notes_in': 0, 'notes_out': 0}
+
+    for track in mid.tracks:
+        notes, others, track_end = track_notes(track)
+        improved = process_notes(notes, tempos, mid.ticks_per_beat, min_duration,
+                                 subdivision, strength, velocity_range)
+        end = max([track_end] + ([int(improved['end'].max())] if len(improved) else []))
+        new_mid.tracks.append(build_track(improved, others, end))
+        stats['notes_in'] += len(notes)
+        stats['notes_out'] += len(improved)
+
     new_mid.save(output_path)
-    print(f"✓ MIDI amélioré: {output_path}")
+    print(f"✓ MIDI amélioré: {output_path} "
+          f"({stats['notes_out']}/{stats['notes_in']} notes, {stats['tracks']} pistes)")
+    return stats
+
 
 if __name__ == '__main__':
-    improve_midi(sys.argv[1], sys.argv[2])
+    parser = argparse.ArgumentParser(description='Post-traitement MIDI (filtre, quantize, vélocités)')
+    parser.add_argument('input', help='MIDI source')
+    parser.add_argument('output', help='MIDI amélioré')
+    parser.add_argument('--min-duration', type=float, default=0.1, help='Durée minimum des notes (s)')
+    parser.add_argument('--subdivision', type=int, default=16, help='Grille de quantization (0 = désactivée)')
+    parser.add_argument('--strength', type=float, default=1.0, help='Force de quantization 0-1')
+    parser.add_argument('--velocity-min', type=int, default=60)
+    parser.add_argument('--velocity-max', type=int, default=127)
+    args = parser.parse_args()
+
+    improve_midi(args.input, args.output, args.min_duration, args.subdivision, args.strength,
+                 (args.velocity_min, args.velocity_max))
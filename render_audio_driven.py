@@ -10,6 +10,15 @@ import math
 from pathlib import Path
 from mathutils import Vector
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'src' / 'blender'))
+from render_presets import get_preset
+from render_engine import choose_preset, setup_engine
+from instrumentation import RenderProfiler
+from camera_solver import animate_follow_camera
+from keyframes import insert_keys
+from onset_animation import compile_onset_animation, format_stats
+from styles import available_styles, get_style
+
 # ============================================================================
 # IMPORT & SETUP
 # ============================================================================
@@ -27,66 +36,18 @@ def import_glb(glb_path):
     print(f"✓ Imported {len(imported)} objects")
     return imported
 
-def create_gold_ball(position=(0, 0, 5)):
-    """Create golden ball"""
+def create_gold_ball(position=(0, 0, 5), style=None):
+    """Create golden ball (material from the style registry)"""
     bpy.ops.mesh.primitive_uv_sphere_add(radius=0.7, location=position)
     ball = bpy.context.active_object
     ball.name = "GoldenBall"
-    
-    # Gold material
-    mat = bpy.data.materials.new(name="Gold")
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-    
-    bsdf.inputs['Base Color'].default_value = (1.0, 0.766, 0.336, 1.0)
-    bsdf.inputs['Metallic'].default_value = 1.0
-    bsdf.inputs['Roughness'].default_value = 0.05
-    
-    mat.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
-    ball.data.materials.append(mat)
-    
+    (style or get_style('audio_gold')).assign([ball], 'ball')
     return ball
 
-def setup_luxury_lights():
-    """Create 4-point luxury lighting"""
-    lights = []
-    
-    # Key light
-    bpy.ops.object.light_add(type='AREA', location=(6, -10, 15))
-    key = bpy.context.active_object
-    key.data.energy = 2000
-    key.data.color = (1.0, 0.85, 0.6)
-    key.data.size = 5
-    lights.append(key)
-    
-    # Rim light
-    bpy.ops.object.light_add(type='AREA', location=(-8, -8, 12))
-    rim = bpy.context.active_object
-    rim.data.energy = 1200
-    rim.data.color = (1.0, 0.75, 0.4)
-    rim.data.size = 4
-    lights.append(rim)
-    
-    # Back light
-    bpy.ops.object.light_add(type='POINT', location=(0, 8, 10))
-    back = bpy.context.active_object
-    back.data.energy = 800
-    back.data.color = (0.9, 0.7, 0.3)
-    lights.append(back)
-    
-    # Spot from above
-    bpy.ops.object.light_add(type='SPOT', location=(0, -5, 18))
-    spot = bpy.context.active_object
-    spot.data.energy = 3000
-    spot.data.spot_size = math.radians(40)
-    spot.data.color = (1.0, 0.9, 0.7)
-    lights.append(spot)
-    
-    print("✓ Luxury lights setup")
+def setup_luxury_lights(style=None, preset=None):
+    """Create the style's luxury lighting (within the preset light budget)"""
+    lights = (style or get_style('audio_gold')).create_lights(preset)
+    print(f"✓ Luxury lights setup ({len(lights)} lights)")
     return lights
 
 def setup_camera(target_location):
@@ -108,23 +69,15 @@ def setup_camera(target_location):
     print("✓ Camera setup")
     return camera
 
-def setup_world():
-    """Dark elegant background"""
-    world = bpy.context.scene.world
-    world.use_nodes = True
-    bg = world.node_tree.nodes['Background']
-    bg.inputs['Color'].default_value = (0.02, 0.02, 0.03, 1.0)
-    bg.inputs['Strength'].default_value = 0.1
+def setup_world(style=None, preset=None):
+    """Dark elegant background (plus the energy of lights over budget)"""
+    (style or get_style('audio_gold')).setup_world(bpy.context.scene, preset)
 
-def setup_render_settings(output_path, fps=30):
-    """Configure EEVEE render settings"""
+def setup_render_settings(output_path, fps=30, preset_name=None, engine=None):
+    """Configure render settings from the selected quality preset"""
     scene = bpy.context.scene
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.resolution_x = 1080
-    scene.render.resolution_y = 1920
-    scene.render.fps = fps
+    setup_engine(scene, preset_name, engine, fps=fps)
     scene.render.filepath = output_path
-    scene.render.image_settings.file_format = 'PNG'
 
 # ============================================================================
 # ANIMATION
@@ -181,59 +134,17 @@ def animate_ball(ball, onsets, duration, fps=30):
     
     ball.animation_data_clear()
     
-    # Start position
-    ball.location = path_points[0]
-    ball.keyframe_insert(data_path="location", frame=1)
-    ball.keyframe_insert(data_path="scale", frame=1)
-    
-    # Keyframe at each onset
-    for i, onset_time in enumerate(onsets):
-        frame = int(onset_time * fps) + 1
-        path_idx = min(int((onset_time / duration) * len(path_points)), len(path_points) - 1)
-        
-        # Bounce at onset
-        ball.location = path_points[path_idx]
-        ball.scale = (1.2, 1.2, 1.2)
-        ball.keyframe_insert(data_path="location", frame=frame)
-        ball.keyframe_insert(data_path="scale", frame=frame)
-        
-        # Recover
-        if frame + 3 <= duration * fps:
-            ball.scale = (1.0, 1.0, 1.0)
-            ball.keyframe_insert(data_path="scale", frame=frame + 3)
-    
-    # End position
-    final_frame = int(duration * fps)
-    ball.location = path_points[-1]
-    ball.scale = (1.0, 1.0, 1.0)
-    ball.keyframe_insert(data_path="location", frame=final_frame)
-    ball.keyframe_insert(data_path="scale", frame=final_frame)
+    # Merged onsets + resolved squash/recover envelopes, inserted in bulk
+    anim = compile_onset_animation(onsets, duration, path_points, fps)
+    insert_keys(ball, 'location', anim['location'])
+    insert_keys(ball, 'scale', anim['scale'])
     
-    print(f"✓ {len(onsets)} keyframes created")
+    print(f"✓ {format_stats(anim['stats'])}")
 
 def animate_camera(camera, ball, duration, fps=30):
-    """Camera follows ball"""
-    camera.animation_data_clear()
-    offset = (8, -6, 5)
-    
-    for progress in [0, 0.33, 0.67, 1.0]:
-        frame = int(progress * duration * fps) + 1
-        bpy.context.scene.frame_set(frame)
-        
-        ball_pos = ball.location
-        camera.location = (
-            ball_pos[0] + offset[0],
-            ball_pos[1] + offset[1],
-            ball_pos[2] + offset[2]
-        )
-        camera.keyframe_insert(data_path="location", frame=frame)
-        
-        direction = ball_pos - camera.location
-        rot_quat = direction.to_track_quat('-Z', 'Y')
-        camera.rotation_euler = rot_quat.to_euler()
-        camera.keyframe_insert(data_path="rotation_euler", frame=frame)
-    
-    print("✓ Camera tracking")
+    """Camera follows ball (smoothed, sampled every frame without frame_set)"""
+    keys = animate_follow_camera(camera, ball, 1, int(duration * fps), fps, offset=(8, -6, 5))
+    print(f"✓ Camera tracking ({keys} keys)")
 
 # ============================================================================
 # MAIN
@@ -246,7 +157,11 @@ def main():
     parser.add_argument('--analysis', required=True, help='Audio analysis JSON')
     parser.add_argument('--output', default='/tmp/audio_test.png', help='Test output')
     parser.add_argument('--fps', type=int, default=30, help='Frame rate')
+    parser.add_argument('--preset', default=None, help='Render preset (draft/preview/final/cpu)')
+    parser.add_argument('--engine', default=None, help='Render engine (auto/eevee/cycles)')
     parser.add_argument('--render-frames', type=int, default=1, help='Frames to render (0=none)')
+    parser.add_argument('--timing-log', default=None, help='Timing JSONL output (optional)')
+    parser.add_argument('--style', default='audio_gold', choices=available_styles(), help='Visual style')
     args = parser.parse_args(sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else [])
     
     print("\n" + "="*70)
@@ -256,10 +171,13 @@ def main():
     # Load audio analysis
     onsets, duration = load_audio_analysis(args.analysis)
     print(f"Audio: {duration:.1f}s, {len(onsets)} onsets\n")
+    profiler = RenderProfiler(args.timing_log, script='render_audio_driven', glb=args.glb, onsets=len(onsets))
     
     # Clear and import
-    clear_scene()
-    imported = import_glb(args.glb)
+    with profiler.stage('clear_scene'):
+        clear_scene()
+    with profiler.stage('import_glb'):
+        imported = import_glb(args.glb)
     
     # Find level center
     if imported:
@@ -271,10 +189,13 @@ def main():
         center = Vector((0, 0, 0))
     
     # Setup scene
-    ball = create_gold_ball(position=(center.x, center.y, center.z + 3))
-    setup_luxury_lights()
-    camera = setup_camera(center)
-    setup_world()
+    with profiler.stage('build_scene'):
+        style = get_style(args.style)
+        ball = create_gold_ball(position=(center.x, center.y, center.z + 3), style=style)
+        preset = get_preset(choose_preset(args.preset, args.engine))[1]
+        setup_luxury_lights(style, preset)
+        camera = setup_camera(center)
+        setup_world(style, preset)
     
     # Setup timeline
     bpy.context.scene.frame_start = 1
@@ -282,8 +203,11 @@ def main():
     bpy.context.scene.render.fps = args.fps
     
     # Animate
-    animate_ball(ball, onsets, duration, args.fps)
-    animate_camera(camera, ball, duration, args.fps)
+    with profiler.stage('animate_ball'):
+        animate_ball(ball, onsets, duration, args.fps)
+    with profiler.stage('animate_camera'):
+        animate_camera(camera, ball, duration, args.fps)
+    profiler.scene_stats()
     
     print(f"\n✓ Animation ready: {int(duration * args.fps)} frames")
     
@@ -293,7 +217,8 @@ def main():
         print("  Rendering test frames...")
         print('─'*70 + "\n")
         
-        setup_render_settings(args.output, args.fps)
+        setup_render_settings(args.output, args.fps, args.preset, args.engine)
+        profiler.attach()
         
         for i in range(args.render_frames):
             frame = 1 + i * (int(duration * args.fps) // args.render_frames) if args.render_frames > 1 else 1
@@ -302,6 +227,8 @@ def main():
             bpy.context.scene.render.filepath = output
             bpy.ops.render.render(write_still=True)
             print(f"✓ Frame {frame} → {output}")
+        
+        profiler.finish()
     
     print("\n" + "="*70)
     print("  ✨ SUCCESS")
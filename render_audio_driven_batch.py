@@ -10,6 +10,16 @@ import math
 from pathlib import Path
 from mathutils import Vector
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'src' / 'blender'))
+from render_presets import get_preset
+from render_engine import choose_preset, setup_engine
+from instrumentation import RenderProfiler
+from camera_solver import animate_follow_camera
+from keyframes import insert_keys
+from onset_animation import compile_onset_animation, format_stats, onset_frame
+from frame_step import clear_manifests, render_stepped
+from styles import available_styles, get_style
+
 # ============================================================================
 # IMPORT & SETUP (same as render_audio_driven.py)
 # ============================================================================
@@ -25,56 +35,18 @@ def import_glb(glb_path):
     print(f"✓ Imported {len(imported)} objects")
     return imported
 
-def create_gold_ball(position=(0, 0, 5)):
+def create_gold_ball(position=(0, 0, 5), style=None):
+    """Create golden ball (material from the style registry)"""
     bpy.ops.mesh.primitive_uv_sphere_add(radius=0.7, location=position)
     ball = bpy.context.active_object
     ball.name = "GoldenBall"
-    
-    mat = bpy.data.materials.new(name="Gold")
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-    bsdf.inputs['Base Color'].default_value = (1.0, 0.766, 0.336, 1.0)
-    bsdf.inputs['Metallic'].default_value = 1.0
-    bsdf.inputs['Roughness'].default_value = 0.05
-    
-    mat.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
-    ball.data.materials.append(mat)
+    (style or get_style('audio_gold')).assign([ball], 'ball')
     return ball
 
-def setup_luxury_lights():
-    lights = []
-    
-    bpy.ops.object.light_add(type='AREA', location=(6, -10, 15))
-    key = bpy.context.active_object
-    key.data.energy = 2000
-    key.data.color = (1.0, 0.85, 0.6)
-    key.data.size = 5
-    lights.append(key)
-    
-    bpy.ops.object.light_add(type='AREA', location=(-8, -8, 12))
-    rim = bpy.context.active_object
-    rim.data.energy = 1200
-    rim.data.color = (1.0, 0.75, 0.4)
-    rim.data.size = 4
-    lights.append(rim)
-    
-    bpy.ops.object.light_add(type='POINT', location=(0, 8, 10))
-    back = bpy.context.active_object
-    back.data.energy = 800
-    back.data.color = (0.9, 0.7, 0.3)
-    lights.append(back)
-    
-    bpy.ops.object.light_add(type='SPOT', location=(0, -5, 18))
-    spot = bpy.context.active_object
-    spot.data.energy = 3000
-    spot.data.spot_size = math.radians(40)
-    spot.data.color = (1.0, 0.9, 0.7)
-    lights.append(spot)
-    
+def setup_luxury_lights(style=None, preset=None):
+    """Create the style's luxury lighting (within the preset light budget)"""
+    lights = (style or get_style('audio_gold')).create_lights(preset)
+    print(f"✓ Luxury lights setup ({len(lights)} lights)")
     return lights
 
 def setup_camera(target_location):
@@ -93,21 +65,14 @@ def setup_camera(target_location):
     bpy.context.scene.camera = camera
     return camera
 
-def setup_world():
-    world = bpy.context.scene.world
-    world.use_nodes = True
-    bg = world.node_tree.nodes['Background']
-    bg.inputs['Color'].default_value = (0.02, 0.02, 0.03, 1.0)
-    bg.inputs['Strength'].default_value = 0.1
+def setup_world(style=None, preset=None):
+    """Dark elegant background (plus the energy of lights over budget)"""
+    (style or get_style('audio_gold')).setup_world(bpy.context.scene, preset)
 
-def setup_render_settings(output_dir, fps=30):
+def setup_render_settings(output_dir, fps=30, preset_name=None, engine=None):
     scene = bpy.context.scene
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.resolution_x = 1080
-    scene.render.resolution_y = 1920
-    scene.render.fps = fps
+    setup_engine(scene, preset_name, engine, fps=fps)
     scene.render.filepath = str(output_dir) + "/"
-    scene.render.image_settings.file_format = 'PNG'
 
 # ============================================================================
 # ANIMATION
@@ -154,50 +119,15 @@ def animate_ball(ball, onsets, duration, fps=30):
     path_points = get_descent_path(level, len(onsets) + 10)
     
     ball.animation_data_clear()
-    
-    ball.location = path_points[0]
-    ball.keyframe_insert(data_path="location", frame=1)
-    ball.keyframe_insert(data_path="scale", frame=1)
-    
-    for i, onset_time in enumerate(onsets):
-        frame = int(onset_time * fps) + 1
-        path_idx = min(int((onset_time / duration) * len(path_points)), len(path_points) - 1)
-        
-        ball.location = path_points[path_idx]
-        ball.scale = (1.2, 1.2, 1.2)
-        ball.keyframe_insert(data_path="location", frame=frame)
-        ball.keyframe_insert(data_path="scale", frame=frame)
-        
-        if frame + 3 <= duration * fps:
-            ball.scale = (1.0, 1.0, 1.0)
-            ball.keyframe_insert(data_path="scale", frame=frame + 3)
-    
-    final_frame = int(duration * fps)
-    ball.location = path_points[-1]
-    ball.scale = (1.0, 1.0, 1.0)
-    ball.keyframe_insert(data_path="location", frame=final_frame)
-    ball.keyframe_insert(data_path="scale", frame=final_frame)
+    anim = compile_onset_animation(onsets, duration, path_points, fps)
+    insert_keys(ball, 'location', anim['location'])
+    insert_keys(ball, 'scale', anim['scale'])
+    print(f"✓ {format_stats(anim['stats'])}")
 
 def animate_camera(camera, ball, duration, fps=30):
-    camera.animation_data_clear()
-    offset = (8, -6, 5)
-    
-    for progress in [0, 0.33, 0.67, 1.0]:
-        frame = int(progress * duration * fps) + 1
-        bpy.context.scene.frame_set(frame)
-        
-        ball_pos = ball.location
-        camera.location = (
-            ball_pos[0] + offset[0],
-            ball_pos[1] + offset[1],
-            ball_pos[2] + offset[2]
-        )
-        camera.keyframe_insert(data_path="location", frame=frame)
-        
-        direction = ball_pos - camera.location
-        rot_quat = direction.to_track_quat('-Z', 'Y')
-        camera.rotation_euler = rot_quat.to_euler()
-        camera.keyframe_insert(data_path="rotation_euler", frame=frame)
+    """Camera follows ball (smoothed, sampled every frame without frame_set)"""
+    keys = animate_follow_camera(camera, ball, 1, int(duration * fps), fps, offset=(8, -6, 5))
+    print(f"✓ Camera tracking ({keys} keys)")
 
 # ============================================================================
 # MAIN - BATCH RENDER
@@ -210,6 +140,15 @@ def main():
     parser.add_argument('--analysis', required=True)
     parser.add_argument('--output', required=True, help='Output directory for frames')
     parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--preset', default=None, help='Render preset (draft/preview/final/cpu)')
+    parser.add_argument('--engine', default=None, help='Render engine (auto/eevee/cycles)')
+    parser.add_argument('--max-frames', type=int, default=0, help='Limit rendered frames (0=all)')
+    parser.add_argument('--timing-log', default=None, help='Timing JSONL (default: <output>/render_timing.jsonl)')
+    parser.add_argument('--style', default='audio_gold', choices=available_styles(), help='Visual style')
+    parser.add_argument('--frame-start', type=int, default=1, help='First frame to render (shards)')
+    parser.add_argument('--frame-end', type=int, default=0, help='Last frame to render (0=last)')
+    parser.add_argument('--render-step', type=int, default=1,
+                        help='Render every Nth frame plus onset frames; the encoder interpolates the rest')
     args = parser.parse_args(sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else [])
     
     print("\n" + "="*70)
@@ -219,12 +158,21 @@ def main():
     # Load audio
     onsets, duration = load_audio_analysis(args.analysis)
     total_frames = int(duration * args.fps)
+    if args.max_frames and args.max_frames < total_frames:
+        total_frames = args.max_frames
     print(f"Audio: {duration:.1f}s, {len(onsets)} onsets")
     print(f"Rendering: {total_frames} frames @ {args.fps}fps\n")
     
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profiler = RenderProfiler(args.timing_log or str(output_dir / 'render_timing.jsonl'),
+                              script='render_audio_driven_batch', glb=args.glb, onsets=len(onsets))
+    
     # Setup scene
-    clear_scene()
-    imported = import_glb(args.glb)
+    with profiler.stage('clear_scene'):
+        clear_scene()
+    with profiler.stage('import_glb'):
+        imported = import_glb(args.glb)
     
     if imported:
         level = imported[0]
@@ -233,33 +181,52 @@ def main():
     else:
         center = Vector((0, 0, 0))
     
-    ball = create_gold_ball(position=(center.x, center.y, center.z + 3))
-    setup_luxury_lights()
-    camera = setup_camera(center)
-    setup_world()
+    with profiler.stage('build_scene'):
+        style = get_style(args.style)
+        ball = create_gold_ball(position=(center.x, center.y, center.z + 3), style=style)
+        preset = get_preset(choose_preset(args.preset, args.engine))[1]
+        setup_luxury_lights(style, preset)
+        camera = setup_camera(center)
+        setup_world(style, preset)
     
-    # Timeline
+    # Timeline (the animation covers the whole song; only the shard range is rendered)
     bpy.context.scene.frame_start = 1
     bpy.context.scene.frame_end = total_frames
     bpy.context.scene.render.fps = args.fps
     
     # Animate
     print("Creating animation...")
-    animate_ball(ball, onsets, duration, args.fps)
-    animate_camera(camera, ball, duration, args.fps)
+    with profiler.stage('animate_ball'):
+        animate_ball(ball, onsets, duration, args.fps)
+    with profiler.stage('animate_camera'):
+        animate_camera(camera, ball, duration, args.fps)
     print(f"✓ Animation ready: {total_frames} frames\n")
     
     # Render settings
-    output_dir = Path(args.output)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    setup_render_settings(output_dir, args.fps)
+    setup_render_settings(output_dir, args.fps, args.preset, args.engine)
+    profiler.scene_stats()
     
     # Batch render
     print("="*70)
     print(f"  RENDERING {total_frames} FRAMES")
     print("="*70 + "\n")
     
-    bpy.ops.render.render(animation=True)
+    scene = bpy.context.scene
+    scene.frame_start = max(1, args.frame_start)
+    scene.frame_end = min(args.frame_end or total_frames, total_frames)
+    if (scene.frame_start, scene.frame_end) != (1, total_frames):
+        print(f"Frame range: {scene.frame_start}-{scene.frame_end}")
+    
+    profiler.attach()
+    if args.render_step > 1:
+        # Onset frames stay exact (sync with the music); in-betweens are synthesized at encode
+        contacts = {onset_frame(t, args.fps) for t in onsets}
+        profiler.emit('frame_step', **render_stepped(scene, scene.frame_start, scene.frame_end,
+                                                      args.render_step, contacts, str(output_dir)))
+    else:
+        bpy.ops.render.render(animation=True)
+        clear_manifests(str(output_dir), scene.frame_start, scene.frame_end)
+    profiler.finish()
     
     print("\n" + "="*70)
     print(f"  ✨ FRAMES SAVED: {output_dir}")
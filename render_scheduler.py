@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Ordonnanceur local des rendus Blender (render_blender.py, render_audio_driven_batch.py)
+Usage: python render_scheduler.py jobs.json [--workers auto] [--memory-budget 0.85]
+                                  [--report render_report.json] [--dry-run]
+
+jobs.json: [{"script": "render_blender", "priority": 2, "shards": 4,
+             "args": {"level": "data/x_level_v0.json", "outFrames": "work/x", "cull": true}},
+            {"script": "render_audio_driven_batch",
+             "args": {"glb": "level.glb", "analysis": "song_events.json", "output": "work/y"}}]
+
+- File de priorité (heapq): priorité la plus haute d'abord, puis ordre d'arrivée.
+- Nombre de workers et threads Blender (-t) déduits des coeurs et du pic RSS
+  mesuré par job (os.wait4 -> ru_maxrss), mémorisé d'un run à l'autre.
+- Les jobs longs sont découpés en shards de coût égal: coût par frame tiré des
+  logs de timing précédents (render_timing.jsonl), coût fixe de construction
+  de scène payé une fois par shard.
+- Rapport final: attente en file, durée, RSS, utilisation CPU réelle (rusage).
+"shards" (optionnel) force le nombre de shards d'un job. Chaque shard écrit
+son log render_timing.shard<N>.jsonl dans le dossier de sortie du job.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+HISTORY_PATH = ROOT / 'data' / 'cache' / 'render_history.json'
+
+SCRIPTS = {
+    'render_blender': {
+        'path': ROOT / 'src' / 'blender' / 'render_blender.py',
+        'input': 'level', 'output': 'outFrames', 'timing': 'timingLog',
+        'range': ('frameStart', 'frameEnd'), 'max_frames': 'maxFrames',
+    },
+    'render_audio_driven_batch': {
+        'path': ROOT / 'render_audio_driven_batch.py',
+        'input': 'glb', 'output': 'output', 'timing': 'timing-log',
+        'range': ('frame-start', 'frame-end'), 'max_frames': 'max-frames',
+    },
+}
+
+# Estimations sans historique (job jamais rendu sur cette machine)
+DEFAULT_RSS_MB = 1500
+DEFAULT_FRAME_SECONDS = 2.0
+DEFAULT_SETUP_SECONDS = 15.0
+MIN_THREADS = 2          # en dessous, Blender passe son temps à synchroniser
+SHARD_SETUP_RATIO = 4.0  # un shard rend au moins 4x son coût de construction
+HISTORY_SMOOTHING = 0.5  # poids de la nouvelle mesure (moyenne exponentielle)
+
+
+# ============================================================================
+# RESSOURCES
+# ============================================================================
+
+def cpu_count():
+    """Coeurs utilisables: affinité du process, plafonnée par le quota cgroup v2"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            count = min(count, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+def available_memory_mb():
+    """Mémoire disponible (MemAvailable sous Linux, sinon mémoire physique)"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 8192
+
+
+def rss_mb(rusage):
+    """ru_maxrss en Mo (Linux: Ko, macOS: octets)"""
+    peak = rusage.ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def plan_workers(cpu_count, memory_mb, rss_estimates, requested=None):
+    """(workers, threads par worker): coeurs partagés, pics RSS tenus en mémoire"""
+    by_cpu = max(1, cpu_count // MIN_THREADS)
+    by_memory = max(1, int(memory_mb // max(rss_estimates or [DEFAULT_RSS_MB])))
+    workers = max(1, min(requested or by_cpu, by_cpu, by_memory))
+    return workers, max(1, cpu_count // workers)
+
+
+# ============================================================================
+# HISTORIQUE (coût par frame, construction, pic RSS)
+# ============================================================================
+
+def load_history(path=HISTORY_PATH):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(history, path=HISTORY_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(history, indent=2, sort_keys=True))
+
+
+def history_key(job):
+    spec = SCRIPTS[job['script']]
+    source = Path(str(job['args'].get(spec['input'], ''))).name
+    return f"{job['script']}:{job['args'].get('preset', 'default')}:{source}"
+
+
+def job_estimate(job, history):
+    """Estimation {frame_seconds, setup_seconds, rss_mb, profile} du job"""
+    entry = history.get(history_key(job))
+    if entry is None:
+        # Même script / preset, autre niveau: moyenne des entrées connues
+        prefix = history_key(job).rsplit(':', 1)[0] + ':'
+        similar = [e for k, e in history.items() if k.startswith(prefix)]
+        entry = {field: sum(e[field] for e in similar) / len(similar)
+                 for field in ('frame_seconds', 'setup_seconds', 'rss_mb')} if similar else {}
+    return {
+        'frame_seconds': entry.get('frame_seconds', DEFAULT_FRAME_SECONDS),
+        'setup_seconds': entry.get('setup_seconds', DEFAULT_SETUP_SECONDS),
+        'rss_mb': entry.get('rss_mb', DEFAULT_RSS_MB),
+        'profile': entry.get('profile'),
+    }
+
+
+def read_timing(log_path):
+    """Résumé et temps par frame d'un log JSONL de RenderProfiler"""
+    summary, frames = None, {}
+    try:
+        with open(log_path) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get('event') == 'summary':
+                    summary = event
+                elif event.get('event') == 'frame':
+                    frames[event['frame']] = event['seconds']
+    except OSError:
+        pass
+    return summary, frames
+
+
+def update_history(history, job, shards, measured_rss):
+    """Intègre les mesures des shards terminés d'un job"""
+    frame_times, setups = {}, []
+    for shard in shards:
+        summary, frames = read_timing(shard['timing_log'])
+        frame_times.update(frames)
+        if summary:
+            setups.append(sum(summary.get('stages', {}).values())
+                          + summary.get('first_frame_overhead', 0.0))
+    if not frame_times:
+        return
+
+    ordered = [frame_times[f] for f in sorted(frame_times)]
+    # Profil relatif sur 32 segments: répartit les shards là où les frames coûtent
+    buckets = min(32, len(ordered))
+    profile = [sum(chunk) / len(chunk) for chunk in
+               (ordered[i * len(ordered) // buckets:(i + 1) * len(ordered) // buckets]
+                for i in range(buckets))]
+    mean = sum(ordered) / len(ordered)
+    measured = {
+        'frame_seconds': mean,
+        'setup_seconds': sum(setups) / len(setups) if setups else DEFAULT_SETUP_SECONDS,
+        'rss_mb': measured_rss,
+        'profile': [round(p / mean, 3) for p in profile] if mean else None,
+    }
+
+    key = history_key(job)
+    previous = history.get(key)
+    if previous:
+        for field in ('frame_seconds', 'setup_seconds', 'rss_mb'):
+            measured[field] = (HISTORY_SMOOTHING * measured[field]
+                               + (1 - HISTORY_SMOOTHING) * previous[field])
+    history[key] = {k: (round(v, 4) if isinstance(v, float) else v) for k, v in measured.items()}
+
+
+# ============================================================================
+# SHARDS
+# ============================================================================
+
+def job_frames(job):
+    """Nombre de frames du job (level JSON ou analyse audio)"""
+    args = job['args']
+    spec = SCRIPTS[job['script']]
+    if job['script'] == 'render_blender':
+        with open(args['level']) as f:
+            level = json.load(f)
+        total = int(level['duration'] * level['fps'])
+    else:
+        with open(args['analysis']) as f:
+            total = int(json.load(f)['duration'] * int(args.get('fps', 30)))
+    limit = int(args.get(spec['max_frames'], 0) or 0)
+    return min(total, limit) if limit else total
+
+
+def frame_costs(frames, estimate):
+    """Coût estimé de chaque frame (profil relatif de l'historique, sinon uniforme)"""
+    profile = estimate['profile']
+    if not profile:
+        return [estimate['frame_seconds']] * frames
+    return [estimate['frame_seconds'] * profile[min(len(profile) - 1, i * len(profile) // frames)]
+            for i in range(frames)]
+
+
+def split_shards(frames, costs, count):
+    """Plages [(début, fin)] 1-indexées de coût cumulé égal"""
+    if count <= 1 or frames <= 1:
+        return [(1, frames)]
+    total = sum(costs)
+    ranges, start, acc, cut = [], 1, 0.0, 1
+    for frame, cost in enumerate(costs, start=1):
+        acc += cost
+        if acc >= total * cut / count and len(ranges) < count - 1 and frame < frames:
+            ranges.append((start, frame))
+            start, cut = frame + 1, cut + 1
+    ranges.append((start, frames))
+    return ranges
+
+
+def shard_count(frames, estimate, workers):
+    """Autant de shards que de workers, tant que chacun amortit sa construction"""
+    render = frames * estimate['frame_seconds']
+    by_setup = int(render // (estimate['setup_seconds'] * SHARD_SETUP_RATIO)) or 1
+    return max(1, min(workers, by_setup, frames))
+
+
+def job_command(job, threads, frame_range, timing_log):
+    """Ligne de commande blender -b -t N -P script -- args"""
+    spec = SCRIPTS[job['script']]
+    args = dict(job['args'])
+    if frame_range:
+        args[spec['range'][0]], args[spec['range'][1]] = frame_range
+    args[spec['timing']] = timing_log
+
+    blender = os.environ.get('BLENDER_PATH', 'blender')
+    cmd = [blender, '-b', '-t', str(threads), '-P', str(spec['path']), '--']
+    for key, value in args.items():
+        if value is False or value is None:
+            continue
+        cmd.append(f'--{key}')
+        if value is not True:
+            cmd.append(str(value))
+    return cmd
+
+
+# ============================================================================
+# ORDONNANCEUR
+# ============================================================================
+
+class RenderScheduler:
+    """File de priorité + pool de process Blender dimensionné coeurs / mémoire"""
+
+    def __init__(self, jobs, workers=None, memory_budget=0.85, history_path=HISTORY_PATH):
+        self.history_path = history_path
+        self.history = load_history(history_path)
+        self.cpu_count = cpu_count()
+        self.memory_mb = available_memory_mb() * memory_budget
+        self.queue = []
+        self.running = {}   # pid -> (process, shard)
+        self.results = []
+        self._seq = 0
+
+        estimates = [job_estimate(job, self.history) for job in jobs]
+        self.workers, self.threads = plan_workers(
+            self.cpu_count, self.memory_mb, [e['rss_mb'] for e in estimates], workers)
+        for job, estimate in zip(jobs, estimates):
+            self.submit(job, estimate)
+        # Moins de shards que de workers: threads redistribués aux workers utiles
+        if 0 < len(self.queue) < self.workers:
+            self.workers = len(self.queue)
+            self.threads = max(1, self.cpu_count // self.workers)
+
+    def submit(self, job, estimate=None):
+        """Découpe le job en shards et les met en file"""
+        if job['script'] not in SCRIPTS:
+            raise ValueError(f"Unknown script '{job['script']}' (known: {', '.join(SCRIPTS)})")
+        estimate = estimate or job_estimate(job, self.history)
+        job['parts'] = []
+        output = Path(job['args'][SCRIPTS[job['script']]['output']])
+
+        if job.get('args', {}).get('variants'):
+            ranges = [None]  # rendu multi-variantes: un seul process
+        else:
+            frames = job_frames(job)
+            count = job.get('shards') or shard_count(frames, estimate, self.workers)
+            ranges = split_shards(frames, frame_costs(frames, estimate), count)
+            if len(ranges) == 1:
+                ranges = [None]
+
+        for index, frame_range in enumerate(ranges):
+            name = 'render_timing.jsonl' if frame_range is None else f'render_timing.shard{index}.jsonl'
+            shard = {'job': job, 'range': frame_range, 'timing_log': str(output / name),
+                     'rss_mb': estimate['rss_mb'], 'queued_at': time.perf_counter()}
+            job['parts'].append(shard)
+            heapq.heappush(self.queue, (-job.get('priority', 0), self._seq, shard))
+            self._seq += 1
+
+    def _reserved_mb(self):
+        return sum(shard['rss_mb'] for _, shard in self.running.values())
+
+    def _start(self, shard):
+        job = shard['job']
+        Path(shard['timing_log']).parent.mkdir(parents=True, exist_ok=True)
+        cmd = job_command(job, self.threads, shard['range'], shard['timing_log'])
+        shard['started_at'] = time.perf_counter()
+        shard['command'] = cmd
+        log = open(Path(shard['timing_log']).with_suffix('.log'), 'w')
+        process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+        self.running[process.pid] = (process, shard)
+        label = f"{job['script']} {shard['range'] or 'all frames'}"
+        print(f"▶ {label} (pid {process.pid}, {self.threads} threads)")
+
+    def _reap(self):
+        """Attend la fin d'un worker: code retour, pic RSS et temps CPU réels"""
+        pid, status, rusage = os.wait4(-1, 0)
+        if pid not in self.running:
+            return
+        process, shard = self.running.pop(pid)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        wall = time.perf_counter() - shard['started_at']
+        shard.update({
+            'returncode': process.returncode,
+            'wait_seconds': round(shard['started_at'] - shard['queued_at'], 2),
+            'run_seconds': round(wall, 2),
+            'cpu_seconds': round(rusage.ru_utime + rusage.ru_stime, 2),
+            'peak_rss_mb': round(rss_mb(rusage), 1),
+        })
+        status = '✓' if process.returncode == 0 else f'✗ (code {process.returncode})'
+        print(f"{status} {shard['job']['script']} {shard['range'] or 'all frames'}: "
+              f"{wall:.1f}s, {shard['peak_rss_mb']:.0f} MB")
+        self.results.append(shard)
+
+        job = shard['job']
+        parts = job['parts']
+        if all(s.get('returncode') == 0 for s in parts):
+            update_history(self.history, job, parts, max(s['peak_rss_mb'] for s in parts))
+
+    def run(self):
+        """Vide la file; retourne le rapport"""
+        print(f"Scheduler: {len(self.queue)} shards, {self.workers} workers x {self.threads} threads "
+              f"({self.cpu_count} CPUs, {self.memory_mb:.0f} MB budget)")
+        started = time.perf_counter()
+        while self.queue or self.running:
+            # Admission: un worker libre et le pic RSS estimé tient dans le budget
+            while self.queue and len(self.running) < self.workers:
+                shard = self.queue[0][2]
+                if self.running and self._reserved_mb() + shard['rss_mb'] > self.memory_mb:
+                    break
+                heapq.heappop(self.queue)
+                self._start(shard)
+            self._reap()
+
+        save_history(self.history, self.history_path)
+        return self.report(time.perf_counter() - started)
+
+    def report(self, wall):
+        shards = self.results
+        cpu = sum(s['cpu_seconds'] for s in shards)
+        report = {
+            'cpu_count': self.cpu_count,
+            'workers': self.workers,
+            'threads': self.threads,
+            'memory_budget_mb': round(self.memory_mb),
+            'wall_seconds': round(wall, 2),
+            'shards': len(shards),
+            'failed': sum(1 for s in shards if s['returncode'] != 0),
+            'cpu_utilization': round(cpu / (wall * self.cpu_count), 3) if wall else 0.0,
+            'avg_wait_seconds': round(sum(s['wait_seconds'] for s in shards) / len(shards), 2) if shards else 0.0,
+            'max_peak_rss_mb': max((s['peak_rss_mb'] for s in shards), default=0),
+            'jobs': [{'script': s['job']['script'], 'range': s['range'],
+                      **{k: s[k] for k in ('returncode', 'wait_seconds', 'run_seconds',
+                                            'cpu_seconds', 'peak_rss_mb')}} for s in shards],
+        }
+        print(f"Done in {wall:.1f}s: {report['shards']} shards, {report['failed']} failed, "
+              f"CPU utilization {report['cpu_utilization'] * 100:.0f}%, "
+              f"avg queue wait {report['avg_wait_seconds']:.1f}s")
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Blender render scheduler')
+    parser.add_argument('jobs', help='Jobs JSON list')
+    parser.add_argument('--workers', type=int, default=None, help='Max concurrent workers (default: auto)')
+    parser.add_argument('--memory-budget', type=float, default=0.85, help='Fraction of available memory')
+    parser.add_argument('--history', default=str(HISTORY_PATH), help='Per-job cost history')
+    parser.add_argument('--report', default=None, help='Write the JSON report here')
+    parser.add_argument('--dry-run', action='store_true', help='Print the plan without rendering')
+    args = parser.parse_args()
+
+    with open(args.jobs) as f:
+        jobs = json.load(f)
+    scheduler = RenderScheduler(jobs, args.workers, args.memory_budget, args.history)
+
+    if args.dry_run:
+        for priority, _, shard in sorted(scheduler.queue):
+            cmd = job_command(shard['job'], scheduler.threads, shard['range'], shard['timing_log'])
+            print(f"[{-priority}] {' '.join(cmd)}")
+        return
+
+    if not shutil.which(os.environ.get('BLENDER_PATH', 'blender')):
+        print("ERROR: Blender not found (set BLENDER_PATH)", file=sys.stderr)
+        sys.exit(1)
+
+    report = scheduler.run()
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    sys.exit(1 if report['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+/**
+ * Wrapper Node.js pour l'analyse audio Python (src/audio/analyzeAudio.py)
+ * Onsets, tempo, beats et énergie -> events.json consommé par generateLevel
+ */
+
+import { spawn } from 'child_process';
+import { join, dirname, basename } from 'path';
+import { fileURLToPath } from 'url';
+import Logger from '../utils/logger.js';
+import CONFIG from '../config.js';
+import { readJSON } from '../utils/fsx.js';
+
+const logger = new Logger('AUDIO');
+const SCRIPT = join(dirname(fileURLToPath(import.meta.url)), 'analyzeAudio.py');
+
+/**
+ * Analyse un fichier audio (cache par hash côté Python)
+ * @param {string} audioPath - Fichier audio
+ * @param {string} eventsPath - JSON de sortie
+ * @returns {Promise<Object>} - { duration, bpm, onsets: [{t, strength}], beats, energy: [{t, rms}] }
+ */
+export async function analyzeAudio(audioPath, eventsPath) {
+  logger.info(`Analyse: ${basename(audioPath)}`);
+  const startTime = Date.now();
+
+  await new Promise((resolve, reject) => {
+    const proc = spawn(CONFIG.python.path, [SCRIPT, audioPath, '-o', eventsPath], {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      env: { ...process.env, FFMPEG_PATH: CONFIG.ffmpeg.path },
+    });
+
+    let stderr = '';
+    proc.stderr.on('data', (data) => {
+      stderr += data.toString();
+      logger.debug(data.toString().trim());
+    });
+
+    proc.on('close', (code) => {
+      if (code !== 0) {
+        reject(new Error(`Analyse audio échouée (code ${code}): ${stderr.slice(-500)}`));
+      } else {
+        resolve();
+      }
+    });
+
+    proc.on('error', (error) => {
+      reject(new Error(`Erreur spawn Python: ${error.message}`));
+    });
+  });
+
+  const events = await readJSON(eventsPath);
+  const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
+  logger.success(`${events.onsets.length} onsets, ${events.bpm} BPM, ${events.duration}s (${elapsed}s)`);
+  return events;
+}
+
+export default analyzeAudio;
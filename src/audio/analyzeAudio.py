@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Analyse audio: onsets, tempo, beats et énergie pour les renderers et generateLevel
+Usage: python src/audio/analyzeAudio.py song.mp3 [-o song_events.json]
+       python src/audio/analyzeAudio.py a.mp3 b.wav c.flac --out-dir data --jobs 3
+
+Schéma écrit (consommé par load_audio_analysis et generateLevel.js):
+    {duration, bpm, onsets: [{t, strength}], beats: [t], energy: [{t, rms}], ...}
+
+L'audio est décodé par ffmpeg (PCM float mono) et lu par blocs: STFT, flux
+spectral et RMS sont calculés bloc par bloc (mémoire constante). Les onsets
+sont les pics du flux au-dessus d'un seuil adaptatif (médiane glissante),
+le tempo vient de l'autocorrélation de l'enveloppe. Les résultats sont mis
+en cache par hash du fichier audio (+ paramètres d'analyse).
+Sans -o ni --out-dir, le JSON est écrit sur stdout (messages sur stderr).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ANALYSIS_VERSION = 2         # 2: début du signal réfléchi au lieu de silence
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = ROOT / 'data' / 'cache' / 'analysis'
+
+SAMPLE_RATE = 22050
+N_FFT = 2048
+HOP = 512
+BLOCK_FRAMES = 256          # frames STFT par bloc lu (~6s à 22050 Hz)
+LOG_COMPRESSION = 100.0     # log(1 + C·|X|): flux moins dominé par les basses
+THRESHOLD_WINDOW = 0.15     # demi-fenêtre (s) de la médiane glissante
+THRESHOLD_DELTA = 0.06      # marge au-dessus de la médiane (enveloppe normalisée)
+MIN_ONSET_GAP = 0.05        # s entre deux onsets
+BPM_RANGE = (60, 200)
+ENERGY_RATE = 10            # points d'énergie par seconde
+
+
+def audio_blocks(path, sample_rate=SAMPLE_RATE, block_size=BLOCK_FRAMES * HOP):
+    """(fréquence réelle, générateur de blocs float32 mono)"""
+    ffmpeg = os.environ.get('FFMPEG_PATH', 'ffmpeg')
+    if shutil.which(ffmpeg):
+        return sample_rate, _ffmpeg_blocks(ffmpeg, path, sample_rate, block_size)
+    if str(path).lower().endswith('.wav'):
+        with wave.open(str(path)) as wav:
+            rate = wav.getframerate()
+        return rate, _wave_blocks(path, block_size)
+    raise RuntimeError(f"ffmpeg introuvable: impossible de décoder {path}")
+
+
+def _ffmpeg_blocks(ffmpeg, path, sample_rate, block_size):
+    cmd = [ffmpeg, '-v', 'error', '-i', str(path), '-f', 'f32le', '-ac', '1',
+           '-ar', str(sample_rate), '-']
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = proc.stdout.read(block_size * 4)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) // 4 * 4], dtype='<f4')
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode(errors='replace')
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg a échoué sur {path}: {stderr.strip()}")
+
+
+def _wave_blocks(path, block_size):
+    """Repli sans ffmpeg: WAV PCM 8/16/32 bits à sa fréquence native"""
+    with wave.open(str(path)) as wav:
+        channels, width = wav.getnchannels(), wav.getsampwidth()
+        dtype, scale, offset = {1: ('u1', 128.0, 128.0), 2: ('<i2', 32768.0, 0.0),
+                                4: ('<i4', 2147483648.0, 0.0)}[width]
+        while True:
+            data = wav.readframes(block_size)
+            if not data:
+                break
+            samples = (np.frombuffer(data, dtype=dtype).astype(np.float32) - offset) / scale
+            yield samples.reshape(-1, channels).mean(axis=1)
+
+
+def leading_frames(n_fft=N_FFT, hop=HOP):
+    """Frames dont la fenêtre chevauche le remplissage initial (pas de vrais onsets)"""
+    return -(-(n_fft - hop) // hop)
+
+
+def spectral_flux(blocks, n_fft=N_FFT, hop=HOP):
+    """Flux spectral (log) et RMS par frame, calculés bloc par bloc"""
+    window = np.hanning(n_fft).astype(np.float32)
+    pad = n_fft - hop  # frame 0 centrée sur le début
+    # Début réfléchi (pas de silence numérique: le saut silence -> bruit de fond
+    # serait un faux onset à t=0); frame 0 sert de référence à elle-même
+    head, carry = [], None
+    previous = None
+    flux, rms = [], []
+    total = 0
+
+    def process(buffer):
+        nonlocal previous
+        count = (len(buffer) - n_fft) // hop + 1
+        if count <= 0:
+            return buffer
+        frames = sliding_window_view(buffer, n_fft)[::hop][:count]
+        spectrum = np.log1p(LOG_COMPRESSION * np.abs(np.fft.rfft(frames * window, axis=1)))
+        reference = np.vstack([spectrum[:1] if previous is None else previous, spectrum[:-1]])
+        flux.append(np.maximum(spectrum - reference, 0).sum(axis=1))
+        rms.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+        previous = spectrum[-1:]
+        return buffer[count * hop:]
+
+    def lead(buffer):
+        return np.pad(buffer, (pad, 0), mode='reflect' if len(buffer) > 1 else 'edge')
+
+    for block in blocks:
+        total += len(block)
+        if carry is None:
+            head.append(block)
+            buffer = np.concatenate(head)
+            if len(buffer) > pad:
+                carry = process(lead(buffer))
+            continue
+        carry = process(np.concatenate([carry, block]))
+    if carry is None:
+        if not total:
+            return np.zeros(0), np.zeros(0), total
+        carry = process(lead(np.concatenate(head)))
+    # Dernière frame partielle complétée par du silence
+    if len(carry) > n_fft - hop:
+        process(np.concatenate([carry, np.zeros(n_fft - len(carry), dtype=np.float32)]))
+
+    if not flux:
+        return np.zeros(0), np.zeros(0), total
+    return np.concatenate(flux), np.concatenate(rms), total
+
+
+def pick_onsets(envelope, fps, window=THRESHOLD_WINDOW, delta=THRESHOLD_DELTA,
+                min_gap=MIN_ONSET_GAP):
+    """Indices des pics de l'enveloppe (normalisée) au-dessus du seuil adaptatif"""
+    if len(envelope) < 3:
+        return np.zeros(0, dtype=int)
+    half = max(1, int(round(window * fps)))
+    local = sliding_window_view(np.pad(envelope, half, mode='edge'), 2 * half + 1)
+    threshold = np.median(local, axis=1) + delta
+    peaks = np.flatnonzero((envelope >= local.max(axis=1)) & (envelope > threshold))
+
+    # Écart minimum: garde le premier pic de chaque groupe rapproché
+    gap = max(1, int(round(min_gap * fps)))
+    kept, last = [], -gap
+    for peak in peaks.tolist():
+        if peak - last >= gap:
+            kept.append(peak)
+            last = peak
+    return np.array(kept, dtype=int)
+
+
+def estimate_tempo(envelope, fps, bpm_range=BPM_RANGE):
+    """(bpm, période en frames) par autocorrélation, pondérée autour de 120 BPM"""
+    min_lag = int(np.floor(60.0 * fps / bpm_range[1]))
+    max_lag = int(np.ceil(60.0 * fps / bpm_range[0]))
+    if len(envelope) <= max_lag + 1:
+        return 0.0, 0.0
+
+    x = envelope - envelope.mean()
+    size = 1 << int(np.ceil(np.log2(2 * len(x))))
+    spectrum = np.fft.rfft(x, size)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), size)[:len(x)]
+
+    lags = np.arange(max(min_lag, 1), max_lag + 1)
+    prior = np.exp(-0.5 * np.log2(60.0 * fps / lags / 120.0) ** 2)
+    best = int(lags[np.argmax(autocorr[lags] * prior)])
+
+    # Interpolation parabolique: période sous la frame
+    a, b, c = autocorr[best - 1], autocorr[best], autocorr[min(best + 1, len(autocorr) - 1)]
+    denom = a - 2 * b + c
+    period = best + (0.5 * (a - c) / denom if denom else 0.0)
+    return 60.0 * fps / period, period
+
+
+def track_beats(envelope, period):
+    """Frames des beats: grille de période fixe, phase maximisant l'enveloppe"""
+    if period <= 0:
+        return np.zeros(0, dtype=int)
+    phases = np.arange(int(np.ceil(period)))
+    count = int((len(envelope) - 1) // period) + 1
+    grid = np.rint(phases[:, None] + np.arange(count)[None, :] * period).astype(int)
+    valid = grid < len(envelope)
+    scores = np.where(valid, envelope[np.minimum(grid, len(envelope) - 1)], 0).sum(axis=1)
+    best = int(np.argmax(scores))
+    return grid[best][valid[best]]
+
+
+def analyze(path, sample_rate=SAMPLE_RATE):
+    """Analyse complète d'un fichier audio -> dict au schéma events/analysis"""
+    rate, blocks = audio_blocks(path, sample_rate)
+    flux, rms, total = spectral_flux(blocks)
+    fps = rate / HOP
+    duration = total / rate
+    # Frame k centrée sur l'échantillon k·hop (carry initial de n_fft - hop)
+    times = np.maximum(np.arange(len(flux)) * HOP + HOP - N_FFT // 2, 0) / rate
+
+    # Frames à cheval sur le remplissage initial: ni onset ni référence de normalisation
+    flux[:leading_frames()] = 0.0
+    envelope = flux / flux.max() if len(flux) and flux.max() > 0 else flux
+    peaks = pick_onsets(envelope, fps)
+    bpm, period = estimate_tempo(envelope, fps)
+    beats = track_beats(envelope, period)
+
+    # Force relative au 95e percentile des pics (quelques pics extrêmes ne tassent pas le reste)
+    if len(peaks):
+        reference = np.percentile(envelope[peaks], 95) or 1.0
+        strengths = np.clip(envelope[peaks] / reference, 0.0, 1.0)
+    else:
+        strengths = np.zeros(0)
+
+    # Énergie RMS moyennée par fenêtre de 1/ENERGY_RATE s
+    step = max(1, int(round(fps / ENERGY_RATE)))
+    usable = len(rms) // step * step
+    energy = rms[:usable].reshape(-1, step).mean(axis=1) if usable else np.zeros(0)
+    energy = energy / energy.max() if len(energy) and energy.max() > 0 else energy
+
+    return {
+        'version': ANALYSIS_VERSION,
+        'source': Path(path).name,
+        'duration': round(duration, 3),
+        'sample_rate': rate,
+        'bpm': round(float(bpm), 2),
+        'onsets': [{'t': round(float(t), 3), 'strength': round(float(s), 3)}
+                   for t, s in zip(times[peaks], strengths)],
+        'beats': [round(float(t), 3) for t in times[beats]],
+        'energy': [{'t': round(i * step / fps, 2), 'rms': round(float(e), 4)}
+                   for i, e in enumerate(energy)],
+    }
+
+
+def audio_hash(path, sample_rate=SAMPLE_RATE):
+    """Clé de cache: contenu du fichier + version et paramètres d'analyse"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(f"v{ANALYSIS_VERSION}:{sample_rate}:{N_FFT}:{HOP}:{THRESHOLD_DELTA}".encode())
+    return digest.hexdigest()[:32]
+
+
+def analyze_file(path, output=None, cache_dir=DEFAULT_CACHE_DIR, sample_rate=SAMPLE_RATE):
+    """Analyse (ou relit le cache) puis écrit output si demandé; retourne le dict"""
+    key = audio_hash(path, sample_rate)
+    cached = Path(cache_dir) / f"{key}.json" if cache_dir else None
+
+    if cached and cached.exists():
+        analysis = json.loads(cached.read_text())
+        print(f"✓ {Path(path).name}: cache {key}", file=sys.stderr)
+    else:
+        analysis = analyze(path, sample_rate)
+        analysis['audio_hash'] = key
+        if cached:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            cached.write_text(json.dumps(analysis))
+        print(f"✓ {Path(path).name}: {len(analysis['onsets'])} onsets, "
+              f"{analysis['bpm']} BPM, {analysis['duration']}s", file=sys.stderr)
+
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(analysis, indent=2))
+    return analysis
+
+
+def analyze_files(paths, out_dir, jobs=None, cache_dir=DEFAULT_CACHE_DIR, sample_rate=SAMPLE_RATE):
+    """Plusieurs fichiers en parallèle (un process par fichier) -> {chemin: sortie}"""
+    outputs = {path: str(Path(out_dir) / f"{Path(path).stem}_events.json") for path in paths}
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    if jobs == 1:
+        for path, output in outputs.items():
+            analyze_file(path, output, cache_dir, sample_rate)
+        return outputs
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(analyze_file, path, output, cache_dir, sample_rate)
+                   for path, output in outputs.items()]
+        for future in futures:
+            future.result()
+    return outputs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Onset / beat analysis (analysis JSON for the renderers)')
+    parser.add_argument('audio', nargs='+', help='Audio files')
+    parser.add_argument('-o', '--output', default=None, help='Output JSON (single input)')
+    parser.add_argument('--out-dir', default=None, help='Output directory (<stem>_events.json per input)')
+    parser.add_argument('--jobs', type=int, default=None, help='Parallel processes (default: CPU count)')
+    parser.add_argument('--sample-rate', type=int, default=SAMPLE_RATE, help='Analysis sample rate')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='Analysis cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    args = parser.parse_args()
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    try:
+        if len(args.audio) == 1 and not args.out_dir:
+            analysis = analyze_file(args.audio[0], args.output, cache_dir, args.sample_rate)
+            if not args.output:
+                print(json.dumps(analysis))
+        else:
+            analyze_files(args.audio, args.out_dir or '.', args.jobs, cache_dir, args.sample_rate)
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        sys.exit(1)
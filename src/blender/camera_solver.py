@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Caméra de suivi lissée calculée depuis la trajectoire de la balle
+Usage: from camera_solver import animate_follow_camera
+
+    animate_follow_camera(camera, ball, 1, scene.frame_end, fps=30, offset=(8, -6, 5))
+
+La trajectoire est lue une seule fois via FCurve.evaluate() (pas de frame_set,
+donc aucune évaluation du depsgraph), filtrée par un ressort critiquement amorti
+avec anticipation (look-ahead), puis écrite en masse (keyframes.insert_keys).
+"""
+
+from mathutils import Vector
+
+from keyframes import find_fcurves, insert_keys
+
+# Mêmes défauts que le schéma level (camera.follow_smooth / camera.look_ahead)
+FOLLOW_SMOOTH = 0.12
+LOOK_AHEAD = 0.35
+FOLLOW_OFFSET = (8, -6, 5)
+
+
+def sample_track(obj, frame_start, frame_end, data_path='location'):
+    """Position animée de obj à chaque frame [frame_start, frame_end]"""
+    fcurves = {fc.array_index: fc for fc in find_fcurves(obj, data_path)}
+    static = tuple(getattr(obj, data_path))
+    frames = range(frame_start, frame_end + 1)
+
+    channels = []
+    for index in range(3):
+        fcurve = fcurves.get(index)
+        if fcurve is None:
+            channels.append([static[index]] * len(frames))
+        else:
+            channels.append([fcurve.evaluate(f) for f in frames])
+    return list(zip(*channels))
+
+
+def smooth_damp(track, fps, smooth=FOLLOW_SMOOTH, look_ahead=LOOK_AHEAD):
+    """
+    Ressort critiquement amorti (temps de réponse `smooth` s) vers la position
+    de la cible `look_ahead` s plus tard. Pas de dépassement, stable à tout fps.
+    """
+    if not track:
+        return []
+
+    dt = 1.0 / fps
+    omega = 2.0 / max(smooth, 1e-4)
+    x = omega * dt
+    decay = 1.0 / (1.0 + x + 0.48 * x * x + 0.235 * x * x * x)
+    ahead = int(round(look_ahead * fps))
+    last = len(track) - 1
+
+    current = list(track[min(ahead, last)])
+    velocity = [0.0, 0.0, 0.0]
+    result = []
+    for i in range(len(track)):
+        target = track[min(i + ahead, last)]
+        for axis in range(3):
+            change = current[axis] - target[axis]
+            temp = (velocity[axis] + omega * change) * dt
+            velocity[axis] = (velocity[axis] - omega * temp) * decay
+            current[axis] = target[axis] + (change + temp) * decay
+        result.append(tuple(current))
+    return result
+
+
+def solve_follow_camera(track, fps, offset=FOLLOW_OFFSET, smooth=FOLLOW_SMOOTH,
+                        look_ahead=LOOK_AHEAD):
+    """Positions et rotations (euler) de la caméra pour chaque échantillon"""
+    # Position: lissage complet; visée: ressort deux fois plus réactif
+    positions = smooth_damp(track, fps, smooth, look_ahead)
+    aims = smooth_damp(track, fps, smooth * 0.5, look_ahead * 0.5)
+    offset = Vector(offset)
+
+    locations, rotations = [], []
+    previous = None
+    for position, aim in zip(positions, aims):
+        location = Vector(position) + offset
+        direction = Vector(aim) - location
+        if direction.length < 1e-6:
+            direction = -offset
+        quat = direction.to_track_quat('-Z', 'Y')
+        # Euler compatible avec la frame précédente: pas de saut de ±2π
+        euler = quat.to_euler('XYZ', previous) if previous is not None else quat.to_euler()
+        previous = euler
+        locations.append(tuple(location))
+        rotations.append(tuple(euler))
+    return locations, rotations
+
+
+def animate_follow_camera(camera, target, frame_start, frame_end, fps=30,
+                          offset=FOLLOW_OFFSET, smooth=FOLLOW_SMOOTH,
+                          look_ahead=LOOK_AHEAD, step=1):
+    """Anime camera pour suivre target (objet animé): une clé toutes les `step` frames"""
+    track = sample_track(target, frame_start, frame_end)
+    locations, rotations = solve_follow_camera(track, fps, offset, smooth, look_ahead)
+
+    frames = list(range(frame_start, frame_end + 1))
+    picked = list(range(0, len(frames), max(1, step)))
+    if picked and picked[-1] != len(frames) - 1:
+        picked.append(len(frames) - 1)
+
+    camera.animation_data_clear()
+    insert_keys(camera, 'location', [(frames[i], locations[i]) for i in picked])
+    insert_keys(camera, 'rotation_euler', [(frames[i], rotations[i]) for i in picked])
+    return len(picked)
+
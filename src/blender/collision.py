@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Collisions balle / plateformes orientées: pénétrations et contacts manqués
+Usage: python3 collision.py level.json [--radius 0.18] [--substeps 4] [--json]
+       from collision import check_collisions
+
+    report = check_collisions(level, trajectory=fcurve_trajectory(ball))
+
+Les plateformes sont des boîtes orientées (pos / rot / size du level, cube
+Blender de côté 2 mis à l'échelle). La sphère de la balle est balayée le long
+de la trajectoire échantillonnée (`substeps` par frame, subdivisée là où un
+pas dépasse la moitié du rayon: pas d'effet tunnel), par lots. Par lot, les
+plateformes candidates viennent du BVH mathutils dans Blender, ou d'un test
+de boîtes englobantes NumPy hors de Blender; la distance signée sphère/OBB est
+ensuite calculée en NumPy sur tous les couples du lot.
+
+Dans Blender la trajectoire est lue sur les F-curves de la balle (exacte);
+hors Blender elle est reconstruite depuis les clés de animate_ball (ball_keys)
+avec des tangentes auto-clamped, comme les courbes de Blender.
+
+Rayon par défaut: ball.radius, celui qui place les clés de contact. Autour de
+sa frame de contact la balle s'enfonce volontairement dans sa plateforme (clé
+à y + radius + 0.05 du centre, épaisseur ignorée): cet intervalle n'est pas
+une pénétration. Seules les traversées à d'autres instants (effet tunnel,
+plateforme sur la trajectoire) sont signalées. Un contact est manqué si la
+balle, à sa frame, est hors de l'emprise de la face supérieure ou au-dessus
+de celle-ci de plus de CONTACT_TOLERANCE.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+try:
+    from mathutils import Vector
+    from mathutils.bvhtree import BVHTree
+except ImportError:  # hors de Blender: préfiltrage NumPy
+    BVHTree = None
+
+BALL_SCALE = 3.0              # create_ball: rayon visuel = ball.radius x 3 (--radius)
+SUBSTEPS = 4                  # échantillons par frame avant subdivision
+BATCH = 256                   # échantillons par lot (préfiltrage)
+PENETRATION_TOLERANCE = 0.02  # profondeur ignorée (m)
+CONTACT_TOLERANCE = 0.1       # écart max sphère/plateforme à l'instant du contact (m)
+
+# Faces d'un cube (sommets dans l'ordre de box_vertices)
+BOX_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+
+def ball_keys(level):
+    """Clés [(frame, (x, y, z))] de la balle posées par render_blender.animate_ball"""
+    fps = level['fps']
+    platforms = level['platforms']
+    radius = level['ball']['radius']
+    keys = {}
+    if platforms:
+        x, y, z = platforms[0]['pos']
+        keys[1] = (x, y + 2.0, z)
+    for i, platform in enumerate(platforms):
+        frame = int(platform['t'] * fps)
+        x, y, z = platform['pos']
+        bounce = (x, y + radius + 0.05, z)
+        keys[frame] = bounce
+        if i < len(platforms) - 1:
+            following = platforms[i + 1]
+            mid_frame = int((frame + int(following['t'] * fps)) / 2)
+            mid = [(a + b) / 2 for a, b in zip(bounce, following['pos'])]
+            mid[1] += 1.0 * platform['intensity']
+            keys[mid_frame] = tuple(mid)
+    return sorted(keys.items())
+
+
+def euler_matrices(rot):
+    """Matrices (N, 3, 3) d'angles d'Euler XYZ (N, 3): Rz @ Ry @ Rx, comme Blender"""
+    cx, cy, cz = np.cos(rot).T
+    sx, sy, sz = np.sin(rot).T
+    matrices = np.empty((len(rot), 3, 3))
+    matrices[:, 0] = np.stack([cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz], axis=1)
+    matrices[:, 1] = np.stack([cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz], axis=1)
+    matrices[:, 2] = np.stack([-sy, sx * cy, cx * cy], axis=1)
+    return matrices
+
+
+def platform_boxes(level):
+    """Centres (N, 3), rotations (N, 3, 3), demi-côtés (N, 3) des plateformes"""
+    platforms = level['platforms']
+    centers = np.array([p['pos'] for p in platforms], dtype=np.float64)
+    rotations = euler_matrices(np.array([p['rot'] for p in platforms], dtype=np.float64))
+    halves = np.abs(np.array([p['size'] for p in platforms], dtype=np.float64))
+    return centers, rotations, halves
+
+
+def box_vertices(centers, rotations, halves):
+    """Sommets monde (N, 8, 3) des boîtes"""
+    signs = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float64)
+    local = signs[None] * halves[:, None]
+    return np.einsum('nij,nvj->nvi', rotations, local) + centers[:, None]
+
+
+def box_distance(local, halves):
+    """Distance signée point/boîte centrée (point en repère local), < 0 à l'intérieur"""
+    excess = np.abs(local) - halves
+    return np.linalg.norm(np.maximum(excess, 0.0), axis=-1) + np.minimum(excess.max(axis=-1), 0.0)
+
+
+def signed_distances(points, centers, rotations, halves, radius):
+    """Distance signée sphère/boîte (B, K): < 0 = pénétration de la balle dans la boîte"""
+    # Centre de la balle en repère local de chaque boîte: R^T (p - c)
+    local = np.einsum('kji,bkj->bki', rotations, points[:, None] - centers[None])
+    return box_distance(local, halves[None]) - radius
+
+
+def hermite_tangents(frames, values):
+    """Tangentes auto-clamped: pente des voisins, nulle aux extrema et aux extrémités"""
+    tangents = np.zeros_like(values)
+    if len(frames) > 2:
+        slope = (values[2:] - values[:-2]) / (frames[2:] - frames[:-2])[:, None]
+        extremum = (values[1:-1] - values[:-2]) * (values[2:] - values[1:-1]) <= 0
+        tangents[1:-1] = np.where(extremum, 0.0, slope)
+    return tangents
+
+
+def key_trajectory(keys):
+    """Trajectoire frames -> positions (F, 3) interpolant les clés (hors Blender)"""
+    frames = np.array([f for f, _ in keys], dtype=np.float64)
+    values = np.array([v for _, v in keys], dtype=np.float64)
+    tangents = hermite_tangents(frames, values)
+
+    def positions(samples):
+        samples = np.clip(samples, frames[0], frames[-1])
+        i = np.clip(np.searchsorted(frames, samples, side='right') - 1, 0, max(len(frames) - 2, 0))
+        if len(frames) == 1:
+            return np.repeat(values, len(samples), axis=0)
+        span = frames[i + 1] - frames[i]
+        s = ((samples - frames[i]) / span)[:, None]
+        h00, h10 = 2 * s ** 3 - 3 * s ** 2 + 1, s ** 3 - 2 * s ** 2 + s
+        h01, h11 = -2 * s ** 3 + 3 * s ** 2, s ** 3 - s ** 2
+        return (h00 * values[i] + h10 * span[:, None] * tangents[i]
+                + h01 * values[i + 1] + h11 * span[:, None] * tangents[i + 1])
+    return positions
+
+
+def fcurve_trajectory(obj):
+    """Trajectoire exacte depuis les F-curves location de obj (dans Blender)"""
+    from keyframes import find_fcurves
+    fcurves = {fc.array_index: fc for fc in find_fcurves(obj, 'location')}
+    static = tuple(obj.location)
+
+    def positions(samples):
+        columns = []
+        for index in range(3):
+            fcurve = fcurves.get(index)
+            columns.append([fcurve.evaluate(f) for f in samples] if fcurve
+                           else [static[index]] * len(samples))
+        return np.array(columns, dtype=np.float64).T
+    return positions
+
+
+def sample_frames(trajectory, frame_start, frame_end, radius, substeps=SUBSTEPS):
+    """Frames d'échantillonnage (S,) et positions (S, 3): aucun pas plus long que radius / 2"""
+    frames = np.linspace(frame_start, frame_end, int((frame_end - frame_start) * substeps) + 1)
+    points = trajectory(frames)
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    splits = np.maximum(np.ceil(steps / (radius / 2)).astype(np.int64), 1)
+    if splits.max() == 1:
+        return frames, points
+    # Subdivision des pas trop longs (balle rapide)
+    offsets = np.concatenate([np.arange(n) / n for n in splits])
+    starts = np.repeat(frames[:-1], splits)
+    spans = np.repeat(np.diff(frames), splits)
+    frames = np.append(starts + offsets * spans, frames[-1])
+    return frames, trajectory(frames)
+
+
+class BoxIndex:
+    """Préfiltrage des plateformes proches d'un lot de points (BVH Blender ou AABB NumPy)"""
+
+    def __init__(self, centers, rotations, halves):
+        vertices = box_vertices(centers, rotations, halves)
+        self.low, self.high = vertices.min(axis=1), vertices.max(axis=1)
+        self.reach = float(np.linalg.norm(halves, axis=1).max())
+        self.tree = None
+        if BVHTree is not None:
+            faces = (np.arange(len(centers))[:, None, None] * 8 + np.array(BOX_FACES)[None])
+            self.tree = BVHTree.FromPolygons([Vector(v) for v in vertices.reshape(-1, 3)],
+                                             faces.reshape(-1, 4).tolist())
+
+    def candidates(self, points, radius):
+        low, high = points.min(axis=0) - radius, points.max(axis=0) + radius
+        if self.tree is not None:
+            # Toute boîte qui touche le lot a une face à moins de reach de son centre
+            center = (low + high) / 2
+            distance = np.linalg.norm(high - low) / 2 + self.reach
+            hits = self.tree.find_nearest_range(Vector(center), distance)
+            return np.unique([index // len(BOX_FACES) for _, _, index, _ in hits]).astype(np.int64)
+        overlap = np.all((self.low <= high) & (self.high >= low), axis=1)
+        return np.flatnonzero(overlap)
+
+
+def contact_frames(level):
+    """Frame de contact de chaque plateforme (N,), comme ball_keys"""
+    return np.array([int(p['t'] * level['fps']) for p in level['platforms']], dtype=np.float64)
+
+
+def penetration_intervals(samples, platforms, depths, frames, fps, planned=None,
+                          tolerance=PENETRATION_TOLERANCE):
+    """Événements (échantillon, plateforme, profondeur) -> intervalles par plateforme
+
+    Les événements couvrent le contact rasant (profondeur > -CONTACT_TOLERANCE):
+    une balle qui frôle sa plateforme avant de s'y poser reste dans le même
+    intervalle. planned: frame de contact par plateforme; l'intervalle qui la
+    contient est le rebond prévu (ignoré). Seules les parties plus profondes que
+    tolerance sont rapportées.
+    """
+    if len(samples) == 0:
+        return []
+    order = np.lexsort((samples, platforms))
+    samples, platforms, depths = samples[order], platforms[order], depths[order]
+    breaks = np.flatnonzero((np.diff(platforms) != 0) | (np.diff(samples) > 1)) + 1
+    intervals = []
+    for run in np.split(np.arange(len(samples)), breaks):
+        platform = int(platforms[run[0]])
+        if planned is not None and frames[samples[run[0]]] <= planned[platform] <= frames[samples[run[-1]]]:
+            continue
+        deep = run[depths[run] > tolerance]
+        if len(deep) == 0:
+            continue
+        intervals.append({
+            'platform': platform,
+            'start': round(float(frames[samples[deep[0]]] / fps), 4),
+            'end': round(float(frames[samples[deep[-1]]] / fps), 4),
+            'max_depth': round(float(depths[deep].max()), 4),
+        })
+    return sorted(intervals, key=lambda item: item['start'])
+
+
+def missed_contacts(level, trajectory, boxes, radius, tolerance=CONTACT_TOLERANCE):
+    """Plateformes que la balle ne touche pas à leur frame de contact"""
+    centers, rotations, halves = boxes
+    points = trajectory(contact_frames(level))
+    # Repère local de chaque plateforme: hauteur du bas de la balle sur la face
+    # supérieure (+y, axe vertical des levels) et emprise de cette face
+    local = np.einsum('nji,nj->ni', rotations, points - centers)
+    gaps = local[:, 1] - halves[:, 1] - radius
+    outside = np.any(np.abs(local[:, [0, 2]]) > halves[:, [0, 2]] + radius, axis=1)
+    missed = np.flatnonzero((gaps > tolerance) | outside)
+    return [{'platform': int(i), 't': level['platforms'][i]['t'], 'gap': round(float(gaps[i]), 4)}
+            for i in missed]
+
+
+def check_collisions(level, trajectory=None, radius=None, substeps=SUBSTEPS,
+                     tolerance=PENETRATION_TOLERANCE, frame_start=1, frame_end=None):
+    """Pénétrations (intervalles) et contacts manqués sur toute la durée; dict de rapport"""
+    began = time.perf_counter()
+    fps = level['fps']
+    radius = radius or level['ball']['radius']
+    trajectory = trajectory or key_trajectory(ball_keys(level))
+    frame_end = frame_end or int(level['duration'] * fps)
+
+    boxes = platform_boxes(level)
+    index = BoxIndex(*boxes)
+    frames, points = sample_frames(trajectory, frame_start, frame_end, radius, substeps)
+
+    events = []
+    for start in range(0, len(points), BATCH):
+        batch = points[start:start + BATCH]
+        candidates = index.candidates(batch, radius)
+        if len(candidates) == 0:
+            continue
+        distances = signed_distances(batch, *(b[candidates] for b in boxes), radius)
+        rows, cols = np.nonzero(distances < CONTACT_TOLERANCE)
+        events.append((rows + start, candidates[cols], -distances[rows, cols]))
+
+    if events:
+        samples, platforms, depths = (np.concatenate(column) for column in zip(*events))
+    else:
+        samples, platforms, depths = np.array([], np.int64), np.array([], np.int64), np.array([])
+    report = {
+        'platforms': len(level['platforms']),
+        'samples': len(points),
+        'radius': radius,
+        'broadphase': 'bvh' if index.tree is not None else 'aabb',
+        'penetrations': penetration_intervals(samples, platforms, depths, frames, fps,
+                                              contact_frames(level), tolerance),
+        'missed_contacts': missed_contacts(level, trajectory, boxes, radius),
+    }
+    report['seconds'] = round(time.perf_counter() - began, 3)
+    return report
+
+
+def format_report(report):
+    lines = [f"Collisions: {report['samples']} samples x {report['platforms']} platforms "
+             f"({report['broadphase']}) in {report['seconds']:.2f}s"]
+    for item in report['penetrations']:
+        lines.append(f"  PENETRATION platform {item['platform']}: {item['start']:.3f}s-{item['end']:.3f}s "
+                     f"(max depth {item['max_depth']:.3f}m)")
+    for item in report['missed_contacts']:
+        lines.append(f"  MISSED CONTACT platform {item['platform']} at {item['t']:.3f}s "
+                     f"(gap {item['gap']:.3f}m)")
+    if not report['penetrations'] and not report['missed_contacts']:
+        lines.append("  ✓ No penetration, every contact reached")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check ball/platform collisions of a level')
+    parser.add_argument('level', help='Level JSON file')
+    parser.add_argument('--radius', type=float, default=None,
+                        help='Ball radius (default: ball.radius, as keyed by animate_ball; '
+                             f'x{BALL_SCALE} for the rendered sphere)')
+    parser.add_argument('--substeps', type=int, default=SUBSTEPS, help='Samples per frame')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    with open(args.level) as f:
+        level = json.load(f)
+    report = check_collisions(level, radius=args.radius, substeps=args.substeps)
+    print(json.dumps(report) if args.json else format_report(report))
+    sys.exit(1 if report['penetrations'] or report['missed_contacts'] else 0)
+
+
+if __name__ == '__main__':
+    main()
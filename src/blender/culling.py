@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Culling de visibilité: cache au rendu les objets hors du champ de la caméra
+Usage: from culling import cull_offscreen
+
+    stats = cull_offscreen(platforms, camera, frame_start=1, frame_end=900)
+
+Pour chaque frame, la caméra (fixe ou animée, lue via ses F-curves) est testée
+contre la sphère englobante de chaque objet (NumPy, tous les objets d'un coup).
+Les intervalles visibles sont élargis de `padding` frames, fusionnés, puis
+hide_render est keyframé aux seules transitions: EEVEE ne synchronise pas les
+objets cachés.
+"""
+
+import bpy
+import numpy as np
+from mathutils import Euler, Matrix, Vector
+
+from camera_solver import sample_track
+from keyframes import insert_keys
+
+CULL_PADDING = 2    # frames de marge avant/après chaque intervalle visible
+CULL_MARGIN = 0.5   # marge monde ajoutée aux rayons (ombres, reflets, glow)
+
+
+def camera_matrices(camera, frame_start, frame_end):
+    """Matrices world->caméra (F, 4, 4) pour chaque frame, sans frame_set"""
+    locations = sample_track(camera, frame_start, frame_end, 'location')
+    rotations = sample_track(camera, frame_start, frame_end, 'rotation_euler')
+    # Quaternion / axis-angle non keyframés par nos scripts: euler XYZ par défaut
+    mode = camera.rotation_mode if len(camera.rotation_mode) == 3 else 'XYZ'
+    matrices = np.empty((len(locations), 4, 4))
+    for i, (loc, rot) in enumerate(zip(locations, rotations)):
+        world = Matrix.Translation(Vector(loc)) @ Euler(rot, mode).to_matrix().to_4x4()
+        matrices[i] = np.array(world.inverted())
+    return matrices
+
+
+def frustum_planes(camera, scene):
+    """Normales intérieures (4, 3) des plans latéraux du frustum, en espace caméra"""
+    corners = [Vector(c) for c in camera.data.view_frame(scene=scene)]
+    if camera.data.type == 'ORTHO':
+        # Plans parallèles à l'axe de visée: normale + offset
+        xs = [c.x for c in corners]
+        ys = [c.y for c in corners]
+        normals = np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0]], dtype=float)
+        offsets = np.array([-min(xs), max(xs), -min(ys), max(ys)])
+        return normals, offsets
+
+    normals = []
+    for a, b in zip(corners, corners[1:] + corners[:1]):
+        n = a.cross(b).normalized()
+        # Orienté vers l'intérieur: l'axe de visée (0, 0, -1) doit être du bon côté
+        if n.dot(Vector((0, 0, -1))) < 0:
+            n = -n
+        normals.append(tuple(n))
+    return np.array(normals), np.zeros(4)
+
+
+def bounding_spheres(objects, margin=CULL_MARGIN):
+    """Centres (N, 3) et rayons (N,) en espace monde"""
+    bpy.context.view_layer.update()
+    centers = np.empty((len(objects), 3))
+    radii = np.empty(len(objects))
+    for i, obj in enumerate(objects):
+        corners = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
+        center = sum(corners, Vector()) / 8
+        centers[i] = center
+        radii[i] = max((c - center).length for c in corners) + margin
+    return centers, radii
+
+
+def visibility(objects, camera, frame_start, frame_end, scene=None, margin=CULL_MARGIN):
+    """Matrice booléenne (F, N): objet n visible à la frame frame_start + f"""
+    scene = scene or bpy.context.scene
+    centers, radii = bounding_spheres(objects, margin)
+    normals, offsets = frustum_planes(camera, scene)
+    matrices = camera_matrices(camera, frame_start, frame_end)
+
+    # (F, N, 3): centres en espace caméra pour toutes les frames
+    local = np.einsum('fij,nj->fni', matrices[:, :3, :3], centers) + matrices[:, None, :3, 3]
+    depth = -local[..., 2]
+    in_depth = (depth + radii >= camera.data.clip_start) & (depth - radii <= camera.data.clip_end)
+    distances = local @ normals.T + offsets  # (F, N, 4)
+    return in_depth & np.all(distances >= -radii[None, :, None], axis=2)
+
+
+def visible_intervals(visible, padding=CULL_PADDING):
+    """Intervalles [(début, fin)] (indices inclusifs) élargis de padding et fusionnés"""
+    if not visible.any():
+        return []
+    padded = visible.copy()
+    for shift in range(1, padding + 1):
+        padded[shift:] |= visible[:-shift]
+        padded[:-shift] |= visible[shift:]
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], padded.astype(np.int8), [0]))))
+    return [(int(a), int(b) - 1) for a, b in zip(edges[0::2], edges[1::2])]
+
+
+def cull_offscreen(objects, camera, frame_start, frame_end, scene=None,
+                   padding=CULL_PADDING, margin=CULL_MARGIN):
+    """Keyframe hide_render des objets hors champ; retourne des stats"""
+    if not objects or frame_end < frame_start:
+        return {'objects': len(objects), 'frames': 0}
+
+    visible = visibility(objects, camera, frame_start, frame_end, scene, margin)
+    frames = visible.shape[0]
+    stats = {'objects': len(objects), 'frames': frames, 'never_visible': 0,
+             'always_visible': 0, 'keys': 0}
+
+    for n, obj in enumerate(objects):
+        intervals = visible_intervals(visible[:, n], padding)
+        if not intervals:
+            obj.hide_render = True
+            stats['never_visible'] += 1
+            continue
+        if intervals == [(0, frames - 1)]:
+            stats['always_visible'] += 1
+            continue
+
+        # Clés aux transitions seulement (les booléens sont en interpolation constante)
+        keys = [] if intervals[0][0] == 0 else [(frame_start, True)]
+        for start, end in intervals:
+            keys.append((frame_start + start, False))
+            if end < frames - 1:
+                keys.append((frame_start + end + 1, True))
+        stats['keys'] += insert_keys(obj, 'hide_render', keys)
+
+    stats['avg_visible'] = round(float(visible.sum(axis=1).mean()), 1)
+    stats['max_visible'] = int(visible.sum(axis=1).max())
+    print(f"Culling: {stats['avg_visible']} / {len(objects)} objects visible per frame on average "
+          f"(max {stats['max_visible']}, {stats['never_visible']} never visible)")
+    return stats
+
+
+def reset_culling(objects):
+    """Retire les clés hide_render posées par cull_offscreen (nouvelle caméra)"""
+    for obj in objects:
+        if obj.animation_data:
+            obj.animation_data_clear()
+        obj.hide_render = False
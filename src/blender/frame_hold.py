@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Frames tenues: une seule image rendue par suite de frames identiques
+Usage: from frame_hold import render_with_holds
+
+    stats = render_with_holds(scene, 1, 900)
+
+L'état animé de la scène (toutes les F-curves: balle, caméra, hide_render du
+culling, matériaux, world) est échantillonné via FCurve.evaluate() pour chaque
+frame. Les suites d'états identiques (balle au repos, fin du level après la
+dernière plateforme avec caméra fixe) ne sont rendues qu'une fois; les autres
+frames de la suite sont des liens physiques (ou copies) du fichier rendu.
+"""
+
+import os
+import shutil
+
+import bpy
+import numpy as np
+
+from keyframes import action_fcurves
+
+HOLD_TOLERANCE = 1e-5  # écart max entre deux états considérés identiques
+
+
+def animated_ids(scene):
+    """IDs dont l'animation peut changer l'image: objets, leurs données, matériaux, world"""
+    ids = [scene, scene.world]
+    for obj in scene.objects:
+        ids.extend([obj, obj.data])
+        ids.extend(slot.material for slot in obj.material_slots)
+    seen, result = set(), []
+    for id_data in ids:
+        if id_data is None or id_data.as_pointer() in seen:
+            continue
+        seen.add(id_data.as_pointer())
+        result.append(id_data)
+        node_tree = getattr(id_data, 'node_tree', None)
+        if node_tree is not None:
+            result.append(node_tree)
+    return result
+
+
+def scene_states(scene, frame_start, frame_end):
+    """Matrice (F, C): valeur de chaque F-curve de la scène à chaque frame"""
+    frames = range(frame_start, frame_end + 1)
+    fcurves = [fc for id_data in animated_ids(scene) for fc in action_fcurves(id_data)
+               if not fc.mute]
+    states = np.zeros((len(frames), len(fcurves)))
+    for c, fcurve in enumerate(fcurves):
+        states[:, c] = [fcurve.evaluate(f) for f in frames]
+    return states
+
+
+def hold_runs(states, motion_blur=False, tolerance=HOLD_TOLERANCE):
+    """Suites [(début, fin)] (indices inclusifs) d'états identiques"""
+    count = len(states)
+    if count == 0:
+        return []
+    same = np.all(np.abs(np.diff(states, axis=0)) <= tolerance, axis=1)
+    if motion_blur:
+        # Le flou dépend des frames voisines: la suivante doit aussi être identique
+        same = same & np.concatenate([same[1:], [True]])
+    breaks = np.flatnonzero(~same) + 1
+    starts = np.concatenate([[0], breaks])
+    ends = np.concatenate([breaks - 1, [count - 1]])
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def link_frame(source, target):
+    """Lien physique du rendu (copie si le système de fichiers refuse)"""
+    if os.path.lexists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def render_frames(scene, frames):
+    """Rend une liste triée de frames; retourne les blocs contigus rendus"""
+    # Blocs contigus rendus d'un seul appel (moteur et shaders gardés entre frames)
+    blocks, block_start = [], frames[0] if frames else None
+    for previous, frame in zip(frames, frames[1:] + [None]):
+        if frame != previous + 1:
+            blocks.append((block_start, previous))
+            block_start = frame
+
+    original = (scene.frame_start, scene.frame_end)
+    try:
+        for start, end in blocks:
+            scene.frame_start, scene.frame_end = start, end
+            bpy.ops.render.render(animation=True)
+    finally:
+        scene.frame_start, scene.frame_end = original
+    return blocks
+
+
+def render_with_holds(scene, frame_start, frame_end):
+    """Rend les premières frames de chaque suite puis lie les frames tenues"""
+    states = scene_states(scene, frame_start, frame_end)
+    runs = hold_runs(states, scene.render.use_motion_blur)
+    to_render = [frame_start + start for start, _ in runs]
+    blocks = render_frames(scene, to_render)
+
+    held = 0
+    for start, end in runs:
+        source = scene.render.frame_path(frame=frame_start + start)
+        for offset in range(start + 1, end + 1):
+            link_frame(source, scene.render.frame_path(frame=frame_start + offset))
+            held += 1
+
+    total = frame_end - frame_start + 1
+    stats = {'frames': total, 'rendered': len(to_render), 'held': held,
+             'runs': sum(1 for start, end in runs if end > start), 'render_calls': len(blocks)}
+    print(f"Frame hold: {len(to_render)}/{total} frames rendered, {held} held "
+          f"({held / max(total, 1) * 100:.0f}% renders saved)")
+    return stats
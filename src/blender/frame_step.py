@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Rendu à pas de N frames + frames de contact, interpolation au moment de l'encodage
+Usage: from frame_step import render_stepped
+
+    stats = render_stepped(scene, 1, 1800, step=2, keep=contact_frames)
+
+Seules les frames de la grille (1 sur `step`), les frames de contact (rebonds,
+onsets: gardées exactes pour la synchro) et la dernière sont rendues. Parmi
+elles, une frame à l'intérieur d'un plateau (état animé identique à la
+précédente gardée et à la suivante) est sautée.
+
+Un manifeste frames_manifest_<début>-<fin>.json par plage (un par shard) liste
+les fichiers rendus; encodeVideo.js les fusionne en une entrée ffmpeg à durées
+variables et synthétise les frames manquantes (minterpolate, compensation de
+mouvement).
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+
+from frame_hold import HOLD_TOLERANCE, render_frames, scene_states
+
+MANIFEST_RE = re.compile(r'^frames_manifest_(\d+)-(\d+)\.json$')
+
+
+def step_frames(frame_start, frame_end, step, keep=()):
+    """Grille 1 sur step + frames imposées + dernière frame, triées"""
+    frames = set(range(frame_start, frame_end + 1, max(1, step)))
+    frames.update(f for f in keep if frame_start <= f <= frame_end)
+    frames.add(frame_end)
+    return sorted(frames)
+
+
+def drop_held(frames, states, frame_start, tolerance=HOLD_TOLERANCE):
+    """Retire l'intérieur des plateaux (état identique avant et après): l'encodeur prolonge"""
+    def same(a, b):
+        return not np.any(np.abs(states[a - frame_start] - states[b - frame_start]) > tolerance)
+
+    kept = [frames[0]]
+    for frame, following in zip(frames[1:], frames[2:] + [None]):
+        # La dernière frame d'un plateau reste: l'interpolation vers la suivante part d'elle
+        if following is None or not same(frame, kept[-1]) or not same(frame, following):
+            kept.append(frame)
+    return kept
+
+
+def manifest_name(frame_start, frame_end):
+    return f"frames_manifest_{frame_start:05d}-{frame_end:05d}.json"
+
+
+def clear_manifests(output_dir, frame_start, frame_end):
+    """Supprime les manifestes d'anciens rendus qui recouvrent la plage (rendu complet)"""
+    if not os.path.isdir(output_dir):
+        return
+    for name in os.listdir(output_dir):
+        match = MANIFEST_RE.match(name)
+        if match and int(match.group(1)) <= frame_end and int(match.group(2)) >= frame_start:
+            os.remove(os.path.join(output_dir, name))
+
+
+def write_manifest(output_dir, scene, frames, frame_start, frame_end, step):
+    clear_manifests(output_dir, frame_start, frame_end)
+    manifest = {
+        'fps': scene.render.fps / scene.render.fps_base,
+        'frame_start': frame_start,
+        'frame_end': frame_end,
+        'step': step,
+        'frames': frames,
+        'files': [os.path.basename(scene.render.frame_path(frame=f)) for f in frames],
+    }
+    with open(os.path.join(output_dir, manifest_name(frame_start, frame_end)), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def render_stepped(scene, frame_start, frame_end, step, keep=(), output_dir=None, hold=True):
+    """Rend la sélection de frames et écrit le manifeste; retourne des stats"""
+    candidates = step_frames(frame_start, frame_end, step, keep)
+    frames = candidates
+    if hold:
+        frames = drop_held(candidates, scene_states(scene, frame_start, frame_end), frame_start)
+    blocks = render_frames(scene, frames)
+
+    output_dir = output_dir or os.path.dirname(scene.render.frame_path(frame=frame_start))
+    write_manifest(output_dir, scene, frames, frame_start, frame_end, step)
+
+    total = frame_end - frame_start + 1
+    contacts = sum(1 for f in set(keep) if frame_start <= f <= frame_end)
+    stats = {'frames': total, 'rendered': len(frames), 'step': step, 'contacts': contacts,
+             'held': len(candidates) - len(frames), 'render_calls': len(blocks)}
+    print(f"Render step {step}: {len(frames)}/{total} frames rendered "
+          f"({contacts} contact frames kept exact), in-betweens synthesized at encode")
+    return stats
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Instrumentation des scripts Blender: étapes, frames, mémoire, stats de scène
+Usage: from instrumentation import RenderProfiler
+
+    profiler = RenderProfiler('frames/render_timing.jsonl', script='render_blender')
+    with profiler.stage('create_platforms'):
+        create_platforms(level)
+    profiler.scene_stats()
+    profiler.attach(scene)  # handlers render_pre / render_post / render_complete
+    bpy.ops.render.render(animation=True)
+    profiler.finish()
+
+Chaque ligne du log JSONL est un événement:
+  run_start | stage | scene_stats | frame | render_complete | summary
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import bpy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du process Blender (Mo)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: Ko, macOS: octets
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+class RenderProfiler:
+    """Collecte les timings d'un run et les écrit en JSONL"""
+
+    def __init__(self, log_path=None, script='blender', **meta):
+        self.log_path = log_path
+        self.script = script
+        self.t0 = time.perf_counter()
+        self.stages = {}
+        self.frame_times = []
+        self._frame_start = None
+        self._handlers = []
+
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            open(log_path, 'w').close()
+
+        self.emit('run_start', blender=bpy.app.version_string, pid=os.getpid(), **meta)
+
+    def emit(self, event, **fields):
+        """Écrit un événement dans le log (no-op sans log_path)"""
+        record = {
+            'event': event,
+            'script': self.script,
+            't': round(time.perf_counter() - self.t0, 4),
+            **fields,
+        }
+        if self.log_path:
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return record
+
+    @contextmanager
+    def stage(self, name):
+        """Chronomètre une étape de construction de scène"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+            self.emit('stage', name=name, seconds=round(seconds, 4), peak_rss_mb=peak_rss_mb())
+            print(f"⏱  {name}: {seconds:.2f}s")
+
+    def scene_stats(self, scene=None):
+        """Compte objets, lumières, sommets et triangles (après modifiers)"""
+        import numpy as np
+
+        scene = scene or bpy.context.scene
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        stats = {'objects': 0, 'meshes': 0, 'lights': 0, 'vertices': 0, 'triangles': 0}
+
+        for obj in scene.objects:
+            stats['objects'] += 1
+            if obj.type == 'LIGHT':
+                stats['lights'] += 1
+            if obj.type != 'MESH':
+                continue
+            mesh = obj.evaluated_get(depsgraph).data
+            loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get('loop_total', loop_totals)
+            stats['meshes'] += 1
+            stats['vertices'] += len(mesh.vertices)
+            stats['triangles'] += int((loop_totals - 2).sum())
+
+        self.emit('scene_stats', **stats)
+        print(f"Scene: {stats['objects']} objects, {stats['lights']} lights, "
+              f"{stats['triangles']} triangles")
+        return stats
+
+    # ------------------------------------------------------------------
+    # Handlers de rendu
+    # ------------------------------------------------------------------
+
+    def _on_render_pre(self, scene, *args):
+        self._frame_start = time.perf_counter()
+
+    def _on_render_post(self, scene, *args):
+        if self._frame_start is None:
+            return
+        seconds = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        self.frame_times.append(seconds)
+        self.emit('frame', frame=scene.frame_current, seconds=round(seconds, 4),
+                  peak_rss_mb=peak_rss_mb())
+        print(f"Frame {scene.frame_current} rendered in {seconds:.2f}s ({scene.render.engine})")
+
+    def _on_render_complete(self, scene, *args):
+        self.emit('render_complete', frames=len(self.frame_times))
+
+    def attach(self, scene=None):
+        """Enregistre les handlers render_pre / render_post / render_complete"""
+        handlers = bpy.app.handlers
+        self._handlers = [
+            (handlers.render_pre, self._on_render_pre),
+            (handlers.render_post, self._on_render_post),
+            (handlers.render_complete, self._on_render_complete),
+        ]
+        for handler_list, func in self._handlers:
+            handler_list.append(func)
+
+    def detach(self):
+        """Retire les handlers"""
+        for handler_list, func in self._handlers:
+            if func in handler_list:
+                handler_list.remove(func)
+        self._handlers = []
+
+    def summary(self, scene=None):
+        """Résumé: stats des frames + surcoût de la 1re frame (compilation shaders)"""
+        scene = scene or bpy.context.scene
+        times = self.frame_times
+        fields = {
+            'engine': scene.render.engine,
+            'frames': len(times),
+            'stages': {name: round(s, 4) for name, s in self.stages.items()},
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if times:
+            ordered = sorted(times)
+            steady = sorted(times[1:]) or ordered
+            fields.update({
+                'render_seconds': round(sum(times), 4),
+                'frame_avg': round(sum(times) / len(times), 4),
+                'frame_p50': round(ordered[len(ordered) // 2], 4),
+                'frame_p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                'frame_max': round(ordered[-1], 4),
+                # EEVEE compile les shaders pendant la première frame
+                'first_frame_overhead': round(max(0.0, times[0] - steady[len(steady) // 2]), 4),
+            })
+            print(f"Frame time ({fields['engine']}): avg {fields['frame_avg']:.2f}s, "
+                  f"p95 {fields['frame_p95']:.2f}s, max {fields['frame_max']:.2f}s "
+                  f"over {len(times)} frames")
+        return self.emit('summary', **fields)
+
+    def finish(self, scene=None):
+        """Fin du run: résumé + retrait des handlers"""
+        self.detach()
+        return self.summary(scene)
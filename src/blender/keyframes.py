@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Insertion de keyframes en masse (keyframe_points.add + foreach_set)
+Usage: from keyframes import insert_keys
+
+    insert_keys(ball, 'location', [(1, (0, 0, 5)), (12, (1, 0, 4))])
+
+Un seul keyframe_insert par canal (crée action / slot / F-curves), le reste
+est écrit directement dans les F-curves: pas de mise à jour RNA par clé.
+"""
+
+
+def action_fcurves(id_data):
+    """Toutes les F-curves de l'action d'un ID (objet, matériau, world...)"""
+    anim = getattr(id_data, 'animation_data', None)
+    if not anim or not anim.action:
+        return []
+    action = anim.action
+    try:
+        return list(action.fcurves)
+    except AttributeError:  # Blender 5.x: F-curves dans le channelbag du slot
+        from bpy_extras import anim_utils
+        channelbag = anim_utils.action_get_channelbag_for_slot(action, anim.action_slot)
+        return list(channelbag.fcurves) if channelbag else []
+
+
+def find_fcurves(obj, data_path):
+    """F-curves d'un data_path triées par index (actions legacy et en couches)"""
+    return sorted((fc for fc in action_fcurves(obj) if fc.data_path == data_path),
+                  key=lambda fc: fc.array_index)
+
+
+def insert_keys(obj, data_path, keys, interpolation=None):
+    """
+    Insère des clés [(frame, valeur)] sur obj.<data_path>
+    (valeur: tuple par index, ou scalaire pour une propriété simple comme hide_render)
+    Les clés existantes aux autres frames sont conservées. Retourne le nombre de clés.
+    """
+    if not keys:
+        return 0
+
+    first_frame, first_value = keys[0]
+    setattr(obj, data_path, first_value)
+    obj.keyframe_insert(data_path=data_path, frame=first_frame)
+    scalar = not isinstance(first_value, (tuple, list))
+
+    for fcurve in find_fcurves(obj, data_path):
+        points = fcurve.keyframe_points
+        existing = [0.0] * (2 * len(points))
+        points.foreach_get('co', existing)
+
+        merged = dict(zip(existing[0::2], existing[1::2]))
+        merged.update((float(frame), float(value if scalar else value[fcurve.array_index]))
+                      for frame, value in keys)
+
+        points.add(len(merged) - len(points))
+        points.foreach_set('co', [c for item in sorted(merged.items()) for c in item])
+        if interpolation:
+            for point in points:
+                point.interpolation = interpolation
+        fcurve.update()  # tri + recalcul des poignées auto-clamped
+
+    return len(keys)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compilation onsets -> keyframes minimales (location + scale de la balle)
+Usage: from onset_animation import compile_onset_animation
+
+    anim = compile_onset_animation(onsets, duration, path_points, fps=30)
+    insert_keys(ball, 'location', anim['location'])
+    insert_keys(ball, 'scale', anim['scale'])
+
+Même rendu que la boucle naïve (squash à l'onset, retour au repos à +3 frames),
+mais calculé hors Blender:
+- onsets tombant sur la même frame fusionnés (le dernier donne la position)
+- enveloppes squash/recover qui se chevauchent résolues: le recover est omis
+  quand l'onset suivant arrive avant, au lieu de créer un creux parasite
+- clés intermédiaires d'un plateau (valeur identique aux voisines) supprimées,
+  sans effet sur des courbes Bézier auto-clamped
+"""
+
+SQUASH_SCALE = 1.2
+REST_SCALE = 1.0
+RECOVER_FRAMES = 3
+
+
+def onset_frame(t, fps):
+    """Frame (1-based) d'un onset en secondes"""
+    return int(t * fps) + 1
+
+
+def _drop_plateaus(keys):
+    """Supprime les clés dont la valeur est identique à la précédente et à la suivante"""
+    kept = keys[:1]
+    for i in range(1, len(keys) - 1):
+        value = keys[i][1]
+        if value == kept[-1][1] and value == keys[i + 1][1]:
+            continue
+        kept.append(keys[i])
+    if len(keys) > 1:
+        kept.append(keys[-1])
+    return kept
+
+
+def compile_onset_animation(onsets, duration, path_points, fps=30,
+                            squash=SQUASH_SCALE, recover=RECOVER_FRAMES):
+    """
+    Compile les onsets en clés {'location': [(frame, xyz)], 'scale': [(frame, xyz)]}
+    triées par frame, plus 'stats' (clés naïves vs émises)
+    """
+    times = sorted(o['t'] if isinstance(o, dict) else o for o in onsets)
+    final_frame = int(duration * fps)
+    rest = (REST_SCALE,) * 3
+    peak = (squash,) * 3
+    last_idx = len(path_points) - 1
+
+    # Fusion par frame: le dernier onset de la frame gagne (comme l'écrasement de keyframe_insert)
+    onset_frames = {}
+    for t in times:
+        onset_frames[onset_frame(t, fps)] = min(int((t / duration) * len(path_points)), last_idx)
+    frames = sorted(onset_frames)
+
+    location = {1: tuple(path_points[0])}
+    scale = {1: rest}
+    recovers = dropped_recovers = 0
+    for i, frame in enumerate(frames):
+        location[frame] = tuple(path_points[onset_frames[frame]])
+        scale[frame] = peak
+
+        recover_frame = frame + recover
+        if recover_frame > duration * fps:
+            continue
+        # L'onset suivant relance le squash avant la fin du recover
+        if i + 1 < len(frames) and frames[i + 1] <= recover_frame:
+            dropped_recovers += 1
+            continue
+        scale[recover_frame] = rest
+        recovers += 1
+
+    location[final_frame] = tuple(path_points[-1])
+    scale[final_frame] = rest
+
+    location_keys = _drop_plateaus(sorted(location.items()))
+    scale_keys = _drop_plateaus(sorted(scale.items()))
+
+    # Boucle naïve: départ + (location, scale) par onset + recover + fin
+    naive = 2 + 2 * len(times) + sum(
+        1 for t in times if onset_frame(t, fps) + recover <= duration * fps) + 2
+    emitted = len(location_keys) + len(scale_keys)
+
+    return {
+        'location': location_keys,
+        'scale': scale_keys,
+        'stats': {
+            'onsets': len(times),
+            'onset_frames': len(frames),
+            'merged_onsets': len(times) - len(frames),
+            'recovers': recovers,
+            'dropped_recovers': dropped_recovers,
+            'naive_keys': naive,
+            'keys': emitted,
+            'eliminated_keys': naive - emitted,
+        },
+    }
+
+
+def format_stats(stats):
+    """Résumé une ligne pour les logs"""
+    return (f"{stats['keys']} keys for {stats['onsets']} onsets "
+            f"({stats['eliminated_keys']} of {stats['naive_keys']} eliminated: "
+            f"{stats['merged_onsets']} merged onsets, {stats['dropped_recovers']} overlapping recovers)")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Rendu plaque + région: fond statique rendu une fois, seule la zone de la balle par frame
+Usage: from plate_render import render_with_plate
+
+    stats = render_with_plate(scene, ball, 1, 900)   # None si la scène ne s'y prête pas
+
+Caméra fixe et plateformes statiques: seule la balle change l'image. La plaque
+(scène sans balle) est rendue une fois; pour chaque frame, seule la région
+écran de la balle (sphère englobante projetée + marge pour glow et reflets) est
+rendue (border + crop, scène complète: occlusions et ombres exactes dans la
+région) puis collée dans une copie de la plaque avec NumPy. Le coût par frame
+suit la surface de la balle à l'écran au lieu de la frame entière.
+
+Les suites de frames identiques sont liées comme dans frame_hold.py. Si un
+autre ID que la balle est animé (caméra, world, culling...), render_with_plate
+retourne None et l'appelant rend normalement.
+
+Limite: tout ce que la balle produit hors de sa région est absent (plaque
+rendue sans balle) ou coupé au bord du rectangle. render_with_plate retourne
+donc aussi None quand la balle éclaire ou se reflète au loin: Cycles
+(illumination globale: émission, reflets sur les plateformes glossy), EEVEE
+Next avec raytracing ou balle émissive, EEVEE legacy avec bloom ou SSR. Les
+ombres portées de la balle au-delà de REGION_MARGIN restent coupées: lumières
+proches de la verticale seulement.
+
+La balle émissive de render_blender.py tombe toujours dans ces cas: aucun
+script ne branche ce module (pas d'option --plate). Il reste utilisable pour
+une scène à balle non émissive sous EEVEE legacy.
+"""
+
+import math
+import os
+
+import bpy
+import numpy as np
+
+from camera_solver import sample_track
+from culling import camera_matrices, frustum_planes
+from frame_hold import HOLD_TOLERANCE, animated_ids, hold_runs, link_frame
+from keyframes import action_fcurves
+
+REGION_MARGIN = 1.0   # marge monde autour de la balle (reflets proches, ombre au contact)
+PLATE_NAME = 'plate.png'
+
+
+def static_background(scene, ball, frame_start, frame_end, tolerance=HOLD_TOLERANCE):
+    """Vrai si aucune F-curve hors balle (objet, mesh, matériaux) ne varie sur la plage"""
+    ball_ids = {ball.as_pointer(), ball.data.as_pointer()}
+    for slot in ball.material_slots:
+        if slot.material is not None:
+            ball_ids.add(slot.material.as_pointer())
+            if slot.material.node_tree is not None:
+                ball_ids.add(slot.material.node_tree.as_pointer())
+
+    frames = range(frame_start, frame_end + 1)
+    for id_data in animated_ids(scene):
+        if id_data.as_pointer() in ball_ids:
+            continue
+        for fcurve in action_fcurves(id_data):
+            values = np.array([fcurve.evaluate(f) for f in frames])
+            if not fcurve.mute and np.ptp(values) > tolerance:
+                return False
+    return True
+
+
+def emission_strength(material):
+    """Émission maximale d'un node tree (nœuds Emission et Principled)"""
+    if material is None or material.node_tree is None:
+        return 0.0
+    strength = 0.0
+    for node in material.node_tree.nodes:
+        if node.type == 'EMISSION':
+            strength = max(strength, node.inputs['Strength'].default_value)
+        elif node.type == 'BSDF_PRINCIPLED' and 'Emission Strength' in node.inputs:
+            strength = max(strength, node.inputs['Emission Strength'].default_value)
+    return strength
+
+
+def ball_lights_scene(scene, ball):
+    """Raison pour laquelle la balle affecte l'image hors de sa région (None: plaque exacte)"""
+    engine = scene.render.engine
+    emissive = any(emission_strength(slot.material) > 0 for slot in ball.material_slots)
+    if engine == 'CYCLES':
+        return 'Cycles global illumination (ball emission and reflections)'
+    eevee = scene.eevee
+    if hasattr(eevee, 'use_raytracing'):
+        # EEVEE Next (4.2+): émission captée par le raytracing / horizon scan
+        if eevee.use_raytracing:
+            return 'EEVEE raytracing'
+        if emissive:
+            return 'emissive ball under EEVEE Next'
+        return None
+    if getattr(eevee, 'use_bloom', False):
+        return 'bloom'
+    if getattr(eevee, 'use_ssr', False):
+        return 'screen-space reflections'
+    return None
+
+
+def render_size(scene):
+    scale = scene.render.resolution_percentage / 100
+    return int(scene.render.resolution_x * scale), int(scene.render.resolution_y * scale)
+
+
+def ball_regions(scene, ball, camera, frame_start, frame_end, margin=REGION_MARGIN):
+    """Rectangles écran (F, 4) [x0, y0, x1, y1] normalisés (origine en bas à gauche)"""
+    # Rayon local (bound_box sans échelle) x échelle animée
+    box = np.array([tuple(c) for c in ball.bound_box])
+    local_radius = np.linalg.norm(box - box.mean(axis=0), axis=1).max()
+    scales = np.abs(np.array(sample_track(ball, frame_start, frame_end, 'scale'))).max(axis=1)
+    centers = np.array(sample_track(ball, frame_start, frame_end, 'location'))
+    radius = local_radius * scales + margin
+
+    # Caméra fixe: une seule matrice
+    matrix = camera_matrices(camera, frame_start, frame_start)[0]
+    local = centers @ matrix[:3, :3].T + matrix[:3, 3]
+    corners = np.array([tuple(c) for c in camera.data.view_frame(scene=scene)])
+    (xmin, ymin), (xmax, ymax) = corners[:, :2].min(axis=0), corners[:, :2].max(axis=0)
+
+    if camera.data.type == 'ORTHO':
+        center_xy, extent = local[:, :2], radius
+    else:
+        # Projection sur le plan du view_frame; profondeur la plus proche (borne conservative)
+        plane = -corners[0, 2]
+        depth = np.maximum(-local[:, 2], 1e-6)
+        near = np.maximum(depth - radius, 1e-6)
+        center_xy = local[:, :2] * (plane / depth)[:, None]
+        extent = radius * plane / near
+    size = np.array([xmax - xmin, ymax - ymin])
+    low = (center_xy - extent[:, None] - [xmin, ymin]) / size
+    high = (center_xy + extent[:, None] - [xmin, ymin]) / size
+    regions = np.clip(np.concatenate([low, high], axis=1), 0.0, 1.0)
+
+    # Balle derrière la caméra ou hors champ: région vide (NaN, la plaque seule)
+    normals, offsets = frustum_planes(camera, scene)
+    outside = np.any(local @ normals.T + offsets < -radius[:, None], axis=1)
+    if camera.data.type != 'ORTHO':
+        outside |= -local[:, 2] + radius < camera.data.clip_start
+    regions[outside] = np.nan
+    return regions
+
+
+def blur_regions(regions):
+    """Union avec les régions des frames voisines (le flou de mouvement étale la balle)"""
+    low, high = regions[:, :2].copy(), regions[:, 2:].copy()
+    for a, b in ((slice(1, None), slice(None, -1)), (slice(None, -1), slice(1, None))):
+        low[a] = np.fmin(low[a], regions[b, :2])
+        high[a] = np.fmax(high[a], regions[b, 2:])
+    return np.concatenate([low, high], axis=1)
+
+
+def pixel_rect(region, width, height):
+    """Région normalisée -> pixels (x0, y0, x1, y1), bornes extérieures"""
+    if np.isnan(region).any():
+        return 0, 0, 0, 0
+    x0, y0 = math.floor(region[0] * width), math.floor(region[1] * height)
+    x1, y1 = math.ceil(region[2] * width), math.ceil(region[3] * height)
+    return x0, y0, min(x1, width), min(y1, height)
+
+
+def load_pixels(path):
+    """PNG -> tableau (H, W, 4) float32 (lignes de bas en haut, comme Blender)"""
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        return pixels.reshape(height, width, 4)
+    finally:
+        bpy.data.images.remove(image)
+
+
+def save_pixels(pixels, path):
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new('plate_composite', width, height, alpha=True)
+    try:
+        image.pixels.foreach_set(pixels.ravel())
+        image.filepath_raw = path
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+def render_still(scene, path):
+    previous = scene.render.filepath
+    scene.render.filepath = path
+    try:
+        bpy.ops.render.render(write_still=True)
+    finally:
+        scene.render.filepath = previous
+
+
+def render_plate(scene, ball, path):
+    """Rend la scène sans la balle (une fois)"""
+    hidden = ball.hide_render
+    ball.hide_render = True
+    try:
+        render_still(scene, path)
+    finally:
+        ball.hide_render = hidden
+    return load_pixels(path)
+
+
+def render_with_plate(scene, ball, frame_start, frame_end, output_dir=None,
+                      margin=REGION_MARGIN):
+    """Plaque + régions de balle composées; retourne des stats (None si non applicable)"""
+    camera = scene.camera
+    reason = ball_lights_scene(scene, ball)
+    if reason is not None:
+        print(f"Plate render: ball lights the scene ({reason}), falling back to full frames")
+        return None
+    if camera is None or not static_background(scene, ball, frame_start, frame_end):
+        print("Plate render: background is animated, falling back to full frames")
+        return None
+
+    output_dir = output_dir or os.path.dirname(scene.render.frame_path(frame=frame_start))
+    width, height = render_size(scene)
+    plate = render_plate(scene, ball, os.path.join(output_dir, PLATE_NAME))
+
+    regions = ball_regions(scene, ball, camera, frame_start, frame_end, margin)
+    if scene.render.use_motion_blur:
+        regions = blur_regions(regions)
+
+    # Suites de frames identiques (balle immobile): une seule composition
+    states = np.hstack([np.array(sample_track(ball, frame_start, frame_end, path))
+                        for path in ('location', 'scale')])
+    runs = hold_runs(states, scene.render.use_motion_blur)
+
+    crop_path = os.path.join(output_dir, 'plate_region.png')
+    settings = scene.render
+    original = (settings.use_border, settings.use_crop_to_border, settings.border_min_x,
+                settings.border_min_y, settings.border_max_x, settings.border_max_y)
+    area, rendered, held = 0, 0, 0
+    try:
+        settings.use_border = True
+        settings.use_crop_to_border = True
+        for start, end in runs:
+            frame = frame_start + start
+            target = scene.render.frame_path(frame=frame)
+            x0, y0, x1, y1 = pixel_rect(regions[start], width, height)
+            if x1 <= x0 or y1 <= y0:
+                link_frame(os.path.join(output_dir, PLATE_NAME), target)
+            else:
+                # +0.5 px: Blender tronque border * résolution
+                settings.border_min_x, settings.border_max_x = (x0 + 0.5) / width, (x1 + 0.5) / width
+                settings.border_min_y, settings.border_max_y = (y0 + 0.5) / height, (y1 + 0.5) / height
+                scene.frame_set(frame)
+                render_still(scene, crop_path)
+                crop = load_pixels(crop_path)
+                # Bord droit / haut: le crop (arrondi par Blender) peut déborder de la plaque
+                crop = crop[:height - y0, :width - x0]
+                composite = plate.copy()
+                composite[y0:y0 + crop.shape[0], x0:x0 + crop.shape[1]] = crop
+                save_pixels(composite, target)
+                area += crop.shape[0] * crop.shape[1]
+                rendered += 1
+            for offset in range(start + 1, end + 1):
+                link_frame(target, scene.render.frame_path(frame=frame_start + offset))
+                held += 1
+    finally:
+        (settings.use_border, settings.use_crop_to_border, settings.border_min_x,
+         settings.border_min_y, settings.border_max_x, settings.border_max_y) = original
+        if os.path.exists(crop_path):
+            os.remove(crop_path)
+
+    total = frame_end - frame_start + 1
+    coverage = area / max(rendered, 1) / (width * height)
+    stats = {'frames': total, 'rendered': rendered, 'held': held,
+             'region_coverage': round(coverage, 4)}
+    print(f"Plate render: {rendered}/{total} ball regions rendered, "
+          f"{coverage * 100:.1f}% of the frame on average, {held} held")
+    return stats
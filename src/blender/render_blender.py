@@ -2,6 +2,23 @@
 """
 Script Blender: Construction scène 3D, animation, rendu headless
 Usage: blender -b -P render_blender.py -- --level level.json --outFrames ./frames
+       [--preset draft|preview|final|cpu] [--engine auto|eevee|cycles]
+       [--timingLog ./frames/render_timing.jsonl] [--cull] [--variants variants.json]
+       [--style emissive|luxury|...] [--frameStart 1 --frameEnd 300] [--noHold]
+       [--renderStep 2] [--checkCollisions]
+
+--frameStart / --frameEnd: ne rend qu'une plage (shard de render_scheduler.py);
+la scène et l'animation restent construites sur toute la durée.
+--noHold: rend chaque frame (par défaut les suites de frames identiques ne sont
+rendues qu'une fois puis liées, voir frame_hold.py).
+--renderStep N: ne rend qu'une frame sur N + les frames de contact avec les
+plateformes; encodeVideo.js interpole les frames manquantes (voir frame_step.py).
+--checkCollisions: avant le rendu, vérifie que la balle ne traverse aucune
+plateforme et touche chacune à son temps (voir collision.py).
+
+--variants: liste JSON [{"name", "outFrames", "style", "camera", "ball_color"}].
+La géométrie est construite une fois; chaque variante ne change que matériaux,
+fond et caméra puis rend dans son propre dossier.
 """
 
 import bpy
@@ -12,6 +29,17 @@ import os
 from pathlib import Path
 from mathutils import Vector, Euler
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from render_engine import setup_engine
+from instrumentation import RenderProfiler
+from culling import cull_offscreen, reset_culling
+from frame_hold import render_with_holds
+from frame_step import clear_manifests, render_stepped
+from validate_level import format_issue, has_errors, validate_level
+from collision import ball_keys, check_collisions, fcurve_trajectory, format_report
+from styles import get_style
+from styles.nodes import emissive_material
+
 
 def parse_args():
     """Parse les arguments après '--'"""
@@ -37,6 +65,12 @@ def parse_args():
     return args
 
 
+# Caméra fixe par défaut: en arrière, sur le côté, en hauteur
+# Z moyen des plateformes = ~12 (début 4.7, fin 19.1)
+CAMERA_LOCATION = (8, -12, 14)
+CAMERA_TARGET = (0, 0, 12)  # Centre de la zone de jeu
+
+
 def hex_to_rgb(hex_color):
     """Convertit hex (#RRGGBB) en RGB (0-1)"""
     hex_color = hex_color.lstrip('#')
@@ -48,19 +82,16 @@ def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
     bpy.ops.object.delete()
     
-    # Nettoie les matériaux orphelins
+    # Nettoie les matériaux orphelins (ceux des styles restent en cache pour le job suivant)
     for material in bpy.data.materials:
-        bpy.data.materials.remove(material)
+        if 'style' not in material:
+            bpy.data.materials.remove(material)
 
 
-def setup_scene(level):
+def setup_scene(level, preset_name=None, engine=None, style=None):
     """Configure la scène Blender"""
     scene = bpy.context.scene
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.resolution_x = 1080
-    scene.render.resolution_y = 1920
-    scene.render.resolution_percentage = 100
-    scene.render.fps = level['fps']
+    preset = setup_engine(scene, preset_name, engine, fps=level['fps'])
     
     # EEVEE settings - Compatible Blender 5.x
     eevee = scene.eevee
@@ -83,63 +114,60 @@ def setup_scene(level):
     except AttributeError:
         pass
     
-    # Background
-    world = bpy.data.worlds.new("World")
-    scene.world = world
-    world.use_nodes = True
-    
-    nodes = world.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputWorld')
-    background = nodes.new('ShaderNodeBackground')
-    
-    bg_color = hex_to_rgb(level['style']['palette']['background'])
-    background.inputs['Color'].default_value = (*bg_color, 1.0)
-    background.inputs['Strength'].default_value = 0.3
-    
-    world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+    # Background (couleur de la palette pour les styles qui la suivent)
+    style = style or get_style('emissive')
+    if style.palette_driven:
+        world = style.setup_world(scene, preset, color=level['style']['palette']['background'])
+    else:
+        world = style.setup_world(scene, preset)
     
     # Fog DÉSACTIVÉ pour simplifier
     world.mist_settings.use_mist = False
     
     print(f"Scene configured: {scene.render.resolution_x}x{scene.render.resolution_y} @ {scene.render.fps}fps (SIMPLE MODE)")
+    return preset
 
 
 def create_emissive_material(name, color_hex, emission_strength=2.0):
-    """Crée un matériau émissif"""
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    emission = nodes.new('ShaderNodeEmission')
-    glossy = nodes.new('ShaderNodeBsdfGlossy')
-    mix = nodes.new('ShaderNodeMixShader')
-    
-    color = hex_to_rgb(color_hex)
-    emission.inputs['Color'].default_value = (*color, 1.0)
-    emission.inputs['Strength'].default_value = emission_strength * 1.5  # Boost émission
-    
-    glossy.inputs['Color'].default_value = (*color, 1.0)
-    glossy.inputs['Roughness'].default_value = 0.2
-    
-    mix.inputs['Fac'].default_value = 0.8  # Plus d'émission (était 0.7)
-    
-    links = mat.node_tree.links
-    links.new(emission.outputs['Emission'], mix.inputs[1])
-    links.new(glossy.outputs['BSDF'], mix.inputs[2])
-    links.new(mix.outputs['Shader'], output.inputs['Surface'])
-    
-    return mat
+    """Crée un matériau émissif (node tree du style 'emissive')"""
+    return emissive_material(name, color_hex, emission_strength * 1.5)  # Boost émission
+
+
+def set_material_color(mat, color_hex, emission_strength=None):
+    """Change la couleur d'un matériau émissif existant (sans recompiler la scène)"""
+    color = (*hex_to_rgb(color_hex), 1.0)
+    for node in mat.node_tree.nodes:
+        if node.type == 'EMISSION':
+            node.inputs['Color'].default_value = color
+            if emission_strength is not None:
+                node.inputs['Strength'].default_value = emission_strength * 1.5
+        elif node.type == 'BSDF_GLOSSY':
+            node.inputs['Color'].default_value = color
+
+
+def assign_platform_colors(platforms_objs, colors):
+    """Un matériau partagé par couleur de palette, réutilisé entre variantes"""
+    materials = []
+    for k, color in enumerate(colors):
+        mat = bpy.data.materials.get(f"Mat_Platform_{k}")
+        if mat is None:
+            mat = create_emissive_material(f"Mat_Platform_{k}", color, 1.5)
+        else:
+            set_material_color(mat, color)
+        materials.append(mat)
+    
+    for i, obj in enumerate(platforms_objs):
+        mat = materials[i % len(materials)]
+        if not obj.data.materials:
+            obj.data.materials.append(mat)
+        elif obj.data.materials[0] != mat:
+            obj.data.materials[0] = mat
+    return materials
 
 
 def create_platforms(level):
     """Crée les plateformes"""
     platforms_objs = []
-    palette = level['style']['palette']
-    platform_colors = palette['platforms']
     
     for i, platform in enumerate(level['platforms']):
         # Créer cube
@@ -152,13 +180,11 @@ def create_platforms(level):
         obj.rotation_euler = Euler(platform['rot'], 'XYZ')
         obj.scale = Vector(platform['size'])
         
-        # Matériau
-        color = platform_colors[i % len(platform_colors)]
-        mat = create_emissive_material(f"Mat_Platform_{i}", color, 1.5)
-        obj.data.materials.append(mat)
-        
         platforms_objs.append(obj)
     
+    # Matériaux partagés (un par couleur de palette)
+    assign_platform_colors(platforms_objs, level['style']['palette']['platforms'])
+    
     print(f"Created {len(platforms_objs)} platforms")
     return platforms_objs
 
@@ -184,47 +210,11 @@ def create_ball(level):
 
 def animate_ball(ball, platforms, level):
     """Anime la balle avec rebonds sur plateformes"""
-    fps = level['fps']
-    gravity = level['gravity']
-    restitution = level['ball']['restitution']
-    
-    # Position initiale: au-dessus de la première plateforme
-    if len(platforms) > 0:
-        first_platform = level['platforms'][0]
-        start_pos = Vector(first_platform['pos'])
-        start_pos.y += 2.0  # 2m au-dessus
-        ball.location = start_pos
-        ball.keyframe_insert(data_path="location", frame=1)
-    
-    # Animation de rebond pour chaque plateforme
-    for i, platform_data in enumerate(level['platforms']):
-        t = platform_data['t']
-        frame = int(t * fps)
-        
-        platform_pos = Vector(platform_data['pos'])
-        
-        # Position de rebond (au-dessus de la plateforme)
-        bounce_pos = platform_pos.copy()
-        bounce_pos.y += level['ball']['radius'] + 0.05
-        
-        # Keyframe de contact
-        ball.location = bounce_pos
+    # Départ 2m au-dessus de la première plateforme, puis par plateforme: clé de
+    # contact et sommet d'arc vers la suivante (mêmes clés que collision.py)
+    for frame, location in ball_keys(level):
+        ball.location = location
         ball.keyframe_insert(data_path="location", frame=frame)
-        
-        # Arc parabolique vers la prochaine plateforme
-        if i < len(level['platforms']) - 1:
-            next_platform_data = level['platforms'][i + 1]
-            next_t = next_platform_data['t']
-            next_frame = int(next_t * fps)
-            next_pos = Vector(next_platform_data['pos'])
-            
-            # Point culminant de l'arc (mid-air)
-            mid_frame = int((frame + next_frame) / 2)
-            mid_pos = (bounce_pos + next_pos) / 2
-            mid_pos.y += 1.0 * platform_data['intensity']  # Hauteur basée sur intensité
-            
-            ball.location = mid_pos
-            ball.keyframe_insert(data_path="location", frame=mid_frame)
     
     # Interpolation F-Curve (bezier pour courbe naturelle)
     # Blender 5.x: fcurves remplacé par keyframe_points direct
@@ -243,18 +233,8 @@ def create_camera(level):
     camera.name = "Camera"
     
     # Settings caméra - PAS de DOF pour tout voir net
-    camera.data.lens = level['camera']['fov']
     camera.data.dof.use_dof = False
-    
-    # Position fixe : côté et en hauteur pour voir toute l'action
-    # Z moyen des plateformes = ~12 (début 4.7, fin 19.1)
-    camera.location = Vector((8, -12, 14))  # En arrière, sur le côté, en hauteur
-    
-    # Regarder vers le centre de l'action
-    look_target = Vector((0, 0, 12))  # Centre de la zone de jeu
-    direction = look_target - camera.location
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    camera.rotation_euler = rot_quat.to_euler()
+    configure_camera(camera, level['camera'])
     
     bpy.context.scene.camera = camera
     
@@ -262,58 +242,144 @@ def create_camera(level):
     return camera
 
 
+def configure_camera(camera, camera_settings):
+    """Objectif + position fixe (overridable: location / target) pointée vers la cible"""
+    camera.data.lens = camera_settings['fov']
+    camera.location = Vector(camera_settings.get('location', CAMERA_LOCATION))
+    
+    # Regarder vers le centre de l'action
+    direction = Vector(camera_settings.get('target', CAMERA_TARGET)) - camera.location
+    rot_quat = direction.to_track_quat('-Z', 'Y')
+    camera.rotation_euler = rot_quat.to_euler()
+
+
 def animate_camera_follow(camera, ball, level):
     """Caméra FIXE - pas d'animation"""
     print("Camera FIXED (no animation)")
 
 
-def create_lights():
-    """Crée l'éclairage"""
-    # Key light
-    bpy.ops.object.light_add(type='AREA', location=(5, -5, 8))
-    key = bpy.context.active_object
-    key.data.energy = 1000  # Doublé
-    key.data.size = 8  # Plus grand
-    
-    # Rim light
-    bpy.ops.object.light_add(type='AREA', location=(-5, -5, 8))
-    rim = bpy.context.active_object
-    rim.data.energy = 600  # Doublé
-    rim.data.size = 6  # Plus grand
-    rim.data.color = (0.5, 0.7, 1.0)
-    
-    # Fill
-    bpy.ops.object.light_add(type='AREA', location=(0, 5, 5))
-    fill = bpy.context.active_object
-    fill.data.energy = 400  # Doublé
-    fill.data.size = 8  # Plus grand
-    
+def create_lights(preset, style=None):
+    """Crée l'éclairage du style (limité par le budget du preset et du style)"""
+    style = style or get_style('emissive')
+    lights = style.create_lights(preset)
     print("Lights created")
+    return lights
 
 
-def render_animation(output_dir, level, max_frames=None):
-    """Rend l'animation frame par frame"""
-    scene = bpy.context.scene
-    scene.render.image_settings.file_format = 'PNG'
-    scene.render.filepath = os.path.join(output_dir, 'frame_')
-    
+def frame_count(level, max_frames=None):
+    """Nombre de frames à rendre"""
     total_frames = int(level['duration'] * level['fps'])
     
     # Limiter nombre de frames si demandé (pour tests rapides)
     if max_frames and max_frames < total_frames:
         total_frames = max_frames
+    return total_frames
+
+
+def contact_frames(level):
+    """Frames des rebonds (mêmes clés que animate_ball): rendues exactes en mode pas"""
+    return {int(p['t'] * level['fps']) for p in level['platforms']}
+
+
+def render_animation(output_dir, level, profiler, max_frames=None, frame_range=None, hold=True,
+                     step=1):
+    """Rend l'animation frame par frame (ou seulement frame_range=(début, fin))"""
+    scene = bpy.context.scene
+    scene.render.filepath = os.path.join(output_dir, 'frame_')
     
-    scene.frame_start = 1
-    scene.frame_end = total_frames
+    total_frames = frame_count(level, max_frames)
+    start, end = frame_range or (1, total_frames)
     
-    print(f"Rendering {total_frames} frames to {output_dir}...")
+    scene.frame_start = max(1, start)
+    scene.frame_end = min(end, total_frames)
     
-    # Rendu
-    bpy.ops.render.render(animation=True)
+    print(f"Rendering frames {scene.frame_start}-{scene.frame_end} to {output_dir}...")
+    profiler.attach(scene)
     
+    # Rendu (1 frame sur step + contacts, ou frames identiques rendues une seule fois)
+    if step > 1:
+        profiler.emit('frame_step', **render_stepped(scene, scene.frame_start, scene.frame_end, step,
+                                                      contact_frames(level), output_dir, hold))
+    elif hold:
+        profiler.emit('frame_hold', **render_with_holds(scene, scene.frame_start, scene.frame_end))
+    else:
+        bpy.ops.render.render(animation=True)
+    if step <= 1:
+        clear_manifests(output_dir, scene.frame_start, scene.frame_end)
+    
+    profiler.finish(scene)
     print("Rendering complete")
 
 
+def load_variants(variants_path):
+    """Charge la liste des variantes (JSON)"""
+    with open(variants_path, 'r') as f:
+        variants = json.load(f)
+    if not isinstance(variants, list) or not variants:
+        raise ValueError(f"Variants file must contain a non-empty list: {variants_path}")
+    return variants
+
+
+def apply_style_materials(style, platforms_objs, ball):
+    """Matériaux d'un style non piloté par la palette (ex: luxury)"""
+    if style.palette_driven:
+        return
+    # Rôles absents du style (ex: audio_gold, balle seule): matériaux de la palette gardés
+    for objects, role in ((platforms_objs, 'platform'), ([ball], 'ball')):
+        if role in style.materials:
+            style.assign(objects, role)
+    print(f"Style applied: {style.name}")
+
+
+def apply_variant(level, variant, platforms_objs, ball, camera, scene_style=None):
+    """Applique style / couleur balle / caméra d'une variante à la scène déjà construite"""
+    style = {**level['style'], **variant.get('style', {})}
+    palette = style['palette']
+    
+    if scene_style is None or scene_style.palette_driven:
+        assign_platform_colors(platforms_objs, palette['platforms'])
+        
+        world = bpy.context.scene.world
+        for node in world.node_tree.nodes:
+            if node.type == 'BACKGROUND':
+                node.inputs['Color'].default_value = (*hex_to_rgb(palette['background']), 1.0)
+        
+        ball_mat = ball.data.materials[0]
+        set_material_color(ball_mat, variant.get('ball_color', '#FFFF00'), style['glow_intensity'] * 2.0)
+    elif 'style' in variant or 'ball_color' in variant:
+        # Matériaux et world du style partagés entre variantes: seule la caméra varie
+        print(f"Style '{scene_style.name}' ignores palette / ball_color overrides")
+    
+    configure_camera(camera, {**level['camera'], **variant.get('camera', {})})
+    print(f"Variant applied: {variant.get('name', palette['name'])}")
+
+
+def render_variants(variants, level, level_path, output_dir, scene_objs, profiler,
+                    max_frames=None, cull=False, hold=True, step=1, style=None):
+    """Rend chaque variante dans son dossier, sans reconstruire la géométrie"""
+    platforms_objs, ball, camera = scene_objs
+    culled_for = level['camera']  # caméra de la visibilité courante (culling de main)
+    for i, variant in enumerate(variants):
+        variant_dir = variant.get('outFrames') or os.path.join(output_dir, f"variant_{i}")
+        os.makedirs(variant_dir, exist_ok=True)
+        
+        with profiler.stage(f"apply_variant_{i}"):
+            apply_variant(level, variant, platforms_objs, ball, camera, style)
+            # La visibilité dépend de la caméra: re-culling dès qu'elle change,
+            # y compris au retour à la caméra du level après une variante qui la surcharge
+            camera_settings = {**level['camera'], **variant.get('camera', {})}
+            if cull and camera_settings != culled_for:
+                reset_culling(platforms_objs)
+                cull_offscreen(platforms_objs, camera, 1, frame_count(level, max_frames))
+                culled_for = camera_settings
+        
+        variant_profiler = RenderProfiler(os.path.join(variant_dir, 'render_timing.jsonl'),
+                                          script='render_blender', level=level_path,
+                                          variant=variant.get('name', i),
+                                          platforms=len(level['platforms']))
+        render_animation(variant_dir, level, variant_profiler, max_frames, hold=hold, step=step)
+
+
 def main():
     args = parse_args()
     
@@ -325,6 +391,10 @@ def main():
     level_path = args['level']
     output_dir = args['outFrames']
     max_frames = int(args.get('maxFrames', 0)) or None  # 0 = toutes les frames
+    step = max(1, int(args.get('renderStep', 1)))
+    frame_range = None
+    if args.get('frameStart') or args.get('frameEnd'):
+        frame_range = (int(args.get('frameStart', 1)), int(args.get('frameEnd', 10 ** 9)))
     
     print(f"Loading level: {level_path}")
     if max_frames:
@@ -334,25 +404,69 @@ def main():
     with open(level_path, 'r') as f:
         level = json.load(f)
     
+    # Level invalide: échec immédiat plutôt qu'après des minutes de rendu
+    issues = validate_level(level)
+    for item in issues:
+        print(format_issue(item))
+    if has_errors(issues):
+        print("ERROR: Invalid level (see above)")
+        sys.exit(1)
+    
     # Créer dossier de sortie
     os.makedirs(output_dir, exist_ok=True)
     
+    # Log JSONL des timings (agrégé ensuite par le pipeline Node)
+    timing_log = args.get('timingLog') or os.path.join(output_dir, 'render_timing.jsonl')
+    profiler = RenderProfiler(timing_log, script='render_blender', level=level_path,
+                              platforms=len(level['platforms']))
+    
     # Construction de la scène
     print("Building scene...")
-    clear_scene()
-    setup_scene(level)
-    
-    platforms_objs = create_platforms(level)
-    ball = create_ball(level)
-    animate_ball(ball, platforms_objs, level)
-    
-    camera = create_camera(level)
-    animate_camera_follow(camera, ball, level)
-    
-    create_lights()
-    
-    # Rendu
-    render_animation(output_dir, level, max_frames)
+    with profiler.stage('clear_scene'):
+        clear_scene()
+    style = get_style(args.get('style', 'emissive'))
+    with profiler.stage('setup_scene'):
+        preset = setup_scene(level, args.get('preset'), args.get('engine'), style)
+    
+    with profiler.stage('create_platforms'):
+        platforms_objs = create_platforms(level)
+    with profiler.stage('create_ball'):
+        ball = create_ball(level)
+    apply_style_materials(style, platforms_objs, ball)
+    with profiler.stage('animate_ball'):
+        animate_ball(ball, platforms_objs, level)
+    if args.get('checkCollisions'):
+        with profiler.stage('collisions'):
+            report = check_collisions(level, fcurve_trajectory(ball),
+                                      frame_end=frame_count(level, max_frames))
+        print(format_report(report))
+        profiler.emit('collisions', penetrations=len(report['penetrations']),
+                      missed_contacts=len(report['missed_contacts']), samples=report['samples'])
+    
+    with profiler.stage('create_camera'):
+        camera = create_camera(level)
+        animate_camera_follow(camera, ball, level)
+    
+    with profiler.stage('create_lights'):
+        create_lights(preset, style)
+    
+    # Plateformes hors champ cachées par intervalle de frames
+    if args.get('cull'):
+        with profiler.stage('culling'):
+            stats = cull_offscreen(platforms_objs, camera, 1, frame_count(level, max_frames))
+        profiler.emit('culling', **stats)
+    profiler.scene_stats()
+    
+    # Rendu (une fois par variante si --variants)
+    if args.get('variants'):
+        variants = load_variants(args['variants'])
+        print(f"Rendering {len(variants)} variants from a single scene build")
+        render_variants(variants, level, level_path, output_dir, (platforms_objs, ball, camera),
+                        profiler, max_frames, cull=bool(args.get('cull')),
+                        hold=not args.get('noHold'), step=step, style=style)
+    else:
+        render_animation(output_dir, level, profiler, max_frames, frame_range,
+                         hold=not args.get('noHold'), step=step)
     
     print("SUCCESS")
     sys.exit(0)
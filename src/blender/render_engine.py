@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Sélection du moteur de rendu: EEVEE si un GPU est disponible, sinon Cycles CPU
+Usage: from render_engine import choose_preset, setup_engine
+
+Sélection: argument --engine auto|eevee|cycles ou variable d'env RENDER_ENGINE.
+En 'auto', un noeud headless sans GPU bascule sur le preset 'cpu'.
+"""
+
+import os
+import sys
+import bpy
+
+from render_presets import apply_preset
+
+
+GPU_BACKENDS = ('OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI')
+SOFTWARE_GL = ('llvmpipe', 'softpipe', 'swiftshader', 'software rasterizer')
+
+_detection = None
+
+
+def cpu_count():
+    """Nombre de coeurs réellement utilisables (affinité / conteneurs)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def has_gpu_device():
+    """Vérifie si Cycles voit un device GPU, quel que soit le backend"""
+    addon = bpy.context.preferences.addons.get('cycles')
+    if addon is None:
+        return False
+    prefs = addon.preferences
+
+    for backend in GPU_BACKENDS:
+        try:
+            prefs.compute_device_type = backend
+        except TypeError:
+            continue  # Backend non compilé dans ce build
+        try:
+            prefs.refresh_devices()
+        except AttributeError:
+            prefs.get_devices()
+        if any(device.type != 'CPU' for device in prefs.devices):
+            return True
+    return False
+
+
+def has_software_gl():
+    """Détecte un contexte OpenGL logiciel (Mesa llvmpipe, etc.)"""
+    try:
+        import gpu
+        renderer = gpu.platform.renderer_get().lower()
+    except Exception:
+        return False
+    return any(name in renderer for name in SOFTWARE_GL)
+
+
+def detect_cpu_only():
+    """Retourne (cpu_only, raison) - résultat mis en cache pour la session"""
+    global _detection
+    if _detection is not None:
+        return _detection
+
+    if has_software_gl():
+        _detection = (True, 'software OpenGL')
+    elif bpy.app.background and not has_gpu_device():
+        headless = sys.platform.startswith('linux') and not (
+            os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+        _detection = (True, 'headless, no GPU' if headless else 'no GPU device')
+    else:
+        _detection = (False, 'GPU available')
+
+    print(f"Engine detection: {_detection[1]}")
+    return _detection
+
+
+def choose_preset(preset_name=None, engine=None):
+    """Résout le preset effectif à partir du moteur demandé"""
+    engine = (engine or os.environ.get('RENDER_ENGINE') or 'auto').lower()
+
+    if engine == 'cycles':
+        return 'cpu'
+    if engine == 'auto' and detect_cpu_only()[0]:
+        return 'cpu'
+    return preset_name
+
+
+def configure_cycles_cpu(scene, preset):
+    """Réglages Cycles CPU pour scènes émissives (peu de rebonds, débruitage)"""
+    cycles = scene.cycles
+    settings = preset.get('cycles', {})
+    threads = cpu_count()
+
+    cycles.device = 'CPU'
+    cycles.samples = preset['samples']
+
+    # Adaptive sampling: les fonds noirs convergent en quelques samples
+    cycles.use_adaptive_sampling = True
+    cycles.adaptive_threshold = settings.get('adaptive_threshold', 0.05)
+    cycles.adaptive_min_samples = min(4, preset['samples'])
+
+    # Débruitage OpenImageDenoise (CPU)
+    cycles.use_denoising = True
+    try:
+        cycles.denoiser = 'OPENIMAGEDENOISE'
+    except TypeError:
+        pass
+
+    # Light paths: les matériaux émissifs n'ont pas besoin de GI profonde
+    cycles.max_bounces = settings.get('max_bounces', 4)
+    cycles.diffuse_bounces = settings.get('diffuse_bounces', 1)
+    cycles.glossy_bounces = settings.get('glossy_bounces', 2)
+    cycles.transmission_bounces = settings.get('transmission_bounces', 0)
+    cycles.volume_bounces = settings.get('volume_bounces', 0)
+    cycles.transparent_max_bounces = settings.get('transparent_max_bounces', 2)
+    cycles.caustics_reflective = False
+    cycles.caustics_refractive = False
+
+    # Threads et tuiles selon le nombre de coeurs
+    scene.render.threads_mode = 'FIXED'
+    scene.render.threads = threads
+    if hasattr(cycles, 'tile_size'):
+        # Cycles X: une seule tuile pour la frame, tous les threads dessus
+        cycles.use_auto_tile = False
+    else:
+        # Cycles < 3.0: petites tuiles pour occuper tous les coeurs
+        scene.render.tile_x = scene.render.tile_y = 32 if threads >= 8 else 64
+
+    print(f"Cycles CPU: {preset['samples']} samples, {threads} threads, "
+          f"bounces {cycles.max_bounces}, OIDN denoise")
+
+
+def setup_engine(scene, preset_name=None, engine=None, fps=None):
+    """Choisit le moteur, applique le preset et règle Cycles si besoin"""
+    preset = apply_preset(scene, choose_preset(preset_name, engine), fps=fps)
+    if preset['engine'] == 'CYCLES':
+        configure_cycles_cpu(scene, preset)
+    return preset
+
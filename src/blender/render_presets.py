@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Presets de qualité de rendu partagés par tous les scripts Blender
+Usage: from render_presets import apply_preset, apply_light_budget
+
+Sélection: argument --preset <nom> ou variable d'env RENDER_PRESET
+(draft | preview | final | cpu). Défaut: final (= rendu historique).
+Le choix EEVEE / Cycles CPU se fait dans render_engine.setup_engine.
+"""
+
+import os
+import bpy
+
+
+BASE_RESOLUTION = (1080, 1920)  # Format TikTok vertical
+DEFAULT_PRESET = 'final'
+
+PRESETS = {
+    # Itérations rapides: quart des pixels, 1 seule lumière
+    'draft': {
+        'engine': 'BLENDER_EEVEE',
+        'samples': 4,
+        'shadow_resolution': '512',
+        'soft_shadows': False,
+        'resolution_percentage': 50,
+        'max_lights': 1,
+        'file_format': 'PNG',
+        'color_mode': 'RGB',
+        'compression': 0,
+    },
+    # Validation visuelle avant rendu final
+    'preview': {
+        'engine': 'BLENDER_EEVEE',
+        'samples': 16,
+        'shadow_resolution': '1024',
+        'soft_shadows': True,
+        'resolution_percentage': 75,
+        'max_lights': 2,
+        'file_format': 'PNG',
+        'color_mode': 'RGB',
+        'compression': 15,
+    },
+    # Qualité de publication (réglages historiques des scripts)
+    'final': {
+        'engine': 'BLENDER_EEVEE',
+        'samples': 64,
+        'shadow_resolution': '2048',
+        'soft_shadows': True,
+        'resolution_percentage': 100,
+        'max_lights': None,
+        'file_format': 'PNG',
+        'color_mode': 'RGBA',
+        'compression': 15,
+    },
+    # Noeuds de rendu sans GPU: Cycles CPU à faible nombre de samples
+    # (réglages fins appliqués par render_engine.configure_cycles_cpu)
+    'cpu': {
+        'engine': 'CYCLES',
+        'samples': 16,
+        'shadow_resolution': '1024',
+        'soft_shadows': True,
+        'resolution_percentage': 100,
+        'max_lights': 2,
+        'file_format': 'PNG',
+        'color_mode': 'RGB',
+        'compression': 15,
+        'cycles': {
+            'adaptive_threshold': 0.05,
+            'max_bounces': 4,
+            'diffuse_bounces': 1,
+            'glossy_bounces': 2,
+            'transmission_bounces': 0,
+            'volume_bounces': 0,
+            'transparent_max_bounces': 2,
+        },
+    },
+}
+
+
+def get_preset(name=None):
+    """Retourne (nom, preset) depuis l'argument ou RENDER_PRESET"""
+    name = name or os.environ.get('RENDER_PRESET') or DEFAULT_PRESET
+    if name not in PRESETS:
+        raise ValueError(f"Preset inconnu: {name} (disponibles: {', '.join(PRESETS)})")
+    return name, PRESETS[name]
+
+
+def _set(target, attr, value):
+    """Affecte un attribut s'il existe dans cette version de Blender"""
+    try:
+        setattr(target, attr, value)
+        return True
+    except (AttributeError, TypeError):
+        return False
+
+
+def set_engine(scene, engine):
+    """Sélectionne le moteur (EEVEE s'appelle BLENDER_EEVEE_NEXT en 4.2-4.4)"""
+    if engine == 'BLENDER_EEVEE' and not _set(scene.render, 'engine', engine):
+        scene.render.engine = 'BLENDER_EEVEE_NEXT'
+    else:
+        scene.render.engine = engine
+
+
+def apply_preset(scene, name=None, fps=None):
+    """Applique moteur, samples, ombres, résolution et format de sortie"""
+    name, preset = get_preset(name)
+    render = scene.render
+
+    set_engine(scene, preset['engine'])
+    render.resolution_x, render.resolution_y = BASE_RESOLUTION
+    render.resolution_percentage = preset['resolution_percentage']
+    if fps:
+        render.fps = fps
+
+    # EEVEE: samples TAA + résolution des shadow maps
+    eevee = scene.eevee
+    _set(eevee, 'taa_render_samples', preset['samples'])
+    _set(eevee, 'shadow_cube_size', preset['shadow_resolution'])
+    _set(eevee, 'shadow_cascade_size', preset['shadow_resolution'])
+    _set(eevee, 'use_soft_shadows', preset['soft_shadows'])
+    # EEVEE Next (4.2+): échelle de résolution relative à 2048
+    _set(eevee, 'shadow_resolution_scale', int(preset['shadow_resolution']) / 2048)
+
+    if preset['engine'] == 'CYCLES':
+        _set(scene.cycles, 'samples', preset['samples'])
+
+    # Format des frames
+    image = render.image_settings
+    image.file_format = preset['file_format']
+    image.color_mode = preset['color_mode']
+    _set(image, 'compression', preset['compression'])
+
+    width = render.resolution_x * render.resolution_percentage // 100
+    height = render.resolution_y * render.resolution_percentage // 100
+    print(f"Render preset '{name}': {render.engine}, {preset['samples']} samples, {width}x{height}")
+    return preset
+
+
+def apply_light_budget(lights, preset):
+    """Garde les lumières les plus puissantes selon le budget du preset"""
+    budget = preset.get('max_lights')
+    if budget is None or len(lights) <= budget:
+        return lights
+
+    ranked = sorted(lights, key=lambda light: light.data.energy, reverse=True)
+    kept, dropped = ranked[:budget], ranked[budget:]
+    for light in dropped:
+        bpy.data.objects.remove(light, do_unlink=True)
+
+    print(f"Light budget: {len(kept)}/{len(lights)} lights kept")
+    return kept
@@ -0,0 +1,126 @@
+"""
+Registre de styles visuels partagé par les scripts Blender
+Usage: from styles import get_style, apply_style
+
+    style, lights = apply_style('luxury')      # world + lumières du style
+    ball.data.materials.append(style.material('ball'))
+
+Chaque style déclare une fois ses matériaux (rôle -> constructeur + paramètres),
+son world et ses lumières. Les node trees sont construits au premier appel puis
+retrouvés dans bpy.data (marqués 'style'): un worker qui enchaîne les jobs ne
+paie la construction qu'une fois par style.
+
+Budget de lumières: min(max_lights du preset, max_lights du style). Les
+lumières hors budget ne sont pas créées; leur énergie est reportée sur
+l'intensité du world (éclairage ambiant, sans ombres ni échantillonnage).
+"""
+
+import bpy
+
+from .nodes import light_rig, world_background
+
+_REGISTRY = {}
+
+# Le report d'énergie des lumières supprimées multiplie au plus le world par:
+MAX_WORLD_BAKE = 4.0
+
+
+class Style:
+    """Déclaration d'un style: matériaux par rôle, world, lumières"""
+
+    def __init__(self, name, materials, world, lights, palette_driven=False, max_lights=None):
+        self.name = name
+        self.materials = materials
+        self.world = world
+        self.lights = lights
+        # Couleurs des plateformes / fond fournies par la palette du level
+        self.palette_driven = palette_driven
+        # Plafond propre au style (None = budget du preset seul)
+        self.max_lights = max_lights
+
+    def material_name(self, role, **params):
+        suffix = ''.join(f"_{v}" for v in params.values())
+        return f"{self.name}_{role}{suffix}"
+
+    def material(self, role, **params):
+        """Matériau du rôle (construit au premier appel, puis réutilisé)"""
+        if role not in self.materials:
+            raise KeyError(f"Style '{self.name}' has no '{role}' material")
+        name = self.material_name(role, **params)
+        mat = bpy.data.materials.get(name)
+        if mat is None:
+            builder, defaults = self.materials[role]
+            mat = builder(name, **{**defaults, **params})
+            mat['style'] = self.name
+        return mat
+
+    def assign(self, objects, role, **params):
+        """Remplace le matériau des objets par celui du rôle"""
+        mat = self.material(role, **params)
+        for obj in objects:
+            if obj.data.materials:
+                obj.data.materials[0] = mat
+            else:
+                obj.data.materials.append(mat)
+        return mat
+
+    def light_budget(self, preset=None):
+        """Nombre de lumières autorisées (None = toutes)"""
+        budgets = [b for b in ((preset or {}).get('max_lights'), self.max_lights) if b is not None]
+        return min(budgets) if budgets else None
+
+    def light_plan(self, preset=None):
+        """(lumières gardées, lumières supprimées): les plus puissantes d'abord"""
+        budget = self.light_budget(preset)
+        ranked = sorted(self.lights, key=lambda light: light['energy'], reverse=True)
+        if budget is None or len(ranked) <= budget:
+            return ranked, []
+        return ranked[:budget], ranked[budget:]
+
+    def setup_world(self, scene=None, preset=None, **params):
+        """World du style, renforcé par l'énergie des lumières hors budget"""
+        scene = scene or bpy.context.scene
+        params = {**self.world, **params}
+        kept, dropped = self.light_plan(preset)
+        if dropped:
+            kept_energy = sum(light['energy'] for light in kept) or 1.0
+            dropped_energy = sum(light['energy'] for light in dropped)
+            gain = min(1.0 + dropped_energy / kept_energy, MAX_WORLD_BAKE)
+            params['strength'] = params.get('strength', 1.0) * gain
+        return world_background(scene, f"{self.name}_world", **params)
+
+    def create_lights(self, preset=None, scene=None):
+        """Lumières dans le budget (datablocks réutilisés entre jobs)"""
+        kept, dropped = self.light_plan(preset)
+        lights = light_rig(kept, f"{self.name}_light", scene)
+        if dropped:
+            print(f"Light budget: {len(kept)}/{len(self.lights)} lights kept, "
+                  f"{len(dropped)} baked into the world")
+        return lights
+
+
+def register(style):
+    _REGISTRY[style.name] = style
+    return style
+
+
+def get_style(name):
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown style '{name}' (available: {', '.join(available_styles())})")
+
+
+def available_styles():
+    return sorted(_REGISTRY)
+
+
+def apply_style(name, scene=None, lights=True, preset=None):
+    """Applique world (+ lumières) d'un style à la scène; retourne (style, lumières)"""
+    style = get_style(name)
+    style.setup_world(scene, preset)
+    return style, style.create_lights(preset, scene) if lights else []
+
+
+# Styles intégrés (s'enregistrent à l'import)
+from . import concepts, emissive, gold, luxury  # noqa: E402,F401
@@ -0,0 +1,15 @@
+"""
+Style des maquettes de rampes de test_concepts (matériaux propres à chaque concept)
+"""
+
+from . import Style, register
+
+STYLE = register(Style(
+    name='concepts',
+    materials={},
+    world={'color': (0.05, 0.05, 0.1), 'strength': 0.5},
+    lights=[
+        {'type': 'AREA', 'location': (5, -8, 12), 'energy': 1500, 'size': 10},     # Key
+        {'type': 'AREA', 'location': (-5, -8, 10), 'energy': 800, 'size': 8},      # Fill
+    ],
+))
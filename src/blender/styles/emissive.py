@@ -0,0 +1,22 @@
+"""
+Style néon émissif de render_blender (couleurs fournies par la palette du level)
+"""
+
+from . import Style, register
+from .nodes import emissive_material
+
+STYLE = register(Style(
+    name='emissive',
+    materials={
+        'platform': (emissive_material, {'color': '#00FFFF', 'strength': 2.25}),
+        'ball': (emissive_material, {'color': '#FFFF00', 'strength': 6.0}),
+    },
+    world={'color': '#0a0015', 'strength': 0.3},
+    lights=[
+        {'type': 'AREA', 'location': (5, -5, 8), 'energy': 1000, 'size': 8},     # Key
+        {'type': 'AREA', 'location': (-5, -5, 8), 'energy': 600, 'size': 6,      # Rim
+         'color': (0.5, 0.7, 1.0)},
+        {'type': 'AREA', 'location': (0, 5, 5), 'energy': 400, 'size': 8},      # Fill
+    ],
+    palette_driven=True,
+))
@@ -0,0 +1,42 @@
+"""
+Styles balle dorée sur level Meshy importé (render_audio_driven*, import_meshy_level)
+"""
+
+import math
+
+from . import Style, register
+from .nodes import principled_material
+
+GOLD_COLOR = (1.0, 0.766, 0.336)
+
+# render_audio_driven.py / render_audio_driven_batch.py
+AUDIO_GOLD = register(Style(
+    name='audio_gold',
+    materials={
+        'ball': (principled_material, {'base_color': GOLD_COLOR, 'metallic': 1.0, 'roughness': 0.05}),
+    },
+    world={'color': (0.02, 0.02, 0.03), 'strength': 0.1},
+    lights=[
+        {'type': 'AREA', 'location': (6, -10, 15), 'energy': 2000, 'color': (1.0, 0.85, 0.6), 'size': 5},
+        {'type': 'AREA', 'location': (-8, -8, 12), 'energy': 1200, 'color': (1.0, 0.75, 0.4), 'size': 4},
+        {'type': 'POINT', 'location': (0, 8, 10), 'energy': 800, 'color': (0.9, 0.7, 0.3)},
+        {'type': 'SPOT', 'location': (0, -5, 18), 'energy': 3000, 'color': (1.0, 0.9, 0.7),
+         'spot_size': math.radians(40)},
+    ],
+))
+
+# import_meshy_level.py
+MESHY_GOLD = register(Style(
+    name='meshy_gold',
+    materials={
+        'ball': (principled_material, {'base_color': GOLD_COLOR, 'metallic': 1.0, 'roughness': 0.05,
+                                       'emission_strength': 0.5}),
+    },
+    world={'color': (0.01, 0.008, 0.006), 'strength': 0.2},
+    lights=[
+        {'type': 'AREA', 'location': (8, -12, 18), 'energy': 2500, 'color': (1.0, 0.85, 0.6), 'size': 15},
+        {'type': 'AREA', 'location': (-10, -10, 15), 'energy': 1500, 'color': (1.0, 0.75, 0.4), 'size': 12},
+        {'type': 'SPOT', 'location': (0, -8, 20), 'energy': 3500, 'color': (1.0, 0.9, 0.7),
+         'spot_size': math.radians(45)},
+    ],
+))
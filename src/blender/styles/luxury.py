@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Style LUXE : Or et Noir élégant (module réutilisable)
+Usage: from styles import luxury
+
+    platforms, borders = luxury.create_platforms([(location, rotation, scale), ...])
+
+Un seul matériau noir et un seul matériau or pour toute la scène (registre de
+styles, mis en cache dans bpy.data), bordures dorées de toutes les plateformes dans un seul mesh
+construit avec from_pydata: coût de rendu proche du style simple.
+"""
+
+import math
+
+import bpy
+from mathutils import Euler, Vector
+
+from . import Style, register
+from .nodes import principled_material
+
+BORDER_THICKNESS = 0.08
+GOLD_COLOR = (1.0, 0.766, 0.336)  # Or 24 carats
+
+# Faces d'une boîte dont les 8 sommets sont indexés par les bits (x, y, z)
+BOX_FACES = [
+    (0, 1, 3, 2), (4, 6, 7, 5),  # -x, +x
+    (0, 4, 5, 1), (2, 3, 7, 6),  # -y, +y
+    (0, 2, 6, 4), (1, 5, 7, 3),  # -z, +z
+]
+
+STYLE = register(Style(
+    name='luxury',
+    materials={
+        # Noir profond mat
+        'platform': (principled_material, {'base_color': (0.05, 0.045, 0.04), 'metallic': 0.0,
+                                           'roughness': 0.4, 'specular': 0.2}),
+        # Or brillant avec émission légère pour glow
+        'trim': (principled_material, {'base_color': GOLD_COLOR, 'metallic': 0.95, 'roughness': 0.15,
+                                       'specular': 0.5, 'emission_strength': 0.3}),
+        'ball': (principled_material, {'base_color': GOLD_COLOR, 'metallic': 1.0, 'roughness': 0.05,
+                                       'specular': 0.5, 'emission_strength': 0.3}),
+    },
+    # Noir très profond avec légère nuance chaude
+    world={'color': (0.02, 0.015, 0.01), 'strength': 0.3},
+    lights=[
+        {'type': 'AREA', 'location': (6, -10, 15), 'energy': 2000, 'size': 12,    # Key - or chaud
+         'color': (1.0, 0.85, 0.6)},
+        {'type': 'AREA', 'location': (-8, -8, 12), 'energy': 1200, 'size': 10,    # Rim - bords
+         'color': (1.0, 0.75, 0.4)},
+        {'type': 'AREA', 'location': (0, 8, 10), 'energy': 800, 'size': 8,       # Back - sépare du fond
+         'color': (0.9, 0.7, 0.3)},
+        {'type': 'SPOT', 'location': (0, -5, 18), 'energy': 3000,                # Spot sur la balle
+         'spot_size': math.radians(40), 'spot_blend': 0.3, 'color': (1.0, 0.9, 0.7)},
+    ],
+))
+
+
+def create_ball(position, name="GoldenBall"):
+    """Balle dorée brillante avec glow"""
+    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.7, location=position)
+    ball = bpy.context.active_object
+    ball.name = name
+
+    # Matériau or ultra brillant
+    ball.data.materials.append(STYLE.material('ball'))
+    bpy.ops.object.shade_smooth()
+
+    # Subdivision pour plus de détails
+    mod = ball.modifiers.new("Subsurf", 'SUBSURF')
+    mod.levels = 2
+    mod.render_levels = 2
+    return ball
+
+
+def border_mesh(specs, name="GoldBorders", thickness=BORDER_THICKNESS):
+    """Bordures gauche/droite de toutes les plateformes dans un seul objet"""
+    verts, faces = [], []
+    for location, rotation, scale in specs:
+        matrix = Euler(rotation, 'XYZ').to_matrix()
+        half = Vector((thickness, scale[1], scale[1] * 0.05))
+        for side in (-1, 1):
+            center = Vector((location[0] + side * (scale[0] + thickness), location[1], location[2]))
+            base = len(verts)
+            for bits in range(8):
+                corner = Vector((
+                    half.x if bits & 4 else -half.x,
+                    half.y if bits & 2 else -half.y,
+                    half.z if bits & 1 else -half.z,
+                ))
+                verts.append(center + matrix @ corner)
+            faces.extend(tuple(base + v for v in face) for face in BOX_FACES)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    mesh.materials.append(STYLE.material('trim'))
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def create_platforms(specs):
+    """Plateformes noires (matériau partagé) + un mesh de bordures dorées"""
+    black = STYLE.material('platform')
+    platforms = []
+    for index, (location, rotation, scale) in enumerate(specs):
+        bpy.ops.mesh.primitive_cube_add()
+        platform = bpy.context.active_object
+        platform.name = f"Platform_{index}"
+        platform.location = Vector(location)
+        platform.rotation_euler = Euler(rotation, 'XYZ')
+        platform.scale = Vector(scale)
+        platform.data.materials.append(black)
+        platforms.append(platform)
+
+    borders = border_mesh(specs) if specs else None
+    return platforms, borders
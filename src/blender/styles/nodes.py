@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Constructeurs de node trees partagés par les styles (matériaux, world, lumières)
+Les couleurs acceptent '#RRGGBB' ou un tuple RGB (0-1).
+"""
+
+import bpy
+
+
+def rgba(color):
+    """'#RRGGBB' ou (r, g, b) -> (r, g, b, 1.0)"""
+    if isinstance(color, str):
+        value = color.lstrip('#')
+        return tuple(int(value[i:i + 2], 16) / 255.0 for i in (0, 2, 4)) + (1.0,)
+    return (*color[:3], 1.0)
+
+
+def emissive_material(name, color, strength=3.0, glossy_mix=0.8):
+    """Émission mélangée à un glossy (look néon de render_blender)"""
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    nodes.clear()
+
+    output = nodes.new('ShaderNodeOutputMaterial')
+    emission = nodes.new('ShaderNodeEmission')
+    glossy = nodes.new('ShaderNodeBsdfGlossy')
+    mix = nodes.new('ShaderNodeMixShader')
+
+    emission.inputs['Color'].default_value = rgba(color)
+    emission.inputs['Strength'].default_value = strength
+    glossy.inputs['Color'].default_value = rgba(color)
+    glossy.inputs['Roughness'].default_value = 0.2
+    mix.inputs['Fac'].default_value = glossy_mix
+
+    links = mat.node_tree.links
+    links.new(emission.outputs['Emission'], mix.inputs[1])
+    links.new(glossy.outputs['BSDF'], mix.inputs[2])
+    links.new(mix.outputs['Shader'], output.inputs['Surface'])
+    return mat
+
+
+def principled_material(name, base_color, metallic=0.0, roughness=0.5, specular=None,
+                        emission_strength=0.0):
+    """Principled BSDF (or, noir mat...), émission de la couleur de base si demandée"""
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    nodes.clear()
+
+    output = nodes.new('ShaderNodeOutputMaterial')
+    principled = nodes.new('ShaderNodeBsdfPrincipled')
+
+    principled.inputs['Base Color'].default_value = rgba(base_color)
+    principled.inputs['Metallic'].default_value = metallic
+    principled.inputs['Roughness'].default_value = roughness
+    if specular is not None:
+        principled.inputs['Specular IOR Level'].default_value = specular
+    if emission_strength:
+        principled.inputs['Emission Color'].default_value = rgba(base_color)
+        principled.inputs['Emission Strength'].default_value = emission_strength
+
+    mat.node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+    return mat
+
+
+def world_background(scene, name, color, strength=1.0):
+    """World uni (réutilisé s'il existe déjà: seules couleur et intensité changent)"""
+    world = bpy.data.worlds.get(name)
+    if world is None:
+        world = bpy.data.worlds.new(name)
+        world.use_nodes = True
+        nodes = world.node_tree.nodes
+        nodes.clear()
+        output = nodes.new('ShaderNodeOutputWorld')
+        background = nodes.new('ShaderNodeBackground')
+        world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+
+    for node in world.node_tree.nodes:
+        if node.type == 'BACKGROUND':
+            node.inputs['Color'].default_value = rgba(color)
+            node.inputs['Strength'].default_value = strength
+
+    scene.world = world
+    return world
+
+
+def light_rig(spec, prefix='light', scene=None):
+    """
+    Lumières décrites [{type, location, energy, color?, size?, ...}], créées via
+    bpy.data (sans opérateur). Les datablocks `<prefix>_<type>_<i>` sont réutilisés
+    s'ils existent déjà (jobs successifs dans la même session).
+    """
+    scene = scene or bpy.context.scene
+    lights = []
+    for index, light in enumerate(spec):
+        name = f"{prefix}_{light['type'].lower()}_{index}"
+        data = bpy.data.lights.get(name)
+        if data is None or data.type != light['type']:
+            data = bpy.data.lights.new(name, light['type'])
+        for attr, value in light.items():
+            if attr not in ('type', 'location'):
+                setattr(data, attr, value)
+
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.data != data:
+            obj = bpy.data.objects.new(name, data)
+        obj.location = light['location']
+        if scene.collection.objects.get(obj.name) is None:
+            scene.collection.objects.link(obj)
+        lights.append(obj)
+    return lights
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Validation d'un level JSON avant de lancer Blender (échoue en millisecondes)
+Usage: python3 validate_level.py level.json [--json]
+       from validate_level import validate_level
+
+    errors = validate_level(level)   # [{'severity', 'path', 'code', 'message', 'indices'}]
+
+Schéma (clés lues par render_blender.py) puis invariants numériques sur les
+colonnes de plateformes chargées en NumPy: valeurs finies, t dans [0, duration]
+et croissant, tailles positives. Les avertissements (clés du générateur que le
+rendu ne lit pas: gravity, ball.restitution; contacts sur la même frame,
+intensité négative) n'empêchent pas le rendu.
+Code de sortie: 0 valide, 1 erreurs, 2 fichier illisible.
+"""
+
+import argparse
+import json
+import re
+import sys
+
+import numpy as np
+
+PLATFORM_KEYS = ('t', 'pos', 'rot', 'size', 'intensity')
+HEX_COLOR = re.compile(r'^#[0-9a-fA-F]{6}$')
+MAX_INDICES = 10  # indices fautifs listés par erreur
+
+
+def issue(path, code, message, indices=None, severity='error'):
+    result = {'severity': severity, 'path': path, 'code': code, 'message': message}
+    if indices is not None:
+        indices = np.asarray(indices).ravel()
+        result['count'] = int(indices.size)
+        result['indices'] = indices[:MAX_INDICES].tolist()
+    return result
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value)
+
+
+def is_array(value, shape):
+    """Vrai si value se convertit en tableau float de cette forme"""
+    try:
+        return np.asarray(value, dtype=np.float64).shape == shape
+    except (TypeError, ValueError):
+        return False
+
+
+def check_schema(level):
+    """Clés et types des sections hors plateformes"""
+    errors = []
+    for key in ('duration', 'fps'):
+        if not is_number(level.get(key)):
+            errors.append(issue(key, 'type', f"'{key}' must be a finite number"))
+    if not is_number(level.get('gravity')):
+        errors.append(issue('gravity', 'type', "'gravity' must be a finite number", severity='warning'))
+    for key in ('duration', 'fps'):
+        if is_number(level.get(key)) and level[key] <= 0:
+            errors.append(issue(key, 'range', f"'{key}' must be > 0 (got {level[key]})"))
+
+    ball = level.get('ball')
+    if not isinstance(ball, dict):
+        errors.append(issue('ball', 'missing', "'ball' object is required"))
+    else:
+        if not is_number(ball.get('radius')) or ball['radius'] <= 0:
+            errors.append(issue('ball.radius', 'range', "'ball.radius' must be a number > 0"))
+        if not is_number(ball.get('restitution')):
+            errors.append(issue('ball.restitution', 'type', "'ball.restitution' must be a number",
+                                severity='warning'))
+
+    camera = level.get('camera')
+    if not isinstance(camera, dict):
+        errors.append(issue('camera', 'missing', "'camera' object is required"))
+    else:
+        if not is_number(camera.get('fov')) or camera['fov'] <= 0:
+            errors.append(issue('camera.fov', 'range', "'camera.fov' must be a number > 0"))
+        for key in ('location', 'target'):
+            if key in camera and not (isinstance(camera[key], list) and len(camera[key]) == 3
+                                      and all(is_number(v) for v in camera[key])):
+                errors.append(issue(f'camera.{key}', 'type', f"'camera.{key}' must be 3 finite numbers"))
+
+    style = level.get('style')
+    if not isinstance(style, dict):
+        return errors + [issue('style', 'missing', "'style' object is required")]
+    if not is_number(style.get('glow_intensity')):
+        errors.append(issue('style.glow_intensity', 'type', "'style.glow_intensity' must be a number"))
+    palette = style.get('palette')
+    if not isinstance(palette, dict):
+        return errors + [issue('style.palette', 'missing', "'style.palette' object is required")]
+    for key in ('name', 'background', 'platforms'):
+        if key not in palette:
+            errors.append(issue(f'style.palette.{key}', 'missing', f"'style.palette.{key}' is required"))
+    if 'background' in palette and not HEX_COLOR.match(str(palette['background'])):
+        errors.append(issue('style.palette.background', 'color',
+                            f"'style.palette.background' must be #RRGGBB (got {palette['background']!r})"))
+    colors = palette.get('platforms')
+    if 'platforms' in palette:
+        if not isinstance(colors, list) or not colors:
+            errors.append(issue('style.palette.platforms', 'type',
+                                "'style.palette.platforms' must be a non-empty list of colors"))
+        else:
+            bad = [i for i, c in enumerate(colors) if not HEX_COLOR.match(str(c))]
+            if bad:
+                errors.append(issue('style.palette.platforms', 'color',
+                                    'palette colors must be #RRGGBB', bad))
+    return errors
+
+
+def platform_columns(platforms):
+    """
+    Colonnes NumPy {clé: (N,) ou (N, 3)} + lignes {clé: indices} des colonnes
+    incomplètes (lignes mal formées écartées) + erreurs de schéma des plateformes
+    """
+    missing = [i for i, p in enumerate(platforms)
+               if not isinstance(p, dict) or not all(k in p for k in PLATFORM_KEYS)]
+    if missing:
+        return None, {}, [issue('platforms', 'missing',
+                                f"platforms need keys {', '.join(PLATFORM_KEYS)}", missing)]
+
+    columns, rows, errors = {}, {}, []
+    for key in PLATFORM_KEYS:
+        shape = () if key in ('t', 'intensity') else (3,)
+        try:
+            column = np.array([p[key] for p in platforms], dtype=np.float64)
+        except (TypeError, ValueError):
+            column = None
+        if column is None or column.shape[1:] != shape:
+            # Ligne fautive retrouvée seulement dans ce cas (chemin lent)
+            bad = [i for i, p in enumerate(platforms) if not is_array(p[key], shape)]
+            errors.append(issue(f'platforms[].{key}', 'type',
+                                f"'{key}' must be {'a number' if not shape else '3 numbers'}",
+                                bad or None))
+            # Les lignes bien formées restent vérifiées (NaN, bornes)
+            rows[key] = np.setdiff1d(np.arange(len(platforms)), bad)
+            column = np.array([platforms[i][key] for i in rows[key]],
+                              dtype=np.float64).reshape((-1,) + shape)
+        columns[key] = column
+    return columns, rows, errors
+
+
+def check_platforms(level):
+    """Invariants numériques sur toutes les plateformes d'un coup"""
+    platforms = level.get('platforms')
+    if not isinstance(platforms, list) or not platforms:
+        return [issue('platforms', 'missing', "'platforms' must be a non-empty list")]
+
+    columns, rows, errors = platform_columns(platforms)
+    if columns is None:
+        return errors
+
+    def where(key, mask):
+        """Indices de plateformes des lignes vraies de mask"""
+        found = np.flatnonzero(mask)
+        return rows[key][found] if key in rows else found
+
+    for key, column in columns.items():
+        bad = ~np.isfinite(column)
+        if bad.ndim > 1:
+            bad = bad.any(axis=1)
+        if bad.any():
+            errors.append(issue(f'platforms[].{key}', 'nan', f"'{key}' contains NaN or infinity",
+                                where(key, bad)))
+
+    t = columns['t']
+    duration = level.get('duration')
+    if is_number(duration):
+        outside = where('t', (t < 0) | (t > duration))
+        if outside.size:
+            errors.append(issue('platforms[].t', 'range',
+                                f"'t' must be within [0, duration={duration}]", outside))
+    # Ordre et frames partagées: seulement sur la colonne complète
+    if 't' not in rows:
+        backwards = np.flatnonzero(np.diff(t) < 0) + 1
+        if backwards.size:
+            errors.append(issue('platforms[].t', 'order', "'t' must be non-decreasing", backwards))
+        if is_number(level.get('fps')) and level['fps'] > 0:
+            # animate_ball pose une clé par contact: même frame -> clé écrasée
+            frames = (np.nan_to_num(t) * level['fps']).astype(np.int64)
+            shared = np.flatnonzero(np.diff(frames) == 0) + 1
+            if shared.size:
+                errors.append(issue('platforms[].t', 'frame',
+                                    'platforms share a contact frame with the previous one',
+                                    shared, severity='warning'))
+
+    flat = where('size', (columns['size'] <= 0).any(axis=1))
+    if flat.size:
+        errors.append(issue('platforms[].size', 'range', "'size' components must be > 0", flat))
+    negative = where('intensity', columns['intensity'] < 0)
+    if negative.size:
+        errors.append(issue('platforms[].intensity', 'range', "'intensity' is negative",
+                            negative, severity='warning'))
+    return errors
+
+
+def validate_level(level):
+    """Liste des erreurs et avertissements (vide: level valide)"""
+    if not isinstance(level, dict):
+        return [issue('', 'type', 'level must be a JSON object')]
+    return check_schema(level) + check_platforms(level)
+
+
+def has_errors(issues):
+    return any(i['severity'] == 'error' for i in issues)
+
+
+def format_issue(item):
+    where = f" (platforms {item['indices']}{'...' if item['count'] > len(item['indices']) else ''})" \
+        if 'indices' in item else ''
+    return f"{item['severity'].upper()} {item['path']}: {item['message']}{where}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a level JSON before rendering')
+    parser.add_argument('level', help='Level JSON file')
+    parser.add_argument('--json', action='store_true', help='Print issues as JSON')
+    args = parser.parse_args()
+
+    try:
+        with open(args.level) as f:
+            level = json.load(f)
+    except (OSError, ValueError) as e:
+        issues = [issue('', 'read', f"cannot read level: {e}")]
+        print(json.dumps({'ok': False, 'issues': issues}) if args.json else format_issue(issues[0]))
+        sys.exit(2)
+
+    issues = validate_level(level)
+    if args.json:
+        print(json.dumps({'ok': not has_errors(issues), 'issues': issues}))
+    else:
+        for item in issues:
+            print(format_issue(item))
+        if not issues:
+            print(f"✓ Level valid ({len(level['platforms'])} platforms)")
+    sys.exit(1 if has_errors(issues) else 0)
+
+
+if __name__ == '__main__':
+    main()
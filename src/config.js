@@ -49,6 +49,10 @@ export const CONFIG = {
     path: getEnv('FFMPEG_PATH', 'ffmpeg'),
   },
 
+  python: {
+    path: getEnv('PYTHON_PATH', 'python3'),
+  },
+
   // Vidéo
   video: {
     fps: parseInt(getEnv('FPS', '30')),
@@ -58,6 +62,7 @@ export const CONFIG = {
     preset: 'medium',
     crf: 23,
     pixelFormat: 'yuv420p',
+    interpolation: getEnv('FRAME_INTERPOLATION', 'mci'), // mci | blend | dup (frames non rendues, RENDER_STEP > 1)
   },
 
   // Audio
@@ -69,7 +74,10 @@ export const CONFIG = {
 
   // Rendering Blender
   render: {
-    engine: getEnv('RENDER_ENGINE', 'EEVEE'),
+    preset: getEnv('RENDER_PRESET', 'final'), // draft | preview | final | cpu
+    engine: getEnv('RENDER_ENGINE', 'auto'), // auto | eevee | cycles (auto = Cycles CPU sans GPU)
+    cull: getEnv('RENDER_CULL', 'true') === 'true', // Cache les plateformes hors champ
+    step: parseInt(getEnv('RENDER_STEP', '1')), // 1 frame sur N rendue (+ contacts), le reste interpolé à l'encodage
     samples: parseInt(getEnv('SAMPLES', '64')),
     motionBlur: getEnv('MOTION_BLUR', 'true') === 'true',
     bloomIntensity: parseFloat(getEnv('BLOOM_INTENSITY', '0.8')),
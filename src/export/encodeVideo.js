@@ -1,10 +1,13 @@
 /**
  * Module d'encodage vidéo avec FFmpeg
  * Assemble frames + audio en MP4 TikTok-ready
+ * Rendu à pas (--renderStep, frames_manifest_*.json): les frames rendues sont
+ * lues à durées variables et ffmpeg synthétise les frames manquantes
  */
 
 import { spawn } from 'child_process';
 import { join } from 'path';
+import { readdirSync, readFileSync, writeFileSync } from 'fs';
 import Logger from '../utils/logger.js';
 import CONFIG from '../config.js';
 import retry from '../utils/retry.js';
@@ -12,6 +15,46 @@ import { fileExists } from '../utils/fsx.js';
 
 const logger = new Logger('ENCODE');
 
+const MANIFEST_PATTERN = /^frames_manifest_\d+-\d+\.json$/;
+
+/**
+ * Manifestes de rendu à pas (un par shard) fusionnés, ou null (rendu complet)
+ * @returns {Object|null} - { fps, frameEnd, frames: [{ frame, file }] }
+ */
+export function readFrameManifests(framesDir) {
+  const manifests = readdirSync(framesDir)
+    .filter(name => MANIFEST_PATTERN.test(name))
+    .map(name => JSON.parse(readFileSync(join(framesDir, name), 'utf8')))
+    .sort((a, b) => a.frame_start - b.frame_start);
+  if (manifests.length === 0) return null;
+
+  const frames = manifests.flatMap(m => m.frames.map((frame, i) => ({ frame, file: m.files[i] })));
+  return {
+    fps: manifests[0].fps,
+    frameEnd: Math.max(...manifests.map(m => m.frame_end)),
+    frames,
+  };
+}
+
+/**
+ * Liste concat ffmpeg: chaque frame rendue dure jusqu'à la suivante
+ * @returns {string} - Chemin de la liste (dans framesDir)
+ */
+function writeConcatList(framesDir, manifest) {
+  const { fps, frameEnd, frames } = manifest;
+  const lines = ['ffconcat version 1.0'];
+  frames.forEach(({ frame, file }, i) => {
+    const next = i + 1 < frames.length ? frames[i + 1].frame : frameEnd + 1;
+    lines.push(`file '${file}'`, `duration ${((next - frame) / fps).toFixed(6)}`);
+  });
+  // Le demuxer concat ignore la durée de la dernière entrée sans cette répétition
+  lines.push(`file '${frames[frames.length - 1].file}'`);
+
+  const listPath = join(framesDir, 'frames_concat.txt');
+  writeFileSync(listPath, lines.join('\n') + '\n');
+  return listPath;
+}
+
 /**
  * Encode les frames en vidéo MP4 avec audio
  * @param {string} framesDir - Dossier contenant les frames PNG
@@ -37,16 +80,27 @@ export async function encodeVideo(framesDir, audioPath, outputPath) {
   const height = CONFIG.video.height;
 
   // Pattern de frames: frame_0001.png, frame_0002.png, etc.
-  const framePattern = join(framesDir, 'frame_%04d.png');
+  // ou, en rendu à pas, liste des frames rendues + interpolation jusqu'à fps
+  let videoInput = ['-framerate', fps.toString(), '-i', join(framesDir, 'frame_%04d.png')];
+  let videoFilter = [];
+  const manifest = readFrameManifests(framesDir);
+  if (manifest) {
+    const mode = CONFIG.video.interpolation;
+    logger.info(`Rendu à pas: ${manifest.frames.length}/${manifest.frameEnd} frames, interpolation ${mode}`);
+    videoInput = ['-f', 'concat', '-safe', '0', '-i', writeConcatList(framesDir, manifest)];
+    videoFilter = ['-vf', mode === 'mci'
+      ? `minterpolate=fps=${fps}:mi_mode=mci:mc_mode=aobmc:me_mode=bidir:vsbmc=1`
+      : `minterpolate=fps=${fps}:mi_mode=${mode}`];
+  }
 
   // Construction de la commande FFmpeg
   const args = [
     '-y',  // Overwrite
-    '-framerate', fps.toString(),
-    '-i', framePattern,
+    ...videoInput,
     '-i', audioPath,
     
     // Vidéo
+    ...videoFilter,
     '-c:v', CONFIG.video.codec,
     '-preset', CONFIG.video.preset,
     '-crf', CONFIG.video.crf.toString(),
@@ -9,7 +9,7 @@ import { existsSync } from 'fs';
 import { resolve } from 'path';
 import Logger from './utils/logger.js';
 import CONFIG from './config.js';
-import { processSingleTrack, processBatch } from './pipeline.js';
+import { processSingleTrack, processTrackVariants, processBatch } from './pipeline.js';
 import { ensureDir } from './utils/fsx.js';
 
 const logger = new Logger('MAIN');
@@ -23,12 +23,14 @@ function showHelp() {
 
 USAGE:
   node src/index.js <audio_file> [variant]      Génère une vidéo
+  node src/index.js <audio_file> 0,1,2          Plusieurs variantes (un seul build Blender)
   node src/index.js --batch                      Mode batch (tous les fichiers)
   node src/index.js --help                       Affiche l'aide
 
 EXEMPLES:
   node src/index.js audio/song.mp3               Variante 0
   node src/index.js audio/song.mp3 2             Variante 2
+  node src/index.js audio/song.mp3 0,3,5         Variantes 0, 3 et 5
   node src/index.js --batch                      Batch complet
 
 OPTIONS:
@@ -93,8 +95,12 @@ function parseArgs() {
     process.exit(1);
   }
 
-  // Variante - deuxième argument optionnel
+  // Variante(s) - deuxième argument optionnel ("2" ou "0,1,2")
   let variant = 0;
+  if (args[1] && args[1].includes(',')) {
+    const variants = args[1].split(',').map(v => parseInt(v)).filter(v => !isNaN(v));
+    return { mode: 'variants', audioPath: absolutePath, variants };
+  }
   if (args[1] && !isNaN(parseInt(args[1]))) {
     variant = parseInt(args[1]);
   }
@@ -235,6 +241,9 @@ async function main() {
     if (options.mode === 'batch') {
       logger.info('Mode BATCH');
       await processBatch();
+    } else if (options.mode === 'variants') {
+      logger.info(`Mode VARIANTS: ${options.audioPath} (variants ${options.variants.join(', ')})`);
+      await processTrackVariants(options.audioPath, options.variants);
     } else {
       logger.info(`Mode SINGLE: ${options.audioPath} (variant ${options.variant})`);
       await processSingleTrack(options.audioPath, options.variant);
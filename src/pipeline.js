@@ -3,7 +3,7 @@
  * Gère le batch processing avec cache et variantes
  */
 
-import { join, basename, extname } from 'path';
+import { join, basename, extname, dirname } from 'path';
 import { spawn } from 'child_process';
 import Logger from './utils/logger.js';
 import CONFIG from './config.js';
@@ -12,6 +12,7 @@ import { analyzeAudio } from './audio/analyzeAudio.node.js';
 import { generateLevel } from './level/generateLevel.js';
 import { encodeVideo, getVideoInfo } from './export/encodeVideo.js';
 import retry from './utils/retry.js';
+import { readTimingLog, summarizeTiming, appendTimingHistory } from './utils/renderTiming.js';
 
 // Quiz mode imports (legacy)
 import { extractMidi } from './quiz/extractMidi.js';
@@ -134,10 +135,142 @@ export async function processSingleTrack(audioPath, variantIndex = 0) {
   }
 }
 
+/**
+ * Génère plusieurs variantes d'une piste (mode normal) avec un seul build Blender:
+ * la géométrie est commune, seuls style et caméra changent par variante
+ */
+export async function processTrackVariants(audioPath, variantIndices) {
+  const startTime = Date.now();
+  const trackName = basename(audioPath, extname(audioPath));
+
+  logger.info(`━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━`);
+  logger.info(`Traitement: ${trackName}`);
+  logger.info(`Variantes: ${variantIndices.join(', ')}`);
+  logger.info(`━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━`);
+
+  try {
+    // 1. ANALYSE AUDIO
+    logger.info('\n[1/4] Analyse audio...');
+    const eventsPath = join(CONFIG.paths.data, `${trackName}_events.json`);
+    const events = fileExists(eventsPath)
+      ? await readJSON(eventsPath)
+      : await analyzeAudio(audioPath, eventsPath);
+
+    // 2. GÉNÉRATION LEVELS (mêmes plateformes, style par variante)
+    logger.info('\n[2/4] Génération levels 3D...');
+    const variants = [];
+    let levelPath = null;
+    for (const variantIndex of variantIndices) {
+      const level = generateLevel(events, variantIndex);
+      const variantLevelPath = join(CONFIG.paths.data, `${trackName}_level_v${variantIndex}.json`);
+      await writeJSON(variantLevelPath, level);
+      levelPath = levelPath || variantLevelPath;
+      variants.push({
+        name: `${trackName}_v${variantIndex}`,
+        variantIndex,
+        outFrames: join(CONFIG.paths.frames, `${trackName}_v${variantIndex}`),
+        style: level.style,
+        camera: level.camera,
+      });
+    }
+
+    // 3. RENDU BLENDER (un seul lancement)
+    logger.info(`\n[3/4] Rendu Blender (${variants.length} variantes)...`);
+    // Dossier de base: log de construction de scène + variants.json
+    const buildDir = join(CONFIG.paths.frames, `${trackName}_variants`);
+    await ensureDir(buildDir);
+    for (const variant of variants) {
+      await ensureDir(variant.outFrames);
+    }
+    if (!CONFIG.skipRender) {
+      await renderBlender(levelPath, buildDir, { variants });
+    } else {
+      logger.warn('Rendu skippé (SKIP_RENDER=true)');
+    }
+
+    // 4. ENCODAGE + NETTOYAGE
+    logger.info('\n[4/4] Encodage vidéos...');
+    const outputDir = join(CONFIG.paths.output, trackName);
+    await ensureDir(outputDir);
+    const outputs = [];
+    for (const variant of variants) {
+      const outputPath = join(outputDir, `variant_${variant.variantIndex.toString().padStart(2, '0')}.mp4`);
+      await encodeVideo(variant.outFrames, audioPath, outputPath);
+      outputs.push(outputPath);
+      if (!CONFIG.keepFrames) {
+        removeDir(variant.outFrames);
+      }
+    }
+    if (!CONFIG.keepFrames) {
+      removeDir(buildDir);
+    }
+
+    const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
+    logger.success(`✨ ${outputs.length} variantes générées en ${elapsed}s`);
+
+    return {
+      success: true,
+      outputPaths: outputs,
+      trackName,
+      variantIndices,
+      elapsedSeconds: elapsed,
+    };
+
+  } catch (error) {
+    logger.error('Erreur pipeline', error.message);
+    if (CONFIG.debug) {
+      logger.error(error.stack);
+    }
+
+    return {
+      success: false,
+      error: error.message,
+      trackName,
+      variantIndices,
+    };
+  }
+}
+
+/**
+ * Valide le level JSON (src/blender/validate_level.py) avant de lancer Blender
+ */
+async function validateLevel(levelPath) {
+  const script = join(dirname(CONFIG.paths.blenderScript), 'validate_level.py');
+  const stdout = await new Promise((resolve, reject) => {
+    const process = spawn(CONFIG.python.path, [script, levelPath, '--json'], {
+      stdio: ['ignore', 'pipe', 'pipe'],
+    });
+    let output = '';
+    process.stdout.on('data', (data) => {
+      output += data.toString();
+    });
+    process.on('close', () => resolve(output));
+    process.on('error', (error) => {
+      reject(new Error(`Erreur spawn Python: ${error.message}`));
+    });
+  });
+
+  let report;
+  try {
+    report = JSON.parse(stdout);
+  } catch {
+    throw new Error(`Validation du level impossible: ${stdout.slice(-500)}`);
+  }
+  const format = (issue) => `${issue.path}: ${issue.message}` +
+    (issue.indices ? ` (platforms ${issue.indices.join(', ')}${issue.count > issue.indices.length ? '...' : ''})` : '');
+  report.issues.filter(i => i.severity === 'warning').forEach(i => logger.warn(format(i)));
+  if (!report.ok) {
+    const errors = report.issues.filter(i => i.severity === 'error').map(format);
+    throw new Error(`Level invalide: ${levelPath}\n  ${errors.join('\n  ')}`);
+  }
+}
+
 /**
  * Lance Blender en mode headless pour le rendu
+ * @param {Object} options.variants - Variantes [{name, outFrames, style, camera}] rendues
+ *   depuis une seule construction de scène (framesDir sert alors de dossier de base)
  */
-async function renderBlender(levelPath, framesDir) {
+async function renderBlender(levelPath, framesDir, { variants = null } = {}) {
   const blenderPath = CONFIG.blender.path;
   const scriptPath = CONFIG.paths.blenderScript;
 
@@ -149,7 +282,16 @@ async function renderBlender(levelPath, framesDir) {
     throw new Error(`Script Blender introuvable: ${scriptPath}`);
   }
 
-  return retry(async () => {
+  // Échec en millisecondes plutôt qu'après le lancement de Blender
+  await validateLevel(levelPath);
+
+  let variantsPath = null;
+  if (variants) {
+    variantsPath = join(framesDir, 'variants.json');
+    await writeJSON(variantsPath, variants);
+  }
+
+  await retry(async () => {
     return new Promise((resolve, reject) => {
       const args = [
         '-b',  // Background (headless)
@@ -157,7 +299,18 @@ async function renderBlender(levelPath, framesDir) {
         '--',
         '--level', levelPath,
         '--outFrames', framesDir,
+        '--preset', CONFIG.render.preset,
+        '--engine', CONFIG.render.engine,
       ];
+      if (CONFIG.render.cull) {
+        args.push('--cull');
+      }
+      if (CONFIG.render.step > 1) {
+        args.push('--renderStep', CONFIG.render.step.toString());
+      }
+      if (variantsPath) {
+        args.push('--variants', variantsPath);
+      }
 
       logger.info(`Lancement Blender: ${blenderPath}`);
       logger.debug(`Args: ${args.join(' ')}`);
@@ -208,6 +361,42 @@ async function renderBlender(levelPath, framesDir) {
   }, {
     maxAttempts: 1,  // Pas de retry pour Blender (trop long)
   });
+
+  if (variants) {
+    for (const variant of variants) {
+      await reportRenderTiming(levelPath, variant.outFrames);
+    }
+  } else {
+    await reportRenderTiming(levelPath, framesDir);
+  }
+}
+
+/**
+ * Résume le log de timing du rendu et l'ajoute à l'historique
+ */
+async function reportRenderTiming(levelPath, framesDir) {
+  const summary = summarizeTiming(await readTimingLog(join(framesDir, 'render_timing.jsonl')));
+  if (!summary) {
+    return;
+  }
+
+  const { frames } = summary;
+  logger.info(
+    `Timing: build ${summary.buildSeconds.toFixed(1)}s, ` +
+    `${frames.count} frames avg ${frames.avg.toFixed(2)}s (p95 ${frames.p95.toFixed(2)}s), ` +
+    `peak ${summary.peakRssMb ?? '?'} MB, ${summary.scene.triangles ?? '?'} triangles`
+  );
+  if (summary.held && summary.held.held > 0) {
+    logger.info(`Frame hold: ${summary.held.rendered}/${summary.held.frames} frames rendered, ${summary.held.held} held`);
+  }
+  if (summary.stepped) {
+    logger.info(`Render step ${summary.stepped.step}: ${summary.stepped.rendered}/${summary.stepped.frames} frames rendered (${summary.stepped.contacts} contacts), rest interpolated at encode`);
+  }
+
+  await appendTimingHistory(join(CONFIG.paths.output, 'render_timings.jsonl'), summary, {
+    level: basename(levelPath),
+    preset: CONFIG.render.preset,
+  });
 }
 
 /**
@@ -458,5 +647,6 @@ export async function processBatch(audioFiles) {
 
 export default {
   processSingleTrack,
+  processTrackVariants,
   processBatch,
 };
@@ -2,6 +2,12 @@
 """
 Alternative simple à basic-pitch pour extraire MIDI
 Utilise aubio pour pitch detection + mido pour MIDI writing
+Écrit aussi les notes en colonnes (cache data/cache/ncol/<hash du MIDI>.ncol,
+voir noteColumns.py): le pipeline Node les relit sans re-parser le MIDI
+--sample-rate 22050/16000: analyse à taux réduit (fenêtre et hop mis à
+l'échelle, mêmes durées en secondes). Mesuré sur la mélodie synthétique:
+yin ~1.7x plus rapide à 22050 sans perte de précision, moins pour les
+méthodes FFT (voir benchmarks/bench_pitch.py --rates)
 """
 
 import sys
@@ -10,20 +16,75 @@ import aubio
 import numpy as np
 from mido import MidiFile, MidiTrack, Message
 
-def extract_midi_simple(audio_path, output_midi):
-    """Extrait les notes d'un fichier audio et génère un MIDI"""
-    
-    # Paramètres
-    hop_size = 512
-    sample_rate = 44100
+from noteColumns import sidecar_path, write_ncol
+
+# Réglages par défaut (comparés par benchmarks/bench_pitch.py)
+PITCH_METHOD = "default"
+BUF_SIZE = 2048          # échantillons à SAMPLE_RATE
+HOP_SIZE = 512
+SAMPLE_RATE = 44100
+SILENCE_DB = -40
+MIN_CONFIDENCE = 0.8
+
+
+def analysis_sizes(buf_size, hop_size, sample_rate):
+    """Fenêtre / hop donnés à SAMPLE_RATE -> même durée au taux d'analyse"""
+    if sample_rate == SAMPLE_RATE:
+        return buf_size, hop_size
+    scale = sample_rate / SAMPLE_RATE
+    # Fenêtre: puissance de 2 supérieure (FFT), jamais plus courte qu'à 44.1 kHz
+    buf = 1 << max(int(np.ceil(np.log2(buf_size * scale - 1e-9))), 5)
+    hop = min(max(int(round(hop_size * scale)), 1), buf)
+    return buf, hop
+
+
+def resample(samples, source_rate, target_rate):
+    """Rééchantillonnage à bande limitée par FFT (signal entier en mémoire)"""
+    length = int(round(len(samples) * target_rate / source_rate))
+    spectrum = np.fft.rfft(samples)[:length // 2 + 1]
+    return (np.fft.irfft(spectrum, length) * (length / len(samples))).astype(aubio.float_type)
+
+
+def read_blocks(audio_path, sample_rate, hop_size):
+    """Blocs (samples, read) de hop_size échantillons à sample_rate"""
+    try:
+        source = aubio.source(audio_path, sample_rate, hop_size)
+    except RuntimeError:
+        # aubio compilé sans rééchantillonneur (wavread seul): lecture native + FFT
+        source = aubio.source(audio_path, 0, hop_size)
+        blocks = []
+        while True:
+            samples, read = source()
+            blocks.append(samples[:read].copy())
+            if read < hop_size:
+                break
+        signal = resample(np.concatenate(blocks), source.samplerate, sample_rate)
+        for start in range(0, len(signal) + 1, hop_size):
+            block = np.zeros(hop_size, dtype=aubio.float_type)
+            chunk = signal[start:start + hop_size]
+            block[:len(chunk)] = chunk
+            yield block, len(chunk)
+        return
+    while True:
+        samples, read = source()
+        yield samples, read
+        if read < hop_size:
+            break
+
+
+def detect_notes(audio_path, method=PITCH_METHOD, buf_size=BUF_SIZE, hop_size=HOP_SIZE,
+                 sample_rate=SAMPLE_RATE, silence=SILENCE_DB, min_confidence=MIN_CONFIDENCE):
+    """Notes [{t, pitch, duration, velocity}] détectées par aubio (sans écrire de fichier)
+
+    buf_size / hop_size sont exprimés à SAMPLE_RATE et mis à l'échelle si
+    sample_rate est plus bas; les temps restent en secondes.
+    """
+    buf_size, hop_size = analysis_sizes(buf_size, hop_size, sample_rate)
     
     # Créer le pitch detector
-    pitch_o = aubio.pitch("default", 2048, hop_size, sample_rate)
+    pitch_o = aubio.pitch(method, buf_size, hop_size, sample_rate)
     pitch_o.set_unit("midi")
-    pitch_o.set_silence(-40)
-    
-    # Lire l'audio
-    source = aubio.source(audio_path, sample_rate, hop_size)
+    pitch_o.set_silence(silence)
     
     notes = []
     current_note = None
@@ -31,13 +92,12 @@ def extract_midi_simple(audio_path, output_midi):
     time = 0
     
     # Détecter les pitches
-    while True:
-        samples, read = source()
+    for samples, read in read_blocks(audio_path, sample_rate, hop_size):
         pitch = pitch_o(samples)[0]
         confidence = pitch_o.get_confidence()
         
         # Note détectée avec confidence suffisante
-        if confidence > 0.8 and pitch > 0:
+        if confidence > min_confidence and pitch > 0:
             midi_note = int(pitch)
             
             if current_note is None:
@@ -70,9 +130,6 @@ def extract_midi_simple(audio_path, output_midi):
                 current_note = None
         
         time += hop_size / sample_rate
-        
-        if read < hop_size:
-            break
     
     # Fermer dernière note
     if current_note is not None:
@@ -82,6 +139,12 @@ def extract_midi_simple(audio_path, output_midi):
             'duration': time - note_start,
             'velocity': 100
         })
+    return notes
+
+
+def extract_midi_simple(audio_path, output_midi, ncol_path=None, sample_rate=SAMPLE_RATE):
+    """Extrait les notes d'un fichier audio et génère un MIDI (+ sidecar .ncol)"""
+    notes = detect_notes(audio_path, sample_rate=sample_rate)
     
     # Créer MIDI
     mid = MidiFile()
@@ -101,16 +164,27 @@ def extract_midi_simple(audio_path, output_midi):
     
     mid.save(output_midi)
     print(f"✓ MIDI saved: {output_midi} ({len(notes)} notes)")
+    
+    # Sidecar colonnaire (clé: hash du MIDI qui vient d'être écrit)
+    ncol_path = ncol_path or sidecar_path(output_midi)
+    starts = np.array([note['t'] for note in notes], dtype=np.float64)
+    ends = starts + np.array([note['duration'] for note in notes], dtype=np.float64)
+    digest = write_ncol(ncol_path, starts, ends,
+                        [note['pitch'] for note in notes], [note['velocity'] for note in notes])
+    print(f"✓ Note columns: {ncol_path} (hash {digest})")
     return len(notes)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Simple audio to MIDI converter')
     parser.add_argument('audio', help='Input audio file')
     parser.add_argument('output', help='Output MIDI file')
+    parser.add_argument('--ncol', default=None, help='Note columns output (default: cache keyed by the MIDI hash)')
+    parser.add_argument('--sample-rate', type=int, default=SAMPLE_RATE,
+                        help=f'Analysis sample rate, e.g. 22050 or 16000 (default: {SAMPLE_RATE})')
     args = parser.parse_args()
     
     try:
-        count = extract_midi_simple(args.audio, args.output)
+        count = extract_midi_simple(args.audio, args.output, args.ncol, args.sample_rate)
         sys.exit(0)
     except Exception as e:
         print(f"✗ Error: {e}", file=sys.stderr)
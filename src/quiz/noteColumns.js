@@ -0,0 +1,128 @@
+/**
+ * Format colonnaire .ncol (notes start/end/pitch/velocity + hash du contenu)
+ * Partagé avec Python (src/quiz/noteColumns.py): même disposition binaire,
+ * colonnes lues sans copie via des TypedArrays sur le buffer du fichier
+ */
+
+import { readFileSync, writeFileSync, existsSync, mkdirSync } from 'fs';
+import { createHash } from 'crypto';
+import { dirname, join } from 'path';
+import CONFIG from '../config.js';
+
+const MAGIC = 'NCOL';
+const VERSION = 1;
+const HEADER_SIZE = 32;
+
+// Sidecars des MIDI sources, nommés par hash de leur contenu (hors dossiers versionnés)
+export const NCOL_CACHE_DIR = join(CONFIG.paths.data, 'cache', 'ncol');
+
+/**
+ * Hash (hex) des octets de colonnes, identique au hash Python
+ */
+function contentHash(bytes) {
+  return createHash('sha256').update(bytes).digest().subarray(0, 16).toString('hex');
+}
+
+/**
+ * Décode un buffer .ncol
+ * @param {Buffer} buffer - Contenu du fichier
+ * @returns {Object} - { start: Float64Array, end: Float64Array, pitch: Uint8Array, velocity: Uint8Array, count, tempoMicroseconds, hash }
+ */
+export function decodeNoteColumns(buffer) {
+  if (buffer.toString('latin1', 0, 4) !== MAGIC || buffer.readUInt16LE(4) !== VERSION) {
+    throw new Error(`Fichier NCOL v${VERSION} invalide`);
+  }
+  const headerSize = buffer.readUInt16LE(6);
+  const count = buffer.readUInt32LE(8);
+  const tempoMicroseconds = buffer.readUInt32LE(12);
+  const hash = buffer.toString('hex', 16, 32);
+
+  // Float64Array exige un offset multiple de 8: copie seulement si le buffer est mal aligné
+  if ((buffer.byteOffset + headerSize) % 8 !== 0) {
+    buffer = Buffer.from(buffer);
+  }
+  let offset = buffer.byteOffset + headerSize;
+  const start = new Float64Array(buffer.buffer, offset, count);
+  offset += count * 8;
+  const end = new Float64Array(buffer.buffer, offset, count);
+  offset += count * 8;
+  const pitch = new Uint8Array(buffer.buffer, offset, count);
+  offset += count;
+  const velocity = new Uint8Array(buffer.buffer, offset, count);
+
+  return { start, end, pitch, velocity, count, tempoMicroseconds, hash };
+}
+
+/**
+ * Lit un fichier .ncol
+ */
+export function readNoteColumns(path) {
+  return decodeNoteColumns(readFileSync(path));
+}
+
+/**
+ * Écrit des notes [{start, end, pitch, velocity}] au format .ncol
+ * @returns {string} - Hash du contenu
+ */
+export function writeNoteColumns(path, notes, tempoMicroseconds = 500000) {
+  const count = notes.length;
+  const columns = Buffer.alloc(count * 18);
+  const start = new Float64Array(columns.buffer, columns.byteOffset, count);
+  const end = new Float64Array(columns.buffer, columns.byteOffset + count * 8, count);
+  notes.forEach((note, i) => {
+    start[i] = note.start;
+    end[i] = note.end;
+    columns[count * 16 + i] = Math.max(0, Math.min(127, note.pitch));
+    columns[count * 17 + i] = Math.max(0, Math.min(127, note.velocity));
+  });
+
+  const hash = contentHash(columns);
+  const header = Buffer.alloc(HEADER_SIZE);
+  header.write(MAGIC, 0, 'latin1');
+  header.writeUInt16LE(VERSION, 4);
+  header.writeUInt16LE(HEADER_SIZE, 6);
+  header.writeUInt32LE(count, 8);
+  header.writeUInt32LE(Math.round(tempoMicroseconds), 12);
+  header.write(hash, 16, 'hex');
+
+  mkdirSync(dirname(path), { recursive: true });
+  writeFileSync(path, Buffer.concat([header, columns]));
+  return hash;
+}
+
+/**
+ * Colonnes -> notes objet pour les étapes existantes (cleanMelody, quantize...)
+ */
+export function columnsToNotes(columns, track = 0) {
+  const notes = new Array(columns.count);
+  for (let i = 0; i < columns.count; i++) {
+    notes[i] = {
+      start: columns.start[i],
+      end: columns.end[i],
+      pitch: columns.pitch[i],
+      velocity: columns.velocity[i],
+      channel: 0,
+      track,
+    };
+  }
+  return notes;
+}
+
+/**
+ * Chemin du sidecar d'une source: <cache>/<sha256 des octets de la source>.ncol
+ * (identique à noteColumns.sidecar_path côté Python)
+ */
+export function sidecarPath(sourceBytes, cacheDir = NCOL_CACHE_DIR) {
+  const hash = createHash('sha256').update(sourceBytes).digest('hex').slice(0, 32);
+  return join(cacheDir, `${hash}.ncol`);
+}
+
+/**
+ * Sidecar existant pour ce contenu source, ou null
+ */
+export function cachedSidecar(sourceBytes, cacheDir = NCOL_CACHE_DIR) {
+  const path = sidecarPath(sourceBytes, cacheDir);
+  return existsSync(path) ? path : null;
+}
+
+export default readNoteColumns;
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Format colonnaire .ncol pour échanger des notes avec le pipeline quiz (Node)
+Lu sans copie des deux côtés (np.frombuffer / Float64Array), voir noteColumns.js
+
+Disposition (little-endian):
+    0   magic   b'NCOL'
+    4   u16     version (1)
+    6   u16     taille du header (32)
+    8   u32     nombre de notes N
+    12  u32     tempo (µs par noire)
+    16  16 o    hash du contenu (sha256 tronqué des colonnes)
+    32  f64[N]  start (s)
+        f64[N]  end (s)
+        u8[N]   pitch
+        u8[N]   velocity
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'NCOL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII16s')  # 32 octets: garde les colonnes f64 alignées
+ROOT = Path(__file__).resolve().parents[2]
+# Sidecars des MIDI sources, nommés par hash de leur contenu (comme noteColumns.js)
+NCOL_CACHE_DIR = Path(os.environ.get('DATA_DIR', ROOT / 'data')) / 'cache' / 'ncol'
+
+
+def content_hash(columns):
+    """Hash (hex) des octets de colonnes: identique pour des notes identiques"""
+    return hashlib.sha256(columns).digest()[:16].hex()
+
+
+def encode_ncol(start, end, pitch, velocity, tempo_us=500000):
+    """Colonnes -> octets .ncol"""
+    start = np.ascontiguousarray(start, dtype='<f8')
+    count = len(start)
+    columns = b''.join([
+        start.tobytes(),
+        np.ascontiguousarray(end, dtype='<f8').tobytes(),
+        np.clip(pitch, 0, 127).astype(np.uint8).tobytes(),
+        np.clip(velocity, 0, 127).astype(np.uint8).tobytes(),
+    ])
+    digest = bytes.fromhex(content_hash(columns))
+    return HEADER.pack(MAGIC, VERSION, HEADER.size, count, int(tempo_us), digest) + columns
+
+
+def sidecar_path(source_path, cache_dir=NCOL_CACHE_DIR):
+    """<cache>/<sha256 des octets de la source>.ncol"""
+    with open(source_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:32]
+    return str(Path(cache_dir) / f"{digest}.ncol")
+
+
+def write_ncol(path, start, end, pitch, velocity, tempo_us=500000):
+    data = encode_ncol(start, end, pitch, velocity, tempo_us)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data[16:32].hex()
+
+
+def decode_header(data):
+    """(taille du header, nombre de notes, tempo µs, hash hex)"""
+    magic, version, header_size, count, tempo_us, digest = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not an NCOL v{VERSION} file (magic={bytes(magic)!r}, version={version})")
+    return header_size, count, tempo_us, digest.hex()
+
+
+def decode_ncol(data):
+    """Octets .ncol -> dict de vues NumPy (sans copie) + tempo + hash"""
+    offset, count, tempo_us, digest = decode_header(data)
+    columns = {}
+    for name, dtype in (('start', '<f8'), ('end', '<f8'), ('pitch', 'u1'), ('velocity', 'u1')):
+        columns[name] = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        offset += count * np.dtype(dtype).itemsize
+    columns['tempo_us'] = tempo_us
+    columns['hash'] = digest
+    return columns
+
+
+def read_ncol(path):
+    """Lit un .ncol (mmap: les colonnes pointent directement dans le fichier)"""
+    return decode_ncol(np.memmap(path, dtype=np.uint8, mode='r'))
+
+
+def read_ncol_hash(path):
+    """Hash du contenu sans lire les colonnes (cache des étapes du pipeline)"""
+    with open(path, 'rb') as f:
+        return decode_header(f.read(HEADER.size))[3]
+
+
+if __name__ == '__main__':
+    notes = read_ncol(sys.argv[1])
+    print(f"{len(notes['start'])} notes, tempo {60e6 / notes['tempo_us']:.1f} BPM, hash {notes['hash']}")
@@ -3,22 +3,41 @@
  * Format unifié pour pipeline : {start, end, pitch, velocity, channel, track}
  */
 
-import { readFileSync } from 'fs';
+import { readFileSync, existsSync } from 'fs';
 import MidiParser from 'midi-parser-js';
 import Logger from '../utils/logger.js';
+import { readNoteColumns, writeNoteColumns, columnsToNotes, sidecarPath } from './noteColumns.js';
 
 const logger = new Logger('MIDI-PARSER');
 
 /**
  * Parse un fichier MIDI et extrait les notes au format unifié
+ * Un sidecar .ncol du cache (data/cache/ncol/<sha256 du MIDI>.ncol, écrit au
+ * premier parsing ou par extractMidiSimple.py) évite de re-parser le MIDI.
+ * Depuis le cache, channel et track valent 0 (non stockés dans le .ncol);
+ * ppq est relu dans l'en-tête du MIDI
  * @param {string} midiPath - Chemin du fichier MIDI
- * @returns {Object} - { notes: [{start, end, pitch, velocity, channel, track}], tempo, ppq }
+ * @returns {Object} - { notes: [{start, end, pitch, velocity, channel, track}], tempo, ppq, hash }
  */
 export function parseMidi(midiPath) {
+  const midiData = readFileSync(midiPath);
+  const sidecar = sidecarPath(midiData);
+  if (existsSync(sidecar)) {
+    const columns = readNoteColumns(sidecar);
+    const tempoBPM = 60000000 / columns.tempoMicroseconds;
+    logger.info(`Notes depuis cache colonnaire: ${sidecar} (${columns.count} notes, hash ${columns.hash})`);
+    return {
+      notes: columnsToNotes(columns),
+      tempo: tempoBPM,
+      ppq: midiData.readUInt16BE(12), // MThd: division (ticks par noire)
+      tempoMicroseconds: columns.tempoMicroseconds,
+      hash: columns.hash,
+    };
+  }
+
   const isProfessional = midiPath.includes('data/midi/');
   logger.info(`Parsing MIDI${isProfessional ? ' 🎵 PROFESSIONNEL' : ''}: ${midiPath}`);
 
-  const midiData = readFileSync(midiPath);
   const parsed = MidiParser.parse(midiData);
 
   // 1. Extraire le tempo global (généralement dans track 0)
@@ -111,11 +130,20 @@ export function parseMidi(midiPath) {
   const tempoBPM = 60000000 / tempo;
   logger.success(`${notes.length} notes extraites, tempo: ${tempoBPM.toFixed(1)} BPM`);
 
+  // Sidecar colonnaire pour les runs suivants (canal / piste non conservés)
+  let hash = null;
+  try {
+    hash = writeNoteColumns(sidecar, notes, tempo);
+  } catch (error) {
+    logger.warn(`Cache colonnaire non écrit: ${error.message}`);
+  }
+
   return {
     notes,
     tempo: tempoBPM, // BPM
     ppq,
     tempoMicroseconds: tempo,
+    hash,
   };
 }
 
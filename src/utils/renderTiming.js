@@ -0,0 +1,100 @@
+/**
+ * Agrégation des logs de timing JSONL écrits par les scripts Blender
+ * (src/blender/instrumentation.py) pour repérer niveaux lents et régressions
+ */
+
+import { promises as fs, existsSync } from 'fs';
+import { dirname } from 'path';
+import { ensureDir } from './fsx.js';
+
+/**
+ * Lit un log JSONL (lignes invalides ignorées: rendu interrompu)
+ * @param {string} logPath - Chemin du render_timing.jsonl
+ * @returns {Promise<Array>} - Événements
+ */
+export async function readTimingLog(logPath) {
+  if (!existsSync(logPath)) {
+    return [];
+  }
+
+  const content = await fs.readFile(logPath, 'utf-8');
+  const events = [];
+  for (const line of content.split('\n')) {
+    if (!line.trim()) continue;
+    try {
+      events.push(JSON.parse(line));
+    } catch {
+      // Ligne tronquée (crash Blender pendant l'écriture)
+    }
+  }
+  return events;
+}
+
+/**
+ * Résume un run: étapes, frames (avg/p95/max, plus lentes), mémoire, scène
+ * @param {Array} events - Événements du log
+ * @returns {Object|null} - Résumé ou null si log vide
+ */
+export function summarizeTiming(events) {
+  if (events.length === 0) {
+    return null;
+  }
+
+  const start = events.find(e => e.event === 'run_start') || {};
+  const scene = events.filter(e => e.event === 'scene_stats').pop() || {};
+  const frames = events.filter(e => e.event === 'frame');
+  const hold = events.filter(e => e.event === 'frame_hold').pop() || null;
+  const stepped = events.filter(e => e.event === 'frame_step').pop() || null;
+
+  const stages = {};
+  for (const e of events.filter(e => e.event === 'stage')) {
+    stages[e.name] = (stages[e.name] || 0) + e.seconds;
+  }
+
+  const times = frames.map(f => f.seconds).sort((a, b) => a - b);
+  const total = times.reduce((sum, t) => sum + t, 0);
+  const peaks = events.map(e => e.peak_rss_mb).filter(v => typeof v === 'number');
+
+  return {
+    script: start.script,
+    blender: start.blender,
+    stages,
+    buildSeconds: Object.values(stages).reduce((sum, t) => sum + t, 0),
+    frames: {
+      count: times.length,
+      totalSeconds: total,
+      avg: times.length ? total / times.length : 0,
+      p95: times.length ? times[Math.min(times.length - 1, Math.floor(times.length * 0.95))] : 0,
+      max: times.length ? times[times.length - 1] : 0,
+      slowest: [...frames].sort((a, b) => b.seconds - a.seconds).slice(0, 5)
+        .map(f => ({ frame: f.frame, seconds: f.seconds })),
+    },
+    // Frames identiques liées au lieu d'être rendues (render_blender frame_hold)
+    held: hold ? { frames: hold.frames, rendered: hold.rendered, held: hold.held } : null,
+    // Rendu à pas: frames interpolées à l'encodage (--renderStep, frame_step)
+    stepped: stepped ? { frames: stepped.frames, rendered: stepped.rendered, step: stepped.step,
+      contacts: stepped.contacts } : null,
+    peakRssMb: peaks.length ? Math.max(...peaks) : null,
+    scene: {
+      objects: scene.objects,
+      lights: scene.lights,
+      triangles: scene.triangles,
+    },
+    wallSeconds: events[events.length - 1].t,
+  };
+}
+
+/**
+ * Ajoute un résumé à l'historique JSONL (une ligne par rendu)
+ */
+export async function appendTimingHistory(historyPath, summary, context = {}) {
+  await ensureDir(dirname(historyPath));
+  const record = { date: new Date().toISOString(), ...context, ...summary };
+  await fs.appendFile(historyPath, JSON.stringify(record) + '\n', 'utf-8');
+}
+
+export default {
+  readTimingLog,
+  summarizeTiming,
+  appendTimingHistory,
+};
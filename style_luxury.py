@@ -9,8 +9,13 @@ Style LUXE : Or et Noir élégant
 
 import bpy
 import math
+import os
 import sys
-from mathutils import Vector, Euler
+from mathutils import Vector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'blender'))
+from render_engine import setup_engine
+from styles import luxury
 
 def parse_args():
     try:
@@ -38,166 +43,26 @@ def clear_scene():
     for mat in bpy.data.materials:
         bpy.data.materials.remove(mat)
 
-def setup_luxury_render():
+def setup_luxury_render(preset_name=None, engine=None):
     """Setup pour rendu luxe premium"""
     scene = bpy.context.scene
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.resolution_x = 1080
-    scene.render.resolution_y = 1920
-    scene.render.fps = 30
-    
-    # Background noir profond
-    world = bpy.data.worlds.new("LuxuryWorld")
-    scene.world = world
-    world.use_nodes = True
-    nodes = world.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputWorld')
-    background = nodes.new('ShaderNodeBackground')
-    
-    # Noir très profond avec légère nuance chaude
-    background.inputs['Color'].default_value = (0.02, 0.015, 0.01, 1.0)
-    background.inputs['Strength'].default_value = 0.3
-    
-    world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+    preset = setup_engine(scene, preset_name, engine, fps=30)
+    luxury.STYLE.setup_world(scene, preset)
     print("✓ Luxury background: Deep black")
+    return preset
 
-def create_gold_material(name, metallic=0.95, roughness=0.15):
-    """Matériau or brillant réaliste"""
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    principled = nodes.new('ShaderNodeBsdfPrincipled')
-    
-    # Couleur or véritable
-    gold_color = (1.0, 0.766, 0.336)  # Or 24 carats
-    principled.inputs['Base Color'].default_value = (*gold_color, 1.0)
-    principled.inputs['Metallic'].default_value = metallic
-    principled.inputs['Roughness'].default_value = roughness
-    principled.inputs['Specular IOR Level'].default_value = 0.5
-    
-    # Émission légère pour glow
-    principled.inputs['Emission Color'].default_value = (*gold_color, 1.0)
-    principled.inputs['Emission Strength'].default_value = 0.3
-    
-    mat.node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-    return mat
-
-def create_black_matte_material(name, gold_trim=False):
-    """Matériau noir mat élégant"""
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    principled = nodes.new('ShaderNodeBsdfPrincipled')
-    
-    # Noir profond mat
-    principled.inputs['Base Color'].default_value = (0.05, 0.045, 0.04, 1.0)
-    principled.inputs['Metallic'].default_value = 0.0
-    principled.inputs['Roughness'].default_value = 0.4
-    principled.inputs['Specular IOR Level'].default_value = 0.2
-    
-    mat.node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-    return mat
-
-def create_luxury_lights():
-    """Éclairage dramatique or chaud"""
-    # Key light principal - Or chaud
-    bpy.ops.object.light_add(type='AREA', location=(6, -10, 15))
-    key = bpy.context.active_object
-    key.data.energy = 2000
-    key.data.size = 12
-    key.data.color = (1.0, 0.85, 0.6)  # Warm gold
-    
-    # Rim light - Accentue les bords
-    bpy.ops.object.light_add(type='AREA', location=(-8, -8, 12))
-    rim = bpy.context.active_object
-    rim.data.energy = 1200
-    rim.data.size = 10
-    rim.data.color = (1.0, 0.75, 0.4)  # Or intense
-    
-    # Back light - Sépare du fond
-    bpy.ops.object.light_add(type='AREA', location=(0, 8, 10))
-    back = bpy.context.active_object
-    back.data.energy = 800
-    back.data.size = 8
-    back.data.color = (0.9, 0.7, 0.3)
-    
-    # Spotlight sur la balle
-    bpy.ops.object.light_add(type='SPOT', location=(0, -5, 18))
-    spot = bpy.context.active_object
-    spot.data.energy = 3000
-    spot.data.spot_size = math.radians(40)
-    spot.data.spot_blend = 0.3
-    spot.data.color = (1.0, 0.9, 0.7)
-    
-    print("✓ Luxury lighting: 4 warm gold lights")
-
-def create_luxury_ball(position):
-    """Balle dorée brillante avec glow"""
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.7, location=position)
-    ball = bpy.context.active_object
-    ball.name = "GoldenBall"
-    
-    # Matériau or ultra brillant
-    mat = create_gold_material("Mat_GoldenBall", metallic=1.0, roughness=0.05)
-    ball.data.materials.append(mat)
-    
-    # Smooth shading
-    bpy.ops.object.shade_smooth()
-    
-    # Subdivision pour plus de détails
-    mod = ball.modifiers.new("Subsurf", 'SUBSURF')
-    mod.levels = 2
-    mod.render_levels = 2
-    
-    print(f"✓ Golden ball created at {position}")
-    return ball
-
-def create_luxury_platform(location, rotation, scale, index):
-    """Plateforme noire avec accents dorés"""
-    # Plateforme principale noire
-    bpy.ops.mesh.primitive_cube_add()
-    platform = bpy.context.active_object
-    platform.name = f"Platform_{index}"
-    platform.location = Vector(location)
-    platform.rotation_euler = Euler(rotation, 'XYZ')
-    platform.scale = Vector(scale)
-    
-    mat_black = create_black_matte_material(f"Mat_Black_{index}")
-    platform.data.materials.append(mat_black)
-    
-    # Bordures dorées (4 petits cubes sur les côtés)
-    border_thickness = 0.08
-    border_height = scale[1] * 0.05
-    
-    # Bordures gauche et droite
-    for side in [-1, 1]:
-        bpy.ops.mesh.primitive_cube_add()
-        border = bpy.context.active_object
-        border.name = f"Border_{index}_{side}"
-        
-        border_x = location[0] + side * (scale[0] + border_thickness)
-        border.location = Vector((border_x, location[1], location[2]))
-        border.rotation_euler = Euler(rotation, 'XYZ')
-        border.scale = Vector((border_thickness, scale[1], border_height))
-        
-        mat_gold = create_gold_material(f"Mat_GoldBorder_{index}_{side}")
-        border.data.materials.append(mat_gold)
-    
-    return platform
+def create_luxury_lights(preset=None):
+    """Éclairage dramatique or chaud (budget du preset)"""
+    lights = luxury.STYLE.create_lights(preset)
+    print(f"✓ Luxury lighting: {len(lights)} warm gold lights")
+    return lights
 
 def generate_luxury_ramps(frame):
     """Génère rampes luxe style escalier royal"""
     print("Generating luxury ramps...")
     
     num_ramps = 8
+    specs = []
     platforms = []
     
     for i in range(num_ramps):
@@ -213,21 +78,19 @@ def generate_luxury_ramps(frame):
         rotation = (0, angle_y, angle_z)
         scale = (2.5, 3.2, 0.25)
         
-        platform = create_luxury_platform(
-            (x_offset, y, z),
-            rotation,
-            scale,
-            i
-        )
-        
+        specs.append(((x_offset, y, z), rotation, scale))
         platforms.append((x_offset, y, z + 1.2))
     
+    # Matériaux noir / or partagés, bordures dans un seul mesh
+    luxury.create_platforms(specs)
+    
     # Position de la balle
     t = frame / 30.0
     ramp_index = min(int(t * 2), num_ramps - 1)
     ball_x, ball_y, ball_z = platforms[ramp_index]
     
-    ball = create_luxury_ball((ball_x, ball_y, ball_z))
+    luxury.create_ball((ball_x, ball_y, ball_z))
+    print(f"✓ Golden ball created at {(ball_x, ball_y, ball_z)}")
     
     # Caméra cinématique
     bpy.ops.object.camera_add()
@@ -257,8 +120,8 @@ def main():
     print("="*70 + "\n")
     
     clear_scene()
-    setup_luxury_render()
-    create_luxury_lights()
+    preset = setup_luxury_render(args.get('preset'), args.get('engine'))
+    create_luxury_lights(preset)
     generate_luxury_ramps(frame)
     
     # Rendu
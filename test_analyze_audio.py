@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Cas de régression des onsets de src/audio/analyzeAudio.py (piste de clics synthétique)
+Usage: python3 test_analyze_audio.py   (ou pytest test_analyze_audio.py)
+"""
+
+import os
+import sys
+import tempfile
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'audio'))
+import analyzeAudio  # noqa: E402
+
+RATE = 22050
+
+
+def click_track(path, bpm=120, seconds=8.0, first=0.5, noise_db=-40, seed=0):
+    """WAV 16 bits: clics décroissants tous les 60/bpm s sur un bruit de fond"""
+    rng = np.random.default_rng(seed)
+    signal = rng.normal(0.0, 10 ** (noise_db / 20), int(seconds * RATE))
+    click = np.sin(2 * np.pi * 1000 * np.arange(int(0.03 * RATE)) / RATE)
+    click *= np.exp(-np.arange(len(click)) / (0.005 * RATE))
+    clicks = np.arange(first, seconds - 0.1, 60.0 / bpm)
+    for t in clicks:
+        start = int(t * RATE)
+        signal[start:start + len(click)] += 0.8 * click
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes())
+    return clicks
+
+
+def analyze_clicks(**kwargs):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'clicks.wav')
+        clicks = click_track(path, **kwargs)
+        return clicks, analyzeAudio.analyze(path, RATE)
+
+
+def test_no_onset_from_leading_padding():
+    clicks, analysis = analyze_clicks()
+    onsets = np.array([o['t'] for o in analysis['onsets']])
+    assert len(onsets) == len(clicks)
+    assert np.all(np.abs(onsets - clicks) < 0.03)
+
+
+def test_strongest_onset_is_a_click():
+    # Un pic de remplissage normaliserait l'enveloppe et tasserait les vrais clics
+    clicks, analysis = analyze_clicks()
+    strongest = max(analysis['onsets'], key=lambda o: o['strength'])
+    assert np.min(np.abs(clicks - strongest['t'])) < 0.03
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Cas de régression du vérificateur de collisions (src/blender/collision.py)
+Usage: python3 test_collision.py   (ou pytest test_collision.py)
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'blender'))
+from collision import ball_keys, check_collisions, key_trajectory
+
+
+def generated_level(count=60, seed=0):
+    """Level comme src/level/generateLevel.js (espacement, lissage); tailles en demi-côtés
+
+    generateLevel.js donne des côtés complets; render_blender les prend comme
+    échelle du cube de côté 2 (plateformes deux fois plus grandes, dont les
+    bords sont traversés sur les descentes): le test garde les dimensions voulues.
+    """
+    rng = np.random.default_rng(seed)
+    platforms = []
+    for i in range(count):
+        intensity = float(rng.uniform(0.3, 1.0))
+        platforms.append({
+            't': 0.5 + i * 0.4,
+            'pos': [math.sin(i * 0.5) * 1.5, 2 + math.sin(i * 0.3) * 0.8, i * 2.5],
+            'rot': [0.0, math.radians(rng.uniform(-5, 5)), math.radians(rng.uniform(-7.5, 7.5))],
+            'size': [(0.8 + 1.2 * intensity) / 2, 0.125 / 2, (0.8 + 1.2 * intensity) / 2],
+            'intensity': intensity,
+        })
+    for prev, curr, nxt in zip(platforms, platforms[1:], platforms[2:]):
+        curr['pos'][1] = (prev['pos'][1] + curr['pos'][1] + nxt['pos'][1]) / 3
+    return {'duration': 0.5 + count * 0.4, 'fps': 30, 'ball': {'radius': 0.18},
+            'platforms': platforms}
+
+
+def test_generated_level_has_no_penetration():
+    report = check_collisions(generated_level())
+    assert report['penetrations'] == []
+    assert report['missed_contacts'] == []
+
+
+def test_misplaced_platform_is_reported():
+    level = generated_level()
+    trajectory = key_trajectory(ball_keys(level))
+    # Plateforme 40 déplacée au sommet de l'arc 10 -> 11, loin de son propre contact
+    misplaced = 40
+    arc = (level['platforms'][10]['t'] + level['platforms'][11]['t']) / 2
+    level['platforms'][misplaced]['pos'] = trajectory(np.array([arc * level['fps']]))[0].tolist()
+    report = check_collisions(level, trajectory)
+    assert [p['platform'] for p in report['penetrations']] == [misplaced]
+    assert [c['platform'] for c in report['missed_contacts']] == [misplaced]
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")
@@ -1,14 +1,28 @@
 #!/usr/bin/env python3
 """
 Test 3 concepts visuels de rampes/pentes
-Usage: blender -b -P test_concepts.py -- --concept A --frame 1
+Usage: blender -b -P test_concepts.py -- --concept A --frame 1 [--preset draft]
+       blender -b -P test_concepts.py -- --concepts A,B,C --frames 1,30,60 [--out /tmp/concepts]
+
+Mode batch: chaque concept est construit une fois (géométrie + matériaux partagés),
+seules la balle et la caméra bougent entre les frames. Sortie: un PNG par rendu,
+grid.png (lignes = concepts, colonnes = frames) et render_timing.jsonl.
 """
 
 import bpy
 import math
+import os
 import sys
+import time
 from mathutils import Vector, Euler
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'blender'))
+from render_engine import setup_engine
+from instrumentation import RenderProfiler
+from styles import get_style
+
+STYLE = get_style('concepts')
+
 def parse_args():
     try:
         argv = sys.argv[sys.argv.index("--") + 1:]
@@ -35,12 +49,9 @@ def clear_scene():
     for mat in bpy.data.materials:
         bpy.data.materials.remove(mat)
 
-def setup_render():
+def setup_render(preset_name=None, engine=None):
     scene = bpy.context.scene
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.resolution_x = 1080
-    scene.render.resolution_y = 1920
-    scene.render.fps = 30
+    preset = setup_engine(scene, preset_name, engine, fps=30)
     
     # Simple, pas d'effets (compatible Blender 5.x)
     try:
@@ -49,18 +60,9 @@ def setup_render():
     except AttributeError:
         pass  # Blender 5.x n'a pas ces attributs
     
-    # Background sombre mais visible
-    world = bpy.data.worlds.new("World")
-    scene.world = world
-    world.use_nodes = True
-    nodes = world.node_tree.nodes
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputWorld')
-    background = nodes.new('ShaderNodeBackground')
-    background.inputs['Color'].default_value = (0.05, 0.05, 0.1, 1.0)
-    background.inputs['Strength'].default_value = 0.5
-    world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+    # Background sombre mais visible (renforcé si le budget coupe des lumières)
+    STYLE.setup_world(scene, preset)
+    return preset
 
 def create_emissive_mat(name, color, strength=3.0):
     mat = bpy.data.materials.new(name)
@@ -76,20 +78,11 @@ def create_emissive_mat(name, color, strength=3.0):
     mat.node_tree.links.new(emission.outputs['Emission'], output.inputs['Surface'])
     return mat
 
-def create_lights():
-    # Key light
-    bpy.ops.object.light_add(type='AREA', location=(5, -8, 12))
-    key = bpy.context.active_object
-    key.data.energy = 1500
-    key.data.size = 10
-    
-    # Fill
-    bpy.ops.object.light_add(type='AREA', location=(-5, -8, 10))
-    fill = bpy.context.active_object
-    fill.data.energy = 800
-    fill.data.size = 8
+def create_lights(preset=None):
+    """Key + fill du style (budget du preset)"""
+    return STYLE.create_lights(preset)
 
-def create_ball(position, color=(1, 1, 0)):
+def create_ball(position=(0, 0, 0), color=(1, 1, 0)):
     """Balle jaune vif, grosse et visible"""
     bpy.ops.mesh.primitive_uv_sphere_add(radius=0.6, location=position)
     ball = bpy.context.active_object
@@ -100,10 +93,33 @@ def create_ball(position, color=(1, 1, 0)):
     bpy.ops.object.shade_smooth()
     return ball
 
+def create_camera():
+    bpy.ops.object.camera_add()
+    cam = bpy.context.active_object
+    bpy.context.scene.camera = cam
+    return cam
+
+def add_block(name, location, scale, material, rotation=None, collection=None):
+    """Cube placé dans la collection du concept"""
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+    obj.name = name
+    obj.location = Vector(location)
+    if rotation:
+        obj.rotation_euler = Euler(rotation, 'XYZ')
+    obj.scale = Vector(scale)
+    obj.data.materials.append(material)
+    
+    if collection:
+        for old in obj.users_collection:
+            old.objects.unlink(obj)
+        collection.objects.link(obj)
+    return obj
+
 # ============================================================
 # CONCEPT A : ESCALIER DESCENDANT
 # ============================================================
-def concept_stairs(frame):
+def concept_stairs(collection):
     """Escalier de plateformes qui descend"""
     print("CONCEPT A: Escalier descendant")
     
@@ -118,60 +134,36 @@ def concept_stairs(frame):
         (0, 1, 0),    # Vert
         (1, 0.5, 0),  # Orange
     ]
+    mats = [create_emissive_mat(f"Mat_Step_{k}", c, 2.5) for k, c in enumerate(colors)]
     
-    platforms = []
+    anchors = []
     for i in range(8):
         y = i * step_depth
         z = -i * step_height
-        
-        bpy.ops.mesh.primitive_cube_add()
-        obj = bpy.context.active_object
-        obj.name = f"Step_{i}"
-        obj.location = Vector((0, y, z))
-        obj.scale = Vector((step_width, step_depth, 0.3))
-        
-        color = colors[i % len(colors)]
-        mat = create_emissive_mat(f"Mat_Step_{i}", color, 2.5)
-        obj.data.materials.append(mat)
-        platforms.append(obj)
-    
-    # Balle qui descend les marches
-    # Position selon frame (simulation chemin)
-    t = frame / 30.0  # temps en secondes
-    step_index = min(int(t * 2), 7)  # 2 marches par seconde
-    
-    # Position interpolée
-    current_step = platforms[step_index]
-    ball_y = current_step.location.y
-    ball_z = current_step.location.z + 1.0  # Au-dessus de la marche
-    
-    ball = create_ball((0, ball_y, ball_z))
-    
-    # Caméra qui suit de côté
-    bpy.ops.object.camera_add()
-    cam = bpy.context.active_object
-    cam.location = Vector((6, ball_y - 3, ball_z + 2))
-    
-    # Regarder la balle
-    direction = Vector((0, ball_y, ball_z)) - cam.location
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    cam.rotation_euler = rot_quat.to_euler()
-    
-    bpy.context.scene.camera = cam
-    print(f"Frame {frame}: Ball at step {step_index}, pos=(0, {ball_y:.1f}, {ball_z:.1f})")
+        add_block(f"Step_{i}", (0, y, z), (step_width, step_depth, 0.3),
+                  mats[i % len(mats)], collection=collection)
+        anchors.append((0, y, z + 1.0))  # Au-dessus de la marche
+    
+    return {
+        'label': 'step',
+        'anchors': anchors,
+        'rate': 2,  # 2 marches par seconde
+        'camera': lambda p: (6, p[1] - 3, p[2] + 2),  # Caméra qui suit de côté
+    }
 
 # ============================================================
 # CONCEPT B : TOBOGGAN SINUEUX
 # ============================================================
-def concept_slide(frame):
+def concept_slide(collection):
     """Chemin sinueux qui serpente vers le bas"""
     print("CONCEPT B: Toboggan sinueux")
     
     # Créer un chemin sinusoïdal
     num_segments = 12
     colors = [(1, 0, 1), (0, 1, 1), (1, 1, 0)]
+    mats = [create_emissive_mat(f"Mat_Seg_{k}", c, 2.5) for k, c in enumerate(colors)]
     
-    platforms = []
+    anchors = []
     for i in range(num_segments):
         t_param = i / num_segments
         
@@ -184,51 +176,30 @@ def concept_slide(frame):
         angle_y = math.atan2(-1.0, 2.0)  # Pente descendante
         angle_z = math.cos(t_param * math.pi * 3) * 0.5  # Twist du serpent
         
-        bpy.ops.mesh.primitive_cube_add()
-        obj = bpy.context.active_object
-        obj.name = f"Segment_{i}"
-        obj.location = Vector((x, y, z))
-        obj.rotation_euler = Euler((0, angle_y, angle_z), 'XYZ')
-        obj.scale = Vector((1.5, 2.0, 0.2))
-        
-        color = colors[i % len(colors)]
-        mat = create_emissive_mat(f"Mat_Seg_{i}", color, 2.5)
-        obj.data.materials.append(mat)
-        platforms.append((x, y, z))
-    
-    # Balle qui suit le chemin
-    t = frame / 30.0
-    seg_index = min(int(t * 3), num_segments - 1)  # 3 segments par seconde
-    
-    ball_x, ball_y, ball_z = platforms[seg_index]
-    ball_z += 0.8
-    
-    ball = create_ball((ball_x, ball_y, ball_z))
-    
-    # Caméra latérale qui suit
-    bpy.ops.object.camera_add()
-    cam = bpy.context.active_object
-    cam.location = Vector((ball_x + 5, ball_y - 2, ball_z + 3))
-    
-    direction = Vector((ball_x, ball_y, ball_z)) - cam.location
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    cam.rotation_euler = rot_quat.to_euler()
-    
-    bpy.context.scene.camera = cam
-    print(f"Frame {frame}: Ball at segment {seg_index}, pos=({ball_x:.1f}, {ball_y:.1f}, {ball_z:.1f})")
+        add_block(f"Segment_{i}", (x, y, z), (1.5, 2.0, 0.2), mats[i % len(mats)],
+                  rotation=(0, angle_y, angle_z), collection=collection)
+        anchors.append((x, y, z + 0.8))
+    
+    return {
+        'label': 'segment',
+        'anchors': anchors,
+        'rate': 3,  # 3 segments par seconde
+        'camera': lambda p: (p[0] + 5, p[1] - 2, p[2] + 3),  # Caméra latérale qui suit
+    }
 
 # ============================================================
 # CONCEPT C : CASCADE DE RAMPES
 # ============================================================
-def concept_cascade(frame):
+def concept_cascade(collection):
     """Rampes alternées gauche/droite en cascade"""
     print("CONCEPT C: Cascade de rampes")
     
     # 6 rampes alternées
     num_ramps = 6
     colors = [(1, 0, 0), (0, 1, 0), (0, 0.5, 1)]
+    mats = [create_emissive_mat(f"Mat_Ramp_{k}", c, 2.5) for k, c in enumerate(colors)]
     
-    ramps = []
+    anchors = []
     for i in range(num_ramps):
         # Alternance gauche/droite
         x_offset = 2.5 if i % 2 == 0 else -2.5
@@ -239,72 +210,132 @@ def concept_cascade(frame):
         angle_y = math.radians(-25)  # Inclinaison 25°
         angle_z = math.radians(15) if i % 2 == 0 else math.radians(-15)  # Twist
         
-        bpy.ops.mesh.primitive_cube_add()
-        obj = bpy.context.active_object
-        obj.name = f"Ramp_{i}"
-        obj.location = Vector((x_offset, y, z))
-        obj.rotation_euler = Euler((0, angle_y, angle_z), 'XYZ')
-        obj.scale = Vector((2.0, 3.0, 0.2))
-        
-        color = colors[i % len(colors)]
-        mat = create_emissive_mat(f"Mat_Ramp_{i}", color, 2.5)
-        obj.data.materials.append(mat)
+        add_block(f"Ramp_{i}", (x_offset, y, z), (2.0, 3.0, 0.2), mats[i % len(mats)],
+                  rotation=(0, angle_y, angle_z), collection=collection)
         
         # Position de la balle sur cette rampe (centre)
-        ramps.append((x_offset, y, z + 1.0))
-    
-    # Balle qui descend en zigzag
-    t = frame / 30.0
-    ramp_index = min(int(t * 1.5), num_ramps - 1)  # 1.5 rampe par seconde
+        anchors.append((x_offset, y, z + 1.0))
+    
+    return {
+        'label': 'ramp',
+        'anchors': anchors,
+        'rate': 1.5,  # 1.5 rampe par seconde
+        'camera': lambda p: (0, p[1] - 8, p[2] + 5),  # Caméra de face/côté
+    }
+
+CONCEPTS = {
+    'A': concept_stairs,
+    'B': concept_slide,
+    'C': concept_cascade,
+}
+
+def pose_frame(concept, ball, cam, frame):
+    """Place balle et caméra pour une frame (aucune géométrie recréée)"""
+    t = frame / 30.0  # temps en secondes
+    anchors = concept['anchors']
+    index = min(int(t * concept['rate']), len(anchors) - 1)
     
-    ball_x, ball_y, ball_z = ramps[ramp_index]
-    ball = create_ball((ball_x, ball_y, ball_z))
+    ball.location = Vector(anchors[index])
+    cam.location = Vector(concept['camera'](anchors[index]))
     
-    # Caméra de face/côté
-    bpy.ops.object.camera_add()
-    cam = bpy.context.active_object
-    cam.location = Vector((0, ball_y - 8, ball_z + 5))
-    
-    direction = Vector((ball_x, ball_y, ball_z)) - cam.location
+    # Regarder la balle
+    direction = ball.location - cam.location
     rot_quat = direction.to_track_quat('-Z', 'Y')
     cam.rotation_euler = rot_quat.to_euler()
     
-    bpy.context.scene.camera = cam
-    print(f"Frame {frame}: Ball at ramp {ramp_index}, pos=({ball_x:.1f}, {ball_y:.1f}, {ball_z:.1f})")
+    print(f"Frame {frame}: Ball at {concept['label']} {index}, "
+          f"pos=({ball.location.x:.1f}, {ball.location.y:.1f}, {ball.location.z:.1f})")
+
+def build_grid(paths, rows, cols, grid_path, step=4):
+    """Assemble les rendus en une grille (lignes = concepts, colonnes = frames)"""
+    import numpy as np
+    
+    tiles = []
+    for path in paths:
+        image = bpy.data.images.load(path)
+        w, h = image.size
+        pixels = np.empty(w * h * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        bpy.data.images.remove(image)
+        # Pixels Blender de bas en haut: retournés pour assembler de haut en bas
+        tiles.append(np.flipud(pixels.reshape(h, w, 4))[::step, ::step])
+    
+    tile_h, tile_w = tiles[0].shape[:2]
+    grid = np.zeros((rows * tile_h, cols * tile_w, 4), dtype=np.float32)
+    for k, tile in enumerate(tiles):
+        r, c = divmod(k, cols)
+        grid[r * tile_h:r * tile_h + tile.shape[0], c * tile_w:c * tile_w + tile.shape[1]] = tile
+    
+    out = bpy.data.images.new("ConceptGrid", cols * tile_w, rows * tile_h, alpha=True)
+    out.pixels.foreach_set(np.flipud(grid).ravel())
+    out.filepath_raw = grid_path
+    out.file_format = 'PNG'
+    out.save()
+    print(f"✓ Grille: {grid_path} ({rows}x{cols})")
 
 # ============================================================
 # MAIN
 # ============================================================
 def main():
     args = parse_args()
-    concept = args.get('concept', 'A')
-    frame = int(args.get('frame', 1))
+    batch = 'concepts' in args or 'frames' in args
+    concepts = str(args.get('concepts', args.get('concept', 'A'))).split(',')
+    frames = [int(f) for f in str(args.get('frames', args.get('frame', 1))).split(',')]
+    out_dir = args.get('out', '/tmp/concepts' if batch else '/tmp')
+    
+    unknown = [c for c in concepts if c not in CONCEPTS]
+    if unknown:
+        print(f"ERROR: Concept {', '.join(unknown)} inconnu")
+        sys.exit(1)
     
     print(f"\n{'='*60}")
-    print(f"TEST CONCEPT {concept} - Frame {frame}")
+    print(f"TEST CONCEPTS {','.join(concepts)} - Frames {','.join(map(str, frames))}")
     print(f"{'='*60}\n")
     
-    clear_scene()
-    setup_render()
-    create_lights()
+    os.makedirs(out_dir, exist_ok=True)
+    profiler = RenderProfiler(os.path.join(out_dir, 'render_timing.jsonl') if batch else None,
+                              script='test_concepts', concepts=concepts, frames=frames)
     
-    if concept == 'A':
-        concept_stairs(frame)
-    elif concept == 'B':
-        concept_slide(frame)
-    elif concept == 'C':
-        concept_cascade(frame)
-    else:
-        print(f"ERROR: Concept {concept} inconnu")
-        sys.exit(1)
+    # Scène commune: rendu, lumières, balle, caméra
+    with profiler.stage('setup'):
+        clear_scene()
+        preset = setup_render(args.get('preset'), args.get('engine'))
+        create_lights(preset)
+        ball = create_ball()
+        cam = create_camera()
     
-    # Rendu
     scene = bpy.context.scene
-    scene.frame_set(1)
-    scene.render.filepath = f"/tmp/concept_{concept}_frame{frame}.png"
-    bpy.ops.render.render(write_still=True)
-    
-    print(f"\n✓ Rendu sauvegardé: {scene.render.filepath}")
+    collections = {}
+    paths = []
+    for name in concepts:
+        # Géométrie et matériaux construits une seule fois par concept
+        with profiler.stage(f"build_{name}"):
+            collection = bpy.data.collections.new(f"Concept_{name}")
+            scene.collection.children.link(collection)
+            concept = CONCEPTS[name](collection)
+            collections[name] = collection
+        for other, coll in collections.items():
+            coll.hide_render = other != name
+        
+        for frame in frames:
+            pose_frame(concept, ball, cam, frame)
+            scene.render.filepath = os.path.join(out_dir, f"concept_{name}_frame{frame}.png")
+            
+            start = time.perf_counter()
+            bpy.ops.render.render(write_still=True)
+            seconds = time.perf_counter() - start
+            
+            profiler.emit('still', concept=name, frame=frame, seconds=round(seconds, 4),
+                          path=scene.render.filepath)
+            paths.append(scene.render.filepath)
+            print(f"✓ Rendu sauvegardé: {scene.render.filepath} ({seconds:.2f}s)")
+    
+    if batch and len(paths) > 1:
+        with profiler.stage('grid'):
+            build_grid(paths, len(concepts), len(frames), os.path.join(out_dir, 'grid.png'),
+                       int(args.get('gridStep', 4)))
+    
+    profiler.summary()
     print("SUCCESS")
 
 if __name__ == '__main__':
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cas de régression de l'appariement note_on / note_off (improve_midi.track_notes)
+Usage: python3 test_improve_midi.py   (ou pytest test_improve_midi.py)
+"""
+
+from mido import MidiTrack, Message
+
+from improve_midi import track_notes
+
+
+def make_track(events):
+    """[(tick absolu, 'on'|'off', pitch)] -> MidiTrack en temps relatifs"""
+    track, last = MidiTrack(), 0
+    for tick, kind, pitch in events:
+        velocity = 100 if kind == 'on' else 0
+        track.append(Message(f'note_{kind}', note=pitch, velocity=velocity, time=tick - last))
+        last = tick
+    return track
+
+
+def spans(track):
+    notes = track_notes(track)[0]
+    return [(int(n['start']), int(n['end']), int(n['pitch'])) for n in notes]
+
+
+def test_orphan_off_before_note():
+    track = make_track([(0, 'off', 60), (10, 'on', 60), (490, 'off', 60)])
+    assert spans(track) == [(10, 490, 60)]
+
+
+def test_extra_off_does_not_shift_later_notes():
+    track = make_track([(0, 'on', 60), (100, 'off', 60), (120, 'off', 60),
+                        (200, 'on', 60), (300, 'off', 60)])
+    assert spans(track) == [(0, 100, 60), (200, 300, 60)]
+
+
+def test_overlapping_notes_end_at_next_off():
+    track = make_track([(0, 'on', 60), (50, 'on', 60), (100, 'off', 60), (150, 'off', 60),
+                        (200, 'on', 62), (260, 'off', 62)])
+    assert spans(track) == [(0, 100, 60), (50, 100, 60), (200, 260, 62)]
+
+
+def test_unreleased_note_held_to_track_end():
+    track = make_track([(0, 'on', 60), (40, 'on', 62), (90, 'off', 62)])
+    assert spans(track) == [(0, 90, 60), (40, 90, 62)]
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")